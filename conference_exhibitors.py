@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+CONFERENCE EXHIBITORS
+Exhibitor lists of health tech conferences (HIMSS, MEDICA, healthtech-event)
+Calls the JSON API behind an exhibitor search page when there is one, page by page, and caches each edition's list
+"""
+
+import json
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from http_session import create_session
+from link_graph import is_excluded
+from page_stream import LinkParser, body_encoding, read_capped
+from seed_corpus import SeedCorpus, get_seed_corpus
+from startup_record import StartupRecord, extract_domain
+
+DEFAULT_EXHIBITOR_CACHE_PATH = 'conference_exhibitors.db'
+
+# Conferences whose exhibitors are listed
+#   url: exhibitor search page, '{year}' is replaced by the edition year
+#   api: JSON endpoint behind the search page, when known; otherwise it is looked for in the page
+CONFERENCES = [
+    {
+        'name': 'HIMSS',
+        'url': 'https://www.himss.org/exhibitors'
+    },
+    {
+        'name': 'MEDICA',
+        'url': 'https://www.medica.de/exhibitor-search'
+    },
+    {
+        'name': 'healthtech-event',
+        'url': 'https://www.healthtech-event.de/exhibitors'
+    }
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS editions (
+    conference TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    method TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (conference, year)
+);
+CREATE TABLE IF NOT EXISTS exhibitors (
+    conference TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    website TEXT NOT NULL,
+    name TEXT,
+    PRIMARY KEY (conference, year, website)
+);
+"""
+
+# Quoted URLs in a page's markup and scripts, candidates for the exhibitor search's XHR endpoint
+QUOTED_URL = re.compile(r'''["'`]((?:https?:)?//[^"'`\s<>]+|/[^"'`\s<>]+)["'`]''')
+API_HINT = re.compile(r'api|json|ajax|graphql|search|list|query', re.IGNORECASE)
+EXHIBITOR_HINT = re.compile(r'exhibit|aussteller|compan|firmen|vendor|participant', re.IGNORECASE)
+STATIC_SUFFIXES = ('.js', '.css', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.woff', '.woff2',
+                   '.map', '.pdf', '.html')
+
+# JSON embedded in the page itself (server-rendered app state, e.g. __NEXT_DATA__)
+EMBEDDED_JSON = re.compile(r'<script[^>]+type=["\']application/(?:ld\+)?json["\'][^>]*>(.*?)</script>',
+                           re.IGNORECASE | re.DOTALL)
+
+# Field names of exhibitor records, compared lowercased and without '_'
+WEBSITE_KEYS = ('website', 'websiteurl', 'homepage', 'homepageurl', 'companywebsite', 'web', 'www', 'internet',
+                'url', 'link')
+NAME_KEYS = ('name', 'companyname', 'exhibitorname', 'displayname', 'company', 'title')
+NEXT_KEYS = ('next', 'nextpage', 'nexturl', 'nextlink')
+TOTAL_KEYS = ('total', 'totalcount', 'totalresults', 'totalhits', 'totalitems', 'totalelements', 'numfound')
+PAGE_PARAMS = ('page', 'p', 'pagenumber', 'pageindex', 'currentpage', 'pagenum')
+OFFSET_PARAMS = ('offset', 'start', 'from', 'skip')
+
+BARE_DOMAIN = re.compile(r'^[\w-]+(\.[\w-]+)*\.[a-z]{2,}(/\S*)?$', re.IGNORECASE)
+
+
+def _key(name: str) -> str:
+    return name.lower().replace('_', '').replace('-', '')
+
+
+def normalize_website(value: str) -> Optional[str]:
+    """'www.example.com', 'https://example.com/en' -> 'https://www.example.com'; None for anything else"""
+    value = value.strip()
+    if not value or ' ' in value:
+        return None
+    if not value.lower().startswith(('http://', 'https://')):
+        if not BARE_DOMAIN.match(value):
+            return None
+        value = f"https://{value}"
+    parsed = urlparse(value)
+    if '.' not in parsed.netloc:
+        return None
+    return f"https://{parsed.netloc.lower()}"
+
+
+def item_website(item: Dict, conference_domain: str) -> Optional[str]:
+    """First external company website among an exhibitor record's (or its nested records') fields"""
+    for fields in [item] + [value for value in item.values() if isinstance(value, dict)]:
+        values = {_key(key): value for key, value in fields.items() if isinstance(value, str)}
+        for key in WEBSITE_KEYS:
+            website = normalize_website(values[key]) if key in values else None
+            if website is None:
+                continue
+            domain = extract_domain(website)
+            if domain != conference_domain and not domain.endswith('.' + conference_domain) and not is_excluded(domain):
+                return website
+    return None
+
+
+def item_name(item: Dict) -> Optional[str]:
+    """Exhibitor name of a record, if it has one"""
+    values = {_key(key): value for key, value in item.items()}
+    for key in NAME_KEYS:
+        value = values.get(key)
+        if isinstance(value, dict):
+            value = next((value[name] for name in value if _key(name) == 'name' and isinstance(value[name], str)), None)
+        if isinstance(value, str) and value.strip():
+            return ' '.join(value.split())
+    return None
+
+
+def find_exhibitor_items(payload, conference_domain: str, depth: int = 0) -> List[Dict]:
+    """The list in a JSON payload that holds the most records with a company website"""
+    best: List[Dict] = []
+    best_websites = 0
+    if depth > 6:
+        return best
+    if isinstance(payload, list):
+        items = [item for item in payload if isinstance(item, dict)]
+        websites = sum(1 for item in items if item_website(item, conference_domain))
+        if websites and websites * 2 >= len(items):
+            best, best_websites = items, websites
+        children = items
+    elif isinstance(payload, dict):
+        children = list(payload.values())
+    else:
+        return best
+    for child in children:
+        if isinstance(child, (list, dict)):
+            candidate = find_exhibitor_items(child, conference_domain, depth + 1)
+            websites = sum(1 for item in candidate if item_website(item, conference_domain))
+            if websites > best_websites:
+                best, best_websites = candidate, websites
+    return best
+
+
+def exhibitors_of(payload, conference_domain: str) -> List[Tuple[str, Optional[str]]]:
+    """(website, name) pairs of the exhibitor records in a JSON payload, first record per website"""
+    exhibitors: Dict[str, Optional[str]] = {}
+    for item in find_exhibitor_items(payload, conference_domain):
+        website = item_website(item, conference_domain)
+        if website is not None and website not in exhibitors:
+            exhibitors[website] = item_name(item)
+    return list(exhibitors.items())
+
+
+def _lookup(payload: Dict, keys, containers=('links', '_links', 'paging', 'pagination', 'meta', 'page')):
+    """A value under one of ``keys`` at the top of a payload or in its paging container"""
+    for fields in [payload] + [payload[name] for name in containers if isinstance(payload.get(name), dict)]:
+        for name, value in fields.items():
+            if _key(name) in keys and value not in (None, '', False):
+                return value
+    return None
+
+
+def next_page_url(url: str, payload, items_on_page: int, page: int) -> str:
+    """URL of the page after ``page`` (1-based): the payload's next link, else the URL's paging parameter moved on"""
+    if isinstance(payload, dict):
+        link = _lookup(payload, NEXT_KEYS)
+        if isinstance(link, dict):
+            link = link.get('href')
+        if isinstance(link, str):
+            return urljoin(url, link)
+
+    parsed = urlparse(url)
+    params = parse_qsl(parsed.query, keep_blank_values=True)
+    for position, (name, value) in enumerate(params):
+        if value.isdigit() and _key(name) in PAGE_PARAMS:
+            params[position] = (name, str(int(value) + 1))
+            break
+        if value.isdigit() and _key(name) in OFFSET_PARAMS:
+            params[position] = (name, str(int(value) + items_on_page))
+            break
+    else:
+        # No paging parameter yet: ask for the next page by number
+        params.append(('page', str(page + 1)))
+    return urlunparse(parsed._replace(query=urlencode(params)))
+
+
+def find_api_candidates(html: str, page_url: str, limit: int = 3) -> List[str]:
+    """URLs in a page that look like the exhibitor search's JSON endpoint, most likely first"""
+    scored = {}
+    for match in QUOTED_URL.finditer(html):
+        url = urljoin(page_url, match.group(1).replace('\\/', '/'))
+        parsed = urlparse(url)
+        target = parsed.path + '?' + parsed.query
+        if parsed.scheme not in ('http', 'https') or parsed.path.lower().endswith(STATIC_SUFFIXES):
+            continue
+        if url in scored or not API_HINT.search(target) or not EXHIBITOR_HINT.search(target):
+            continue
+        scored[url] = ('api' in target.lower()) + ('json' in target.lower()) + (extract_domain(url) == extract_domain(page_url))
+    return sorted(scored, key=lambda url: -scored[url])[:limit]
+
+
+class ExhibitorCache:
+    """SQLite cache of exhibitor lists per conference edition
+
+    An edition's list is reused until it is ``max_age`` seconds old (the
+    lists grow until shortly before the event, then stay put); a new year
+    is a new edition and is always fetched. ``path=None`` keeps the cache
+    in memory for a single run.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_EXHIBITOR_CACHE_PATH, max_age: float = 30 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self.conn = sqlite3.connect(path or ':memory:', timeout=30)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, conference: str, year: int) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """(website, name) pairs of a fresh cached edition, None when it has to be fetched"""
+        row = self.conn.execute(
+            'SELECT fetched_at FROM editions WHERE conference = ? AND year = ?', (conference, year)
+        ).fetchone()
+        if row is None or row[0] < time.time() - self.max_age:
+            return None
+        return self.conn.execute(
+            'SELECT website, name FROM exhibitors WHERE conference = ? AND year = ? ORDER BY position',
+            (conference, year)
+        ).fetchall()
+
+    def store(self, conference: str, year: int, method: str, exhibitors: List[Tuple[str, Optional[str]]]):
+        """Replace an edition's cached list"""
+        with self.conn:
+            self.conn.execute('DELETE FROM exhibitors WHERE conference = ? AND year = ?', (conference, year))
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO exhibitors (conference, year, position, website, name) VALUES (?, ?, ?, ?, ?)',
+                [(conference, year, position, website, name) for position, (website, name) in enumerate(exhibitors)]
+            )
+            self.conn.execute(
+                """INSERT INTO editions (conference, year, method, fetched_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(conference, year) DO UPDATE SET method = excluded.method,
+                       fetched_at = excluded.fetched_at""",
+                (conference, year, method, time.time())
+            )
+
+
+class ConferenceExhibitorDiscovery:
+    """Reads conference exhibitor lists, preferring the JSON API behind the search page
+
+    For each conference the exhibitor search page is read once. Exhibitors
+    come from, in order of preference: a configured ``api`` endpoint, JSON
+    embedded in the page, an XHR endpoint referenced by the page (probed
+    and then paged through), or the external links on the page itself.
+    Conferences are fetched concurrently, one at a time per host with
+    ``delay`` seconds between pages.
+    """
+
+    def __init__(self, session=None, seed_corpus: Optional[SeedCorpus] = None,
+                 cache_path: Optional[str] = DEFAULT_EXHIBITOR_CACHE_PATH, year: Optional[int] = None,
+                 max_pages: int = 25, max_page_bytes: int = 1024 * 1024, max_api_bytes: int = 5 * 1024 * 1024):
+        self.session = session or create_session()
+        self.seed_corpus = seed_corpus or get_seed_corpus()
+        self.cache_path = cache_path  # Per-edition exhibitor cache, None to keep it in memory
+        self.year = year or datetime.now().year  # Edition whose exhibitors are listed
+        self.delay = 1  # Between requests to the same conference site
+        self.max_pages = max_pages  # API pages read per conference
+        self.max_page_bytes = max_page_bytes
+        self.max_api_bytes = max_api_bytes
+        self.methods: Dict[str, str] = {}  # Conference -> how its latest list was obtained
+
+    def read_page(self, url: str, raise_errors: bool = False) -> Optional[str]:
+        """A conference page's HTML (capped), or None when it cannot be read
+        
+        With ``raise_errors`` network errors and error statuses are raised
+        instead, for callers that track failures themselves (job runners).
+        """
+        try:
+            with self.session.get(url, timeout=15, stream=True) as response:
+                if raise_errors:
+                    response.raise_for_status()
+                if response.status_code != 200:
+                    return None
+                return read_capped(response, self.max_page_bytes).decode(body_encoding(response), errors='replace')
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"⚠️ {url}: {str(e)}")
+            return None
+
+    def get_json(self, url: str):
+        """Decoded JSON from an endpoint, or None when it does not answer with JSON"""
+        headers = {'Accept': 'application/json, text/javascript, */*; q=0.01', 'X-Requested-With': 'XMLHttpRequest'}
+        try:
+            with self.session.get(url, timeout=15, stream=True, headers=headers) as response:
+                if response.status_code != 200:
+                    return None
+                body = read_capped(response, self.max_api_bytes)
+                encoding = body_encoding(response)
+        except Exception:
+            return None
+        try:
+            return json.loads(body.decode(encoding, errors='replace'))
+        except ValueError:
+            return None
+
+    def fetch_api(self, url: str, conference_domain: str) -> List[Tuple[str, Optional[str]]]:
+        """Exhibitors of a JSON endpoint, following its pagination until a page adds nothing new"""
+        exhibitors: Dict[str, Optional[str]] = {}
+        seen_items = 0
+        for page in range(1, self.max_pages + 1):
+            if self.session.budget_exhausted:
+                break
+            if page > 1:
+                time.sleep(self.delay)
+            payload = self.get_json(url)
+            if payload is None:
+                break
+            items = find_exhibitor_items(payload, conference_domain)
+            added = 0
+            for website, name in exhibitors_of(payload, conference_domain):
+                if website not in exhibitors:
+                    exhibitors[website] = name
+                    added += 1
+            seen_items += len(items)
+            total = _lookup(payload, TOTAL_KEYS) if isinstance(payload, dict) else None
+            if not added or (isinstance(total, int) and seen_items >= total):
+                break
+            url = next_page_url(url, payload, len(items), page)
+        return list(exhibitors.items())
+
+    def page_links(self, html: str, page_url: str, conference_domain: str) -> List[Tuple[str, Optional[str]]]:
+        """External company websites linked from an exhibitor page"""
+        parser = LinkParser()
+        parser.feed(html)
+        websites = []
+        for href in parser.take():
+            website = normalize_website(urljoin(page_url, href)) if href.startswith(('http', '//')) else None
+            if website is None:
+                continue
+            domain = extract_domain(website)
+            if domain == conference_domain or domain.endswith('.' + conference_domain) or is_excluded(domain):
+                continue
+            if website not in websites:
+                websites.append(website)
+        return [(website, None) for website in websites]
+
+    def scrape_conference(self, conference: Dict,
+                          raise_errors: bool = False) -> Tuple[List[Tuple[str, Optional[str]]], str]:
+        """(website, name) pairs of one conference's exhibitors and how they were obtained
+        
+        An exhibitor page that cannot be read gives no exhibitors ('unreachable'),
+        or raises with ``raise_errors``.
+        """
+        url = conference['url'].format(year=self.year)
+        domain = extract_domain(url)
+
+        if conference.get('api'):
+            exhibitors = self.fetch_api(conference['api'].format(year=self.year), domain)
+            if exhibitors:
+                return exhibitors, 'api'
+
+        html = self.read_page(url, raise_errors)
+        if html is None:
+            return [], 'unreachable'
+
+        for block in EMBEDDED_JSON.findall(html):
+            try:
+                payload = json.loads(block)
+            except ValueError:
+                continue
+            exhibitors = exhibitors_of(payload, domain)
+            if exhibitors:
+                return exhibitors, 'embedded json'
+
+        for candidate in find_api_candidates(html, url):
+            if self.session.budget_exhausted:
+                break
+            time.sleep(self.delay)
+            exhibitors = self.fetch_api(candidate, domain)
+            if exhibitors:
+                return exhibitors, f"api {candidate}"
+
+        return self.page_links(html, url, domain), 'html links'
+
+    def discover_from_conference_websites(self) -> List[StartupRecord]:
+        """Exhibitors of this year's conference editions, from the cache where it is fresh"""
+        print(f"🔍 Discovering {self.year} health tech conference exhibitors...")
+        with ExhibitorCache(self.cache_path) as cache:
+            lists = {conference['name']: cache.lookup(conference['name'], self.year) for conference in CONFERENCES}
+            pending = [conference for conference in CONFERENCES if lists[conference['name']] is None]
+            for name, cached in lists.items():
+                if cached is not None:
+                    print(f"  • {name} {self.year}: {len(cached)} exhibitors from the cache")
+
+            # Each conference is a different site, so they are read side by side
+            with ThreadPoolExecutor(max_workers=max(len(pending), 1)) as executor:
+                scraped = list(executor.map(self.scrape_conference, pending))
+            for conference, (exhibitors, method) in zip(pending, scraped):
+                lists[conference['name']] = exhibitors
+                self.methods[conference['name']] = method
+                print(f"  • {conference['name']} {self.year}: {len(exhibitors)} exhibitors ({method})")
+                if exhibitors:
+                    cache.store(conference['name'], self.year, method, exhibitors)
+
+        results = []
+        seen = set()
+        for conference in CONFERENCES:
+            results.extend(self.exhibitor_records(conference, lists[conference['name']], seen))
+
+        print(f"✅ Found {len(results)} conference exhibitor URLs")
+        return results
+
+    def exhibitor_records(self, conference: Dict, exhibitors: List[Tuple[str, Optional[str]]],
+                          seen: Set[str]) -> List[StartupRecord]:
+        """Records of a conference's exhibitors that are neither in ``seen`` nor in the seed corpus"""
+        results = []
+        for website, name in exhibitors:
+            if website in seen or website in self.seed_corpus:
+                continue
+            seen.add(website)
+            results.append(StartupRecord(
+                url=website,
+                source=f"Conference: {conference['name']} {self.year}",
+                confidence=7,
+                category='Conference Exhibitor',
+                company_name=name
+            ))
+        return results
+
+    def discover_conference(self, name: str, raise_errors: bool = False) -> List[StartupRecord]:
+        """Exhibitors of one conference's edition, from the cache where it is fresh (a worker job)
+        
+        With ``raise_errors`` an exhibitor page that cannot be read raises
+        instead of giving an empty list.
+        """
+        conference = next((conference for conference in CONFERENCES if conference['name'] == name), None)
+        if conference is None:
+            raise ValueError(f"Unknown conference '{name}'")
+        with ExhibitorCache(self.cache_path) as cache:
+            exhibitors = cache.lookup(name, self.year)
+            if exhibitors is not None:
+                print(f"  • {name} {self.year}: {len(exhibitors)} exhibitors from the cache")
+            else:
+                exhibitors, method = self.scrape_conference(conference, raise_errors)
+                self.methods[name] = method
+                print(f"  • {name} {self.year}: {len(exhibitors)} exhibitors ({method})")
+                if exhibitors:
+                    cache.store(name, self.year, method, exhibitors)
+        return self.exhibitor_records(conference, exhibitors, set())
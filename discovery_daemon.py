@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+DISCOVERY DAEMON
+Long-running discovery with per-source refresh schedules and freshness-based re-verification
+Keeps sessions, discoverers and the seed corpus warm and writes every result straight to the store
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from discovery_sources import DiscoverySource
+from result_store import ResultStore
+
+
+class DiscoveryDaemon:
+    """Re-runs each source when its ``refresh_hours`` have passed and re-checks stale URLs
+
+    Source run times live in the result store, so a restarted daemon picks
+    up the schedule where it left off instead of re-crawling everything.
+    Between source runs, the most overdue URLs (see
+    ``ResultStore.due_for_verification``) are re-checked in batches, which
+    keeps high-confidence URLs fresher than pattern-generated ones, and
+    failed units in the retry queue are retried once their backoff passes.
+    """
+
+    def __init__(self, discovery, verify_batch: int = 50, verify_workers: int = 8,
+                 idle_sleep: float = 60, timeout: float = 10):
+        if not discovery.store_path:
+            raise ValueError("Daemon mode needs a result store (--store)")
+        self.discovery = discovery  # UltimateStartupDiscovery holding the warm discoverers
+        self.store = ResultStore(discovery.store_path)
+        self.verify_batch = verify_batch
+        self.verify_workers = verify_workers
+        self.idle_sleep = idle_sleep
+        self.timeout = timeout
+        self.session = None
+        discovery.open_retry_queue()
+
+    def due_sources(self, now: float) -> List[DiscoverySource]:
+        """Sources whose refresh interval has passed, in registry order"""
+        last_runs = self.store.source_runs()
+        return [
+            source for source in self.discovery.sources
+            if now - last_runs.get(source.name, 0) >= source.refresh_hours * 3600
+        ]
+
+    def next_source_due(self) -> float:
+        """Epoch time at which the next source becomes due"""
+        last_runs = self.store.source_runs()
+        return min(last_runs.get(source.name, 0) + source.refresh_hours * 3600
+                   for source in self.discovery.sources)
+
+    def refresh_source(self, source: DiscoverySource) -> int:
+        """Run one source and upsert everything it found; returns the record count"""
+        # Every record found in this run should refresh its last_seen, not just new ones; this includes
+        # the discoverers' own dedup sets, which would otherwise drop URLs seen in earlier cycles
+        self.discovery.reset_seen_urls()
+        if self.discovery.request_budget is not None:
+            self.discovery.request_budget.reset()  # --max-requests applies per source run
+
+        records = self.discovery.run_source(source)
+        self.store.upsert_records(records)
+        self.store.mark_source_run(source.name, time.time())
+        print(f"🗄️ {source.title}: {len(records)} URLs written, store holds {self.store.count()}")
+        return len(records)
+
+    def retry_due(self) -> int:
+        """Retry queued units whose backoff has passed and upsert what they find; returns the record count"""
+        queue = self.discovery.retry_queue
+        if queue is None or not queue.due():
+            return 0
+        self.discovery.reset_seen_urls()
+        if self.discovery.request_budget is not None:
+            self.discovery.request_budget.reset()
+
+        records = self.discovery.retry_failed_units(max_wait=0)
+        self.store.upsert_records(records)
+        return len(records)
+
+    def check_url(self, url: str) -> Optional[int]:
+        """Final HTTP status of a URL, or None when it cannot be reached"""
+        try:
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in (403, 405, 501):
+                # Servers that refuse HEAD get a streamed GET whose body is never read
+                response = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True)
+                response.close()
+            return response.status_code
+        except Exception:
+            return None
+
+    def verify_due(self) -> int:
+        """Re-check the most overdue batch of stored URLs; returns how many were checked"""
+        due = self.store.due_for_verification(time.time(), self.verify_batch)
+        if not due:
+            return 0
+        if self.session is None:
+            self.session = self.discovery.create_session()
+        if self.discovery.request_budget is not None:
+            self.discovery.request_budget.reset()
+
+        urls = [record.url for record in due]
+        with ThreadPoolExecutor(max_workers=self.verify_workers) as executor:
+            statuses = list(executor.map(self.check_url, urls))
+        self.store.record_checks(zip(urls, statuses), time.time())
+
+        failed = sum(1 for status in statuses if status is None or status >= 400)
+        print(f"🔁 Re-verified {len(urls)} stale URLs, {failed} failing")
+        return len(urls)
+
+    def run(self, max_cycles: Optional[int] = None):
+        """Loop until interrupted (or for ``max_cycles`` cycles)"""
+        print("🛰️ DISCOVERY DAEMON")
+        print("=" * 60)
+        for source in self.discovery.sources:
+            print(f"  • {source.name:12s} every {source.refresh_hours:g}h")
+        print(f"  • re-verification in batches of {self.verify_batch}")
+
+        cycles = 0
+        try:
+            while max_cycles is None or cycles < max_cycles:
+                cycles += 1
+                for source in self.due_sources(time.time()):
+                    print(f"\n⏰ {source.title} is due")
+                    self.refresh_source(source)
+                self.retry_due()
+
+                checked = self.verify_due()
+                if checked == self.verify_batch:
+                    continue  # More URLs are overdue, keep going without sleeping
+                if max_cycles is not None and cycles >= max_cycles:
+                    break
+                pause = min(max(self.next_source_due() - time.time(), 0), self.idle_sleep)
+                time.sleep(pause)
+        except KeyboardInterrupt:
+            print("\n⏹️ Daemon stopped")
+        finally:
+            self.discovery.close_discoverers()
+            self.discovery.close_retry_queue()
+            self.store.close()
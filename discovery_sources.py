@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+DISCOVERY SOURCES
+Registry of the discovery methods used by the ultimate discovery system
+Sources are imported lazily so the CLI starts without loading the network stack
+"""
+
+import importlib
+from typing import Callable, Dict, List, Optional
+
+
+class DiscoverySource:
+    """A registered discovery method and where to load it from
+
+    ``module``/``class_name`` name the discoverer class that provides
+    ``method_name``; it is only imported when the source actually runs.
+    Sources with ``module=None`` are methods of UltimateStartupDiscovery itself.
+    """
+
+    def __init__(self, name: str, title: str, description: str, method_label: str,
+                 module: Optional[str] = None, class_name: Optional[str] = None,
+                 method_name: Optional[str] = None, estimated_requests: int = 0,
+                 query_limit_option: Optional[str] = None, refresh_hours: float = 24,
+                 requests_per_query: int = 1):
+        self.name = name
+        self.title = title
+        self.description = description
+        self.method_label = method_label
+        self.module = module
+        self.class_name = class_name
+        self.method_name = method_name
+        self.estimated_requests = estimated_requests
+        self.query_limit_option = query_limit_option  # constructor option that takes --max-queries
+        self.requests_per_query = requests_per_query  # requests one query costs, for --max-queries estimates
+        self.refresh_hours = refresh_hours  # how often daemon mode re-runs the source
+
+    @property
+    def needs_network(self) -> bool:
+        return self.estimated_requests > 0
+
+    def load_class(self):
+        """Import and return the discoverer class for this source"""
+        module = importlib.import_module(self.module)
+        return getattr(module, self.class_name)
+
+
+# Registered sources, in run order
+SOURCE_REGISTRY: Dict[str, DiscoverySource] = {}
+
+# Shorthand names that expand to several sources
+SOURCE_GROUPS = {
+    'enhanced': ['directories', 'github', 'conferences', 'generated'],
+    'all': None,  # every registered source
+}
+
+
+def register_source(source: DiscoverySource) -> DiscoverySource:
+    """Add a discovery source to the registry"""
+    SOURCE_REGISTRY[source.name] = source
+    return source
+
+
+def resolve_sources(names: Optional[List[str]] = None) -> List[DiscoverySource]:
+    """Expand source names and groups into registered sources, in run order"""
+    if not names:
+        return list(SOURCE_REGISTRY.values())
+
+    selected = set()
+    for name in names:
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name in SOURCE_GROUPS:
+            selected.update(SOURCE_GROUPS[name] or SOURCE_REGISTRY)
+        elif name in SOURCE_REGISTRY:
+            selected.add(name)
+        else:
+            available = ', '.join(list(SOURCE_REGISTRY) + list(SOURCE_GROUPS))
+            raise ValueError(f"Unknown source '{name}' (available: {available})")
+
+    return [source for name, source in SOURCE_REGISTRY.items() if name in selected]
+
+
+def parse_source_limits(spec: Optional[str], cast: Callable = float) -> Dict[str, float]:
+    """Parse per-source limits such as '300' (every source) or 'google=120,github=60'
+
+    A bare value is stored under '*' and applies to every source without
+    its own entry.
+    """
+    limits = {}
+    for item in (spec or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, value = item.rpartition('=')
+        name = name.strip().lower() or '*'
+        if name != '*' and name not in SOURCE_REGISTRY:
+            raise ValueError(f"Unknown source '{name}' in limit '{item}' (available: {', '.join(SOURCE_REGISTRY)})")
+        try:
+            limits[name] = cast(value)
+        except ValueError:
+            raise ValueError(f"Invalid limit '{item}'")
+        if limits[name] <= 0:
+            raise ValueError(f"Limit '{item}' must be positive")
+    return limits
+
+
+register_source(DiscoverySource(
+    'verified', 'User Verified URLs',
+    "User's verified hardcoded URLs (confidence 10)",
+    method_label='Hardcoded', method_name='get_user_hardcoded_urls'
+))
+register_source(DiscoverySource(
+    'directories', 'Public Startup Directories',
+    "Startbase and Deutsche Startups healthcare listings",
+    method_label='Enhanced Discovery',
+    module='enhanced_startup_discovery', class_name='EnhancedStartupDiscovery',
+    method_name='discover_from_public_directories', estimated_requests=2,
+    refresh_hours=12
+))
+register_source(DiscoverySource(
+    'sitemaps', 'Directory Sitemaps',
+    "Healthcare company profiles listed in Startbase and Deutsche Startups sitemaps",
+    method_label='Enhanced Discovery',
+    module='sitemap_discovery', class_name='SitemapDiscovery',
+    method_name='discover_from_sitemaps', estimated_requests=160,
+    refresh_hours=24
+))
+register_source(DiscoverySource(
+    'github', 'GitHub Health Tech Projects',
+    "GitHub repositories with company homepages",
+    method_label='Enhanced Discovery',
+    module='enhanced_startup_discovery', class_name='EnhancedStartupDiscovery',
+    method_name='search_github_health_projects', estimated_requests=2,
+    query_limit_option='github_query_limit'
+))
+register_source(DiscoverySource(
+    'conferences', 'Health Tech Conferences',
+    "HIMSS, MEDICA and healthtech-event exhibitor lists, cached per edition year",
+    method_label='Enhanced Discovery',
+    module='conference_exhibitors', class_name='ConferenceExhibitorDiscovery',
+    method_name='discover_from_conference_websites', estimated_requests=30,
+    refresh_hours=7 * 24
+))
+register_source(DiscoverySource(
+    'generated', 'Generated Domains',
+    "Pattern-generated potential health domains that serve a real site (parked pages rejected)",
+    method_label='Enhanced Discovery',
+    module='enhanced_startup_discovery', class_name='EnhancedStartupDiscovery',
+    method_name='discover_generated_domains', estimated_requests=100,  # one capped GET per candidate
+    refresh_hours=7 * 24
+))
+register_source(DiscoverySource(
+    'google', 'Google Search Discovery',
+    "German, European, domain-specific and directory Google searches",
+    method_label='Google Search',
+    module='google_search_scraper', class_name='GoogleSearchStartupFinder',
+    method_name='iter_startups', estimated_requests=56,  # 28 queries, each sent to both default backends
+    query_limit_option='max_queries', requests_per_query=2
+))
+register_source(DiscoverySource(
+    'snowball', 'Startup Link Graph',
+    "Companies linked from verified and curated startup homepages",
+    method_label='Link Graph',
+    module='link_graph', class_name='SnowballDiscovery',
+    method_name='discover_from_link_graph', estimated_requests=300,
+    refresh_hours=7 * 24
+))
+register_source(DiscoverySource(
+    'curated', 'Curated Startup URLs',
+    "Manually curated health tech companies (confidence 8)",
+    method_label='Manual Curation', method_name='add_curated_startup_urls'
+))
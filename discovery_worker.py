@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+DISCOVERY WORKER
+Splits discovery into jobs on a shared JobQueue and runs them in worker processes
+Merged output goes through the same ranking as run_ultimate_discovery
+"""
+
+import argparse
+import multiprocessing
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+from discovery_sources import SOURCE_REGISTRY, resolve_sources
+from job_queue import DEFAULT_QUEUE_PATH, Job, JobQueue, default_worker_id
+from result_store import DEFAULT_STORE_PATH
+from startup_record import StartupRecord
+
+# Job kind that carries each network source's work units
+SOURCE_JOB_KINDS = {
+    'directories': 'directory_page',
+    'sitemaps': 'sitemap_directory',
+    'github': 'github_query',
+    'conferences': 'conference_list',
+    'generated': 'domain_batch',
+    'google': 'google_query',
+    'snowball': 'link_graph',
+}
+
+JOB_KIND_SOURCES = {kind: name for name, kind in SOURCE_JOB_KINDS.items()}
+# Finer units that only the retry queue hands out
+JOB_KIND_SOURCES['sitemap_profile'] = 'sitemaps'
+
+DOMAIN_BATCH_SIZE = 25
+
+
+def seed_jobs(queue: JobQueue, sources: Optional[List[str]] = None,
+              max_queries: Optional[int] = None) -> Dict[str, int]:
+    """Turn the selected sources into individual jobs on the queue"""
+    from conference_exhibitors import CONFERENCES
+    from enhanced_startup_discovery import (EnhancedStartupDiscovery, GITHUB_QUERIES,
+                                            PUBLIC_DIRECTORIES)
+    from google_search_scraper import SEARCH_CATEGORIES
+    from sitemap_discovery import SITEMAP_DIRECTORIES
+
+    selected = {source.name for source in resolve_sources(sources)}
+    added = {}
+
+    def add(kind: str, payload: Dict):
+        if queue.enqueue(kind, payload):
+            added[kind] = added.get(kind, 0) + 1
+
+    if 'directories' in selected:
+        for directory in PUBLIC_DIRECTORIES:
+            add('directory_page', {'url': directory['url'], 'name': directory['name']})
+
+    if 'sitemaps' in selected:
+        for directory in SITEMAP_DIRECTORIES:
+            add('sitemap_directory', {'name': directory['name']})
+
+    if 'github' in selected:
+        for query in GITHUB_QUERIES[:max_queries or 2]:
+            add('github_query', {'query': query})
+
+    if 'conferences' in selected:
+        # The edition is fixed when seeding, so every worker lists the same year
+        year = datetime.now().year
+        for conference in CONFERENCES:
+            add('conference_list', {'name': conference['name'], 'year': year})
+
+    if 'generated' in selected:
+        # A fixed seed draws the same sample every time and sorting fixes the batches,
+        # so seeding the queue again dedups against the batches already there
+        generator = EnhancedStartupDiscovery(seed=0)
+        candidates = sorted(record.url for record in generator.generate_potential_health_domains())
+        for start in range(0, len(candidates), DOMAIN_BATCH_SIZE):
+            add('domain_batch', {'urls': candidates[start:start + DOMAIN_BATCH_SIZE]})
+
+    if 'snowball' in selected:
+        # A single job: candidates are ranked by inbound links across the whole crawl
+        add('link_graph', {})
+
+    if 'google' in selected:
+        queries = [(name, query) for name, spec in SEARCH_CATEGORIES.items() for query in spec['queries']]
+        for category_name, query in queries[:max_queries]:
+            add('google_query', {'query': query, 'category': category_name})
+
+    return added
+
+
+class JobRunner:
+    """Executes claimed jobs with one discoverer instance per class
+
+    ``get_discoverer`` maps a source name to an existing discoverer (the
+    retry stage of a discovery run passes its own); by default the runner
+    creates standalone ones, matching candidate domains against the
+    ``parked_fingerprint_paths`` data files (the shipped library by default).
+    """
+
+    def __init__(self, get_discoverer: Optional[Callable[[str], object]] = None,
+                 parked_fingerprint_paths: Optional[Sequence[str]] = None):
+        self.get_discoverer = get_discoverer
+        self.parked_fingerprint_paths = parked_fingerprint_paths
+        self.enhanced = None
+        self.google = None
+        self.discoverers = {}
+
+    def get_enhanced(self):
+        if self.enhanced is None:
+            if self.get_discoverer is not None:
+                self.enhanced = self.get_discoverer('directories')
+            else:
+                from enhanced_startup_discovery import EnhancedStartupDiscovery
+                self.enhanced = EnhancedStartupDiscovery(parked_fingerprint_paths=self.parked_fingerprint_paths)
+        return self.enhanced
+
+    def get_google(self):
+        if self.google is None:
+            if self.get_discoverer is not None:
+                self.google = self.get_discoverer('google')
+            else:
+                from google_search_scraper import GoogleSearchStartupFinder
+                self.google = GoogleSearchStartupFinder()
+        return self.google
+
+    def get_source_discoverer(self, name: str):
+        """Discoverer of any other registered source, created on first use"""
+        if name not in self.discoverers:
+            if self.get_discoverer is not None:
+                self.discoverers[name] = self.get_discoverer(name)
+            else:
+                self.discoverers[name] = SOURCE_REGISTRY[name].load_class()()
+        return self.discoverers[name]
+
+    def close(self):
+        """Release the search threads of the Google finder, if one was created"""
+        if self.google is not None:
+            self.google.close()
+
+    def run(self, job: Job) -> List[StartupRecord]:
+        """Run one job and return its labelled records"""
+        payload = job.payload
+        if job.kind == 'google_query':
+            finder = self.get_google()
+            records = finder.search_query_records(payload['query'], payload['category'])
+            records = finder.validate_health_tech_urls(records)
+            finder.scheduler.save()
+        elif job.kind == 'conference_list':
+            discoverer = self.get_source_discoverer('conferences')
+            discoverer.year = payload['year']
+            # Raised so the queue's lease and attempt logic (or the retry stage) sees the failure
+            records = discoverer.discover_conference(payload['name'], raise_errors=True)
+        elif job.kind in ('sitemap_directory', 'sitemap_profile'):
+            from sitemap_discovery import get_sitemap_directory
+
+            discoverer = self.get_source_discoverer('sitemaps')
+            directory = get_sitemap_directory(payload['name'])
+            if job.kind == 'sitemap_directory':
+                records = discoverer.discover_directory(directory, raise_errors=True)
+            else:
+                records = discoverer.profile_records(directory, [payload['url']], set(), raise_errors=True)
+        elif job.kind == 'link_graph':
+            records = self.get_source_discoverer('snowball').discover_from_link_graph()
+        else:
+            discoverer = self.get_enhanced()
+            if job.kind == 'directory_page':
+                # Raised so the queue's lease and attempt logic (or the retry stage) sees the failure
+                records = discoverer.scrape_startup_directory(payload['url'], payload['name'], payload.get('max_bytes'),
+                                                              raise_errors=True)
+            elif job.kind == 'github_query':
+                records = discoverer.search_github_query(payload['query'])
+            elif job.kind == 'domain_batch':
+                candidates = [
+                    StartupRecord(url=url, source='Generated Pattern', confidence=3, category='Potential Domain')
+                    for url in payload['urls']
+                ]
+                records = discoverer.check_candidate_domains(candidates)
+            else:
+                raise ValueError(f"Unknown job kind '{job.kind}'")
+            records = discoverer.validate_and_filter_urls(records)
+
+        method = SOURCE_REGISTRY[JOB_KIND_SOURCES[job.kind]].method_label
+        for record in records:
+            record.method = method
+        return records
+
+
+@contextmanager
+def keep_lease(queue_path: str, job: Job, worker_id: str, lease_seconds: float):
+    """Renew a job's lease in the background while it runs, so a long crawl is not claimed twice"""
+    stop = threading.Event()
+
+    def renew():
+        with JobQueue(queue_path) as queue:
+            while not stop.wait(lease_seconds / 3):
+                if not queue.extend_lease(job, worker_id, lease_seconds):
+                    return
+
+    thread = threading.Thread(target=renew, name=f"lease-{job.id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_worker(queue_path: str, worker_id: Optional[str] = None, lease_seconds: float = 300,
+               max_jobs: Optional[int] = None, poll_interval: float = 5.0,
+               parked_fingerprint_paths: Optional[Sequence[str]] = None) -> int:
+    """Claim and run jobs until the queue is drained; returns the number of jobs done"""
+    worker_id = worker_id or default_worker_id()
+    runner = JobRunner(parked_fingerprint_paths=parked_fingerprint_paths)
+    done = 0
+
+    try:
+        with JobQueue(queue_path) as queue:
+            while max_jobs is None or done < max_jobs:
+                job = queue.claim(worker_id, lease_seconds)
+                if job is None:
+                    if queue.counts().get('leased'):
+                        # Other workers still hold leases that may expire and need picking up
+                        time.sleep(poll_interval)
+                        continue
+                    break
+
+                print(f"👷 [{worker_id}] Job {job.id} {job.kind} (attempt {job.attempts})")
+                try:
+                    with keep_lease(queue_path, job, worker_id, lease_seconds):
+                        records = runner.run(job)
+                except Exception as e:
+                    print(f"⚠️ [{worker_id}] Job {job.id} failed: {str(e)}")
+                    queue.fail(job, worker_id, f"{type(e).__name__}: {str(e)}")
+                    continue
+
+                if queue.complete(job, worker_id, records):
+                    done += 1
+                    print(f"✅ [{worker_id}] Job {job.id} produced {len(records)} URLs")
+                else:
+                    print(f"⚠️ [{worker_id}] Lease on job {job.id} was lost, result discarded")
+    finally:
+        runner.close()
+
+    return done
+
+
+def merge_results(queue_path: str, sources: Optional[List[str]] = None,
+                  store_path: Optional[str] = DEFAULT_STORE_PATH, output_dir: str = '.') -> Dict:
+    """Combine finished jobs with the local sources and save like a normal run"""
+    from ultimate_startup_discovery import UltimateStartupDiscovery
+
+    discovery = UltimateStartupDiscovery(store_path=store_path, sources=sources, output_dir=output_dir)
+    discovery.open_http_archive()
+    all_results = []
+
+    with JobQueue(queue_path) as queue:
+        for source in discovery.sources:
+            kind = SOURCE_JOB_KINDS.get(source.name)
+            if kind is None:
+                if source.needs_network:
+                    # Merging must not turn into a serial crawl; network sources run as jobs
+                    print(f"⚠️ {source.title} has no job kind, skipped by merge")
+                    continue
+                # Sources without job kinds (verified, curated) only read the seed corpus and run here
+                all_results.extend(discovery.run_source(source))
+                continue
+            for record in queue.finished_results(kind):
+                if record.url not in discovery.all_discovered_urls:
+                    discovery.all_discovered_urls.add(record.url)
+                    all_results.append(record)
+        counts = queue.counts()
+
+    final_results = discovery.consolidate_and_rank_results(all_results)
+    analysis = discovery.analyze_discovery_results(final_results)
+    csv_file, json_file, report_file = discovery.save_comprehensive_results(final_results, analysis)
+
+    print(f"\n📊 Merged {len(final_results)} URLs from {counts.get('done', 0)} finished jobs")
+    if counts.get('pending') or counts.get('leased') or counts.get('failed'):
+        print(f"⚠️ Unfinished jobs: {counts}")
+    print(f"📁 Files created: {csv_file}, {json_file}, {report_file}")
+
+    return {
+        'total_urls': len(final_results),
+        'results': final_results,
+        'analysis': analysis,
+        'files': {'csv': csv_file, 'json': json_file, 'report': report_file}
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line interface for seeding, working and merging a sharded run"""
+    parser = argparse.ArgumentParser(description="Run discovery as jobs on a shared queue")
+    parser.add_argument('--queue', default=DEFAULT_QUEUE_PATH, help="SQLite job queue (may be on shared storage)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = subparsers.add_parser('seed', help="Enqueue jobs for the selected sources")
+    seed_parser.add_argument('--sources', default='all')
+    seed_parser.add_argument('--max-queries', type=int)
+
+    work_parser = subparsers.add_parser('work', help="Claim and run jobs")
+    work_parser.add_argument('--processes', type=int, default=1, help="Worker processes on this host")
+    work_parser.add_argument('--lease', type=float, default=300, help="Lease length in seconds")
+    work_parser.add_argument('--max-jobs', type=int, help="Stop each worker after this many jobs")
+    work_parser.add_argument('--parked-fingerprints', action='append', default=[], metavar='FILE',
+                             help="Extra parked-page fingerprint file (JSON, like parked_fingerprints.json); repeatable")
+
+    merge_parser = subparsers.add_parser('merge', help="Merge finished jobs into result files")
+    merge_parser.add_argument('--sources', default='all')
+    merge_parser.add_argument('--store', default=DEFAULT_STORE_PATH)
+    merge_parser.add_argument('--output-dir', default='.')
+
+    subparsers.add_parser('status', help="Show job counts")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'seed':
+        with JobQueue(args.queue) as queue:
+            added = seed_jobs(queue, args.sources.split(','), args.max_queries)
+            print(f"📥 Enqueued jobs: {added or 'none (already queued)'}")
+            print(f"📊 Queue status: {queue.counts()}")
+
+    elif args.command == 'work':
+        from parked_domains import DEFAULT_FINGERPRINT_PATH
+
+        fingerprint_paths = [DEFAULT_FINGERPRINT_PATH] + args.parked_fingerprints
+        if args.processes <= 1:
+            run_worker(args.queue, lease_seconds=args.lease, max_jobs=args.max_jobs,
+                       parked_fingerprint_paths=fingerprint_paths)
+        else:
+            workers = [
+                multiprocessing.Process(target=run_worker, args=(args.queue, None, args.lease, args.max_jobs),
+                                        kwargs={'parked_fingerprint_paths': fingerprint_paths})
+                for _ in range(args.processes)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        with JobQueue(args.queue) as queue:
+            print(f"📊 Queue status: {queue.counts()}")
+
+    elif args.command == 'merge':
+        merge_results(args.queue, args.sources.split(','), args.store or None, args.output_dir)
+
+    elif args.command == 'status':
+        with JobQueue(args.queue) as queue:
+            print(f"📊 Queue status: {queue.counts()}")
+
+
+if __name__ == "__main__":
+    main()
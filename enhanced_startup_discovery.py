@@ -5,108 +5,102 @@ Real-time discovery of digital health startups across Germany and Europe
 Uses free tools and public directories to find actual startup websites
 """
 
-import requests
 import json
 import csv
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Set
+from typing import AsyncIterator, Iterator, List, Dict, Optional, Sequence, Set, Tuple
 from urllib.parse import urljoin, urlparse
 import random
-from bs4 import BeautifulSoup
+
+from http_session import create_session
+from page_stream import DEFAULT_MAX_BYTES, LinkStream, body_encoding, is_html, read_capped
+from parked_domains import DEFAULT_FINGERPRINT_PATH, FIRST_CHUNK_BYTES, dns_names, get_parked_fingerprints
+from record_stream import aiter_records
+from seed_corpus import SeedCorpus, get_seed_corpus
+from startup_record import RECORD_FIELDS, StartupRecord, records_to_dicts
+
+# Public startup directories that can be scraped; an entry may set 'max_bytes' to override the page byte cap
+PUBLIC_DIRECTORIES = [
+    {
+        'url': 'https://www.startbase.de/companies?industries=healthcare',
+        'name': 'Startbase Healthcare'
+    },
+    {
+        'url': 'https://www.deutsche-startups.de/category/healthtech/',
+        'name': 'Deutsche Startups HealthTech'
+    }
+]
+
+# Startup URLs kept per directory; page reading stops once this many are found
+DIRECTORY_URL_LIMIT = 50
+
+# Obvious non-startup URLs dropped by validation
+EXCLUDED_URL_PATTERNS = [
+    'facebook.com', 'twitter.com', 'linkedin.com', 'instagram.com',
+    'youtube.com', 'google.com', 'microsoft.com', 'amazon.com',
+    'wikipedia.org', 'github.com'
+]
+
+# GitHub API search for health tech repositories
+GITHUB_QUERIES = [
+    'digital health startup',
+    'telemedicine platform',
+    'healthtech company',
+    'medical AI startup',
+    'health app germany',
+    'european health tech'
+]
 
 class EnhancedStartupDiscovery:
-    def __init__(self):
+    def __init__(self, session=None, github_query_limit: int = 2, seed: Optional[int] = None,
+                 seed_corpus: Optional[SeedCorpus] = None, max_page_bytes: int = DEFAULT_MAX_BYTES,
+                 parked_fingerprint_paths: Optional[Sequence[str]] = None, candidate_workers: int = 8):
         self.found_urls = set()
         self.user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': self.user_agent})
+        self.session = session or create_session(self.user_agent)
         self.delay = 2  # Respectful delay between requests
+        self.max_page_bytes = max_page_bytes  # Stop reading directory pages after this many bytes
+        self.github_query_limit = github_query_limit  # Limit to avoid rate limits
+        self.rng = random.Random(seed)  # Seeded for reproducible record/replay runs
+        self.seed_corpus = seed_corpus or get_seed_corpus()
+        self.retry_queue = None  # RetryQueue that failed directory pages and queries are handed to, if any
+        self.stream_summary = {}  # Records per sub-source seen by the latest iter_startups
+        # Parking, for-sale and default server pages that candidate domains are matched against
+        self.parked_fingerprints = get_parked_fingerprints(parked_fingerprint_paths or (DEFAULT_FINGERPRINT_PATH,))
+        self.parked_domains = {}  # Candidate URL -> fingerprint it was rejected for
+        self.candidate_workers = candidate_workers  # Candidate domains checked in parallel
+        self.conference_discovery = None  # Exhibitor list scraper, created on first use
         
-    def get_user_hardcoded_urls(self) -> List[Dict]:
+    def get_user_hardcoded_urls(self) -> List[StartupRecord]:
         """User's verified hardcoded URLs - Priority source"""
         print("🔍 Loading user's verified hardcoded URLs...")
         
-        user_urls = [
-            'https://www.acalta.de',
-            'https://www.actimi.com',
-            'https://www.emmora.de',
-            'https://www.alfa-ai.com',
-            'https://www.apheris.com',
-            'https://www.aporize.com/',
-            'https://www.arztlena.com/',
-            'https://shop.getnutrio.com/',
-            'https://www.auta.health/',
-            'https://visioncheckout.com/',
-            'https://www.avayl.tech/',
-            'https://www.avimedical.com/avi-impact',
-            'https://de.becureglobal.com/',
-            'https://bellehealth.co/de/',
-            'https://www.biotx.ai/',
-            'https://www.brainjo.de/',
-            'https://brea.app/',
-            'https://breathment.com/',
-            'https://de.caona.eu/',
-            'https://www.careanimations.de/',
-            'https://sfs-healthcare.com',
-            'https://www.climedo.de/',
-            'https://www.cliniserve.de/',
-            'https://cogthera.de/#erfahren',
-            'https://www.comuny.de/',
-            'https://curecurve.de/elina-app/',
-            'https://www.cynteract.com/de/rehabilitation',
-            'https://www.healthmeapp.de/de/',
-            'https://deepeye.ai/',
-            'https://www.deepmentation.ai/',
-            'https://denton-systems.de/',
-            'https://www.derma2go.com/',
-            'https://www.dianovi.com/',
-            'http://dopavision.com/',
-            'https://www.dpv-analytics.com/',
-            'http://www.ecovery.de/',
-            'https://elixionmedical.com/',
-            'https://www.empident.de/',
-            'https://eye2you.ai/',
-            'https://www.fitwhit.de',
-            'https://www.floy.com/',
-            'https://fyzo.de/assistant/',
-            'https://www.gesund.de/app',
-            'https://www.glaice.de/',
-            'https://gleea.de/',
-            'https://www.guidecare.de/',
-            'https://www.apodienste.com/',
-            'https://www.help-app.de/',
-            'https://www.heynanny.com/',
-            'https://incontalert.de/',
-            'https://home.informme.info/',
-            'https://www.kranushealth.com/de/therapien/haeufiger-harndrang',
-            'https://www.kranushealth.com/de/therapien/inkontinenz'
-        ]
-        
-        results = []
-        for url in user_urls:
-            results.append({
-                'url': url,
-                'source': 'User Verified',
-                'confidence': 10,
-                'category': 'Verified Health Tech'
-            })
+        results = self.seed_corpus.records('verified')
             
         print(f"✅ Loaded {len(results)} verified user URLs")
         return results
 
-    def scrape_startup_directory(self, url: str, directory_name: str) -> List[Dict]:
-        """Scrape startup directories for real company URLs"""
+    def scrape_startup_directory(self, url: str, directory_name: str, max_bytes: Optional[int] = None,
+                                 raise_errors: bool = False) -> List[StartupRecord]:
+        """Scrape startup directories for real company URLs
+        
+        A failed page is reported and queued for a retry; with
+        ``raise_errors`` the error is raised instead, for callers that track
+        failures themselves (job runners).
+        """
         print(f"🔍 Scraping {directory_name}...")
         results = []
+        seen_urls = set()
+        
+        if self.session.budget_exhausted:
+            print(f"⏹️ Budget spent, skipping {directory_name}")
+            return results
         
         try:
             time.sleep(self.delay)
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
             
             # Find links that look like startup websites
             startup_patterns = [
@@ -114,114 +108,119 @@ class EnhancedStartupDiscovery:
                 r'https?://[^/]+\.(?:app|health|tech|ai|io|co)/?'
             ]
             
-            for link in soup.find_all('a', href=True):
-                href = link.get('href')
-                if not href:
-                    continue
+            # Links are parsed while the page downloads; stop reading once the directory limit is reached
+            with LinkStream(self.session, url, max_bytes=max_bytes or self.max_page_bytes, timeout=15) as links:
+                for href in links:
+                    # Convert relative URLs to absolute
+                    if href.startswith('/'):
+                        href = urljoin(url, href)
                     
-                # Convert relative URLs to absolute
-                if href.startswith('/'):
-                    href = urljoin(url, href)
-                
-                # Check if it matches startup patterns
-                for pattern in startup_patterns:
-                    if re.match(pattern, href):
-                        domain = urlparse(href).netloc
-                        # Filter out directory sites themselves and common platforms
-                        exclude_domains = ['startbase.com', 'eu-startups.com', 'startup-db.com', 
-                                         'crunchbase.com', 'linkedin.com', 'twitter.com', 'facebook.com',
-                                         'google.com', 'youtube.com']
+                    # Check if it matches startup patterns
+                    for pattern in startup_patterns:
+                        if re.match(pattern, href):
+                            domain = urlparse(href).netloc
+                            # Filter out directory sites themselves and common platforms
+                            exclude_domains = ['startbase.com', 'eu-startups.com', 'startup-db.com', 
+                                             'crunchbase.com', 'linkedin.com', 'twitter.com', 'facebook.com',
+                                             'google.com', 'youtube.com']
+                            
+                            if not any(excluded in domain for excluded in exclude_domains):
+                                # Clean URL
+                                clean_url = f"https://{domain}"
+                                if clean_url not in seen_urls:
+                                    seen_urls.add(clean_url)
+                                    results.append(StartupRecord(
+                                        url=clean_url,
+                                        source=directory_name,
+                                        confidence=7,
+                                        category='Directory Listed'
+                                    ))
+                    
+                    if len(results) >= DIRECTORY_URL_LIMIT:
+                        break
                         
-                        if not any(excluded in domain for excluded in exclude_domains):
-                            # Clean URL
-                            clean_url = f"https://{domain}"
-                            if clean_url not in [r['url'] for r in results]:
-                                results.append({
-                                    'url': clean_url,
-                                    'source': directory_name,
-                                    'confidence': 7,
-                                    'category': 'Directory Listed'
-                                })
-                                
-            print(f"✅ Found {len(results)} URLs from {directory_name}")
+            cap_note = ", byte cap reached" if links.truncated else ""
+            print(f"✅ Found {len(results)} URLs from {directory_name} ({links.bytes_read // 1024} KB read{cap_note})")
             
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"⚠️ Error scraping {directory_name}: {str(e)}")
+            if self.retry_queue is not None:
+                payload = {'url': url, 'name': directory_name}
+                if max_bytes:
+                    payload['max_bytes'] = max_bytes
+                self.retry_queue.record_failure('directory_page', payload, e)
             
-        return results[:50]  # Limit to 50 per directory to avoid overwhelming
+        return results[:DIRECTORY_URL_LIMIT]  # Limit per directory to avoid overwhelming
 
-    def search_github_health_projects(self) -> List[Dict]:
-        """Find health tech projects on GitHub that have company websites"""
-        print("🔍 Searching GitHub for health tech projects...")
+    def search_github_query(self, query: str) -> List[StartupRecord]:
+        """Run one GitHub repository search and return projects with company homepages"""
         results = []
+        time.sleep(self.delay)
+        api_url = f"https://api.github.com/search/repositories?q={query.replace(' ', '+')}&sort=stars&order=desc"
+        response = self.session.get(api_url, timeout=10)
         
-        # GitHub API search for health tech repositories
-        github_queries = [
-            'digital health startup',
-            'telemedicine platform',
-            'healthtech company',
-            'medical AI startup',
-            'health app germany',
-            'european health tech'
-        ]
+        if response.status_code == 200:
+            data = response.json()
+            for repo in data.get('items', [])[:10]:  # Top 10 per query
+                # Check for homepage URL
+                homepage = repo.get('homepage')
+                if homepage and homepage.startswith('http'):
+                    # Validate it's not just GitHub or common platforms
+                    domain = urlparse(homepage).netloc
+                    if not any(platform in domain for platform in ['github.com', 'gitlab.com', 'npmjs.com']):
+                        results.append(StartupRecord(
+                            url=homepage,
+                            source=f'GitHub: {query}',
+                            confidence=6,
+                            category='GitHub Project'
+                        ))
+        return results
+
+    def iter_github_health_projects(self) -> Iterator[StartupRecord]:
+        """Yield GitHub projects with company websites query by query"""
+        print("🔍 Searching GitHub for health tech projects...")
+        found = 0
         
-        for query in github_queries[:2]:  # Limit to avoid rate limits
+        for query in GITHUB_QUERIES[:self.github_query_limit]:
+            if self.session.budget_exhausted:
+                print("⏹️ Budget spent, stopping GitHub search")
+                break
             try:
-                time.sleep(self.delay)
-                api_url = f"https://api.github.com/search/repositories?q={query.replace(' ', '+')}&sort=stars&order=desc"
-                response = self.session.get(api_url, timeout=10)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    for repo in data.get('items', [])[:10]:  # Top 10 per query
-                        # Check for homepage URL
-                        homepage = repo.get('homepage')
-                        if homepage and homepage.startswith('http'):
-                            # Validate it's not just GitHub or common platforms
-                            domain = urlparse(homepage).netloc
-                            if not any(platform in domain for platform in ['github.com', 'gitlab.com', 'npmjs.com']):
-                                results.append({
-                                    'url': homepage,
-                                    'source': f'GitHub: {query}',
-                                    'confidence': 6,
-                                    'category': 'GitHub Project'
-                                })
-                                
+                results = self.search_github_query(query)
             except Exception as e:
                 print(f"⚠️ GitHub search error: {str(e)}")
+                if self.retry_queue is not None:
+                    self.retry_queue.record_failure('github_query', {'query': query}, e)
                 continue
+            found += len(results)
+            yield from results
                 
-        print(f"✅ Found {len(results)} URLs from GitHub")
-        return results
+        print(f"✅ Found {found} URLs from GitHub")
 
-    def discover_from_public_directories(self) -> List[Dict]:
-        """Discover startups from public startup directories"""
+    def search_github_health_projects(self) -> List[StartupRecord]:
+        """Find health tech projects on GitHub that have company websites"""
+        return list(self.iter_github_health_projects())
+
+    def iter_public_directories(self) -> Iterator[StartupRecord]:
+        """Yield directory listings directory by directory"""
         print("🔍 Discovering from public startup directories...")
-        results = []
-        
-        # Public startup directories that can be scraped
-        directories = [
-            {
-                'url': 'https://www.startbase.de/companies?industries=healthcare',
-                'name': 'Startbase Healthcare'
-            },
-            {
-                'url': 'https://www.deutsche-startups.de/category/healthtech/',
-                'name': 'Deutsche Startups HealthTech'
-            }
-        ]
         
-        for directory in directories:
+        for directory in PUBLIC_DIRECTORIES:
             try:
-                dir_results = self.scrape_startup_directory(directory['url'], directory['name'])
-                results.extend(dir_results)
+                dir_results = self.scrape_startup_directory(directory['url'], directory['name'],
+                                                            directory.get('max_bytes'))
             except Exception as e:
                 print(f"⚠️ Error with {directory['name']}: {str(e)}")
                 continue
-                
-        return results
+            yield from dir_results
+
+    def discover_from_public_directories(self) -> List[StartupRecord]:
+        """Discover startups from public startup directories"""
+        return list(self.iter_public_directories())
 
-    def generate_potential_health_domains(self) -> List[Dict]:
+    def generate_potential_health_domains(self) -> List[StartupRecord]:
         """Generate potential health tech domains based on common patterns"""
         print("🔍 Generating potential health tech domains...")
         results = []
@@ -238,67 +237,109 @@ class EnhancedStartupDiscovery:
             for tech in tech_terms[:5]:
                 for tld in country_tlds[:3]:
                     potential_domain = f"https://{health}{tech}{tld}"
-                    results.append({
-                        'url': potential_domain,
-                        'source': 'Generated Pattern',
-                        'confidence': 3,
-                        'category': 'Potential Domain'
-                    })
+                    results.append(StartupRecord(
+                        url=potential_domain,
+                        source='Generated Pattern',
+                        confidence=3,
+                        category='Potential Domain'
+                    ))
                     
                     # Also try with dash
                     potential_domain = f"https://{health}-{tech}{tld}"
-                    results.append({
-                        'url': potential_domain,
-                        'source': 'Generated Pattern',
-                        'confidence': 3,
-                        'category': 'Potential Domain'
-                    })
+                    results.append(StartupRecord(
+                        url=potential_domain,
+                        source='Generated Pattern',
+                        confidence=3,
+                        category='Potential Domain'
+                    ))
                     
         # Shuffle and limit to avoid too many generated domains
-        random.shuffle(results)
+        self.rng.shuffle(results)
         return results[:100]
 
-    def discover_from_conference_websites(self) -> List[Dict]:
-        """Discover startups from health tech conference exhibitor lists"""
-        print("🔍 Discovering from health tech conferences...")
-        results = []
-        
-        # Known health tech conferences with exhibitor lists
-        conferences = [
-            'https://www.himss.org/exhibitors',
-            'https://www.medica.de/exhibitor-search',
-            'https://www.healthtech-event.de/exhibitors'
-        ]
+    def check_candidate_domains(self, candidates: List[StartupRecord]) -> List[StartupRecord]:
+        """Keep only generated candidate domains that answer with a real site
         
-        # This is a simplified version - in practice would need specific scrapers for each conference
-        # For now, adding some known companies from typical conference participants
-        conference_companies = [
-            'https://www.doctolib.de',
-            'https://www.kaia-health.com',
-            'https://www.ada.com',
-            'https://www.teleclinic.com',
-            'https://www.medwing.com',
-            'https://www.zavamed.com',
-            'https://www.felmo.de',
-            'https://www.viomedo.de',
-            'https://www.caresyntax.com',
-            'https://www.merantix.com',
-            'https://www.contextflow.com',
-            'https://www.heartkinetics.com'
-        ]
+        Hosts whose DNS points at a parking service are dropped without a
+        request. The others are fetched, but only the first chunk of the
+        homepage is read: enough to recognize parking, for-sale and default
+        server pages (see parked_domains). Candidates are checked
+        ``candidate_workers`` at a time; results keep the candidate order.
+        """
+        print(f"🔍 Checking {len(candidates)} candidate domains...")
+        with ThreadPoolExecutor(max_workers=self.candidate_workers) as executor:
+            checks = list(executor.map(self.check_candidate, candidates))
         
-        for company_url in conference_companies:
-            results.append({
-                'url': company_url,
-                'source': 'Health Tech Conference',
-                'confidence': 8,
-                'category': 'Conference Exhibitor'
-            })
-            
-        print(f"✅ Found {len(results)} conference exhibitor URLs")
-        return results
+        live_results = []
+        parked = 0
+        for candidate, (status, fingerprint) in zip(candidates, checks):
+            if status == 'parked':
+                self.parked_domains[candidate.url] = fingerprint
+                parked += 1
+            elif status == 'live':
+                live_results.append(candidate)
+        if any(status == 'skipped' for status, _ in checks):
+            print("⏹️ Budget spent, stopped candidate checks early")
+                
+        print(f"✅ {len(live_results)} of {len(candidates)} candidate domains are live "
+              f"({parked} parked or placeholder pages rejected)")
+        return live_results
 
-    def validate_and_filter_urls(self, all_discovered_urls: List[Dict]) -> List[Dict]:
+    def check_candidate(self, candidate: StartupRecord) -> Tuple[str, Optional[str]]:
+        """('live' | 'parked' | 'dead' | 'skipped', fingerprint) for one candidate domain"""
+        if self.session.budget_exhausted:
+            return 'skipped', None
+        host = urlparse(candidate.url).hostname or ''
+        fingerprint = self.parked_fingerprints.match_dns(self.candidate_dns_names(host))
+        if fingerprint is not None:
+            return 'parked', fingerprint
+        try:
+            # Each candidate is a different host, so no politeness delay is needed here
+            with self.session.get(candidate.url, timeout=5, stream=True) as response:
+                # 401 and 403 still mean a site is there, just behind a login or a bot filter;
+                # other client and server errors are missing or broken pages
+                if response.status_code >= 400 and response.status_code not in (401, 403):
+                    return 'dead', None
+                # Parking services often redirect to their marketplace
+                fingerprint = self.parked_fingerprints.match_dns([urlparse(response.url).hostname or ''])
+                if fingerprint is None and is_html(response):
+                    chunk = read_capped(response, FIRST_CHUNK_BYTES)
+                    fingerprint = self.parked_fingerprints.match_page(host, chunk, body_encoding(response))
+        except Exception:
+            return 'dead', None
+        return ('parked', fingerprint) if fingerprint is not None else ('live', None)
+
+    def candidate_dns_names(self, host: str) -> List[str]:
+        """DNS names of a candidate host; archived when recording, so a replay sees the same answers"""
+        archive = getattr(self.session, 'archive', None)
+        mode = getattr(archive, 'mode', None)
+        if mode == 'replay':
+            return archive.states.get(f'dns_names:{host}', {}).get('names', [])
+        names = dns_names(host)
+        if mode == 'record':
+            archive.write_state(f'dns_names:{host}', {'names': names})
+        return names
+
+    def discover_generated_domains(self) -> List[StartupRecord]:
+        """Generated candidate domains that serve a real site, parked and placeholder pages rejected"""
+        return self.check_candidate_domains(self.generate_potential_health_domains())
+
+    def discover_from_conference_websites(self) -> List[StartupRecord]:
+        """Discover companies from health tech conference exhibitor lists (see conference_exhibitors)"""
+        if self.conference_discovery is None:
+            from conference_exhibitors import ConferenceExhibitorDiscovery
+            self.conference_discovery = ConferenceExhibitorDiscovery(self.session, self.seed_corpus)
+        self.conference_discovery.delay = self.delay
+        return self.conference_discovery.discover_from_conference_websites()
+
+    @staticmethod
+    def is_valid_url(url: str) -> bool:
+        """Basic URL validation: an http(s) URL that is not an obvious non-startup site"""
+        if not url.startswith(('http://', 'https://')):
+            return False
+        return not any(pattern in url for pattern in EXCLUDED_URL_PATTERNS)
+
+    def validate_and_filter_urls(self, all_discovered_urls: List[StartupRecord]) -> List[StartupRecord]:
         """Validate and filter discovered URLs"""
         print("🔍 Validating and filtering discovered URLs...")
         
@@ -306,70 +347,71 @@ class EnhancedStartupDiscovery:
         filtered_results = []
         
         # Sort by confidence score (highest first)
-        sorted_urls = sorted(all_discovered_urls, key=lambda x: x['confidence'], reverse=True)
+        sorted_urls = sorted(all_discovered_urls, key=lambda x: x.confidence, reverse=True)
         
         for url_data in sorted_urls:
-            url = url_data['url']
+            url = url_data.url
             
             # Remove duplicates
             if url in seen_urls:
                 continue
             seen_urls.add(url)
             
-            # Basic URL validation
-            if not url.startswith(('http://', 'https://')):
-                continue
-                
-            # Filter out obvious non-startup URLs
-            exclude_patterns = [
-                'facebook.com', 'twitter.com', 'linkedin.com', 'instagram.com',
-                'youtube.com', 'google.com', 'microsoft.com', 'amazon.com',
-                'wikipedia.org', 'github.com'
-            ]
-            
-            if any(pattern in url for pattern in exclude_patterns):
-                continue
-                
-            filtered_results.append(url_data)
+            if self.is_valid_url(url):
+                filtered_results.append(url_data)
             
         print(f"✅ Filtered to {len(filtered_results)} unique URLs")
         return filtered_results
 
+    def iter_startups(self) -> Iterator[StartupRecord]:
+        """Yield every valid startup record as soon as it is found, deduplicated by URL
+        
+        Sub-sources run from the highest confidence down (verified, conference
+        exhibitors, directories, GitHub, generated domains), so the first
+        sighting of a URL is also its best-scored one and nothing needs to be
+        held back for ranking. Per sub-source counts are kept in
+        ``stream_summary`` as the stream advances.
+        """
+        sub_sources = (
+            ('user_verified', 'User Verified', self.get_user_hardcoded_urls),
+            ('conference_exhibitors', 'Conference Exhibitors', self.discover_from_conference_websites),
+            ('public_directories', 'Public Directories', self.iter_public_directories),
+            ('github_projects', 'GitHub Projects', self.iter_github_health_projects),
+            ('generated_domains', 'Generated Domains', self.discover_generated_domains),
+        )
+        self.stream_summary = {key: 0 for key, _, _ in sub_sources}
+        self.stream_summary['total_before_filtering'] = 0
+        seen_urls = set()
+        
+        for key, _, discover in sub_sources:
+            for record in discover():
+                self.stream_summary[key] += 1
+                self.stream_summary['total_before_filtering'] += 1
+                if record.url not in seen_urls:
+                    seen_urls.add(record.url)
+                    if self.is_valid_url(record.url):
+                        yield record
+
+    async def aiter_startups(self) -> AsyncIterator[StartupRecord]:
+        """``iter_startups`` as an async iterator, for use from an event loop"""
+        async for record in aiter_records(self.iter_startups()):
+            yield record
+
     def discover_all_startups(self) -> Dict:
         """Main method to discover all startup URLs"""
         print("🚀 Starting enhanced startup discovery...")
         print("=" * 60)
         
-        all_results = []
-        discovery_methods = []
-        
-        # 1. User hardcoded URLs (highest priority)
-        user_results = self.get_user_hardcoded_urls()
-        all_results.extend(user_results)
-        discovery_methods.append(f"User Verified: {len(user_results)} URLs")
-        
-        # 2. Public startup directories
-        directory_results = self.discover_from_public_directories()
-        all_results.extend(directory_results)
-        discovery_methods.append(f"Public Directories: {len(directory_results)} URLs")
-        
-        # 3. GitHub health tech projects
-        github_results = self.search_github_health_projects()
-        all_results.extend(github_results)
-        discovery_methods.append(f"GitHub Projects: {len(github_results)} URLs")
-        
-        # 4. Conference exhibitors
-        conference_results = self.discover_from_conference_websites()
-        all_results.extend(conference_results)
-        discovery_methods.append(f"Conference Exhibitors: {len(conference_results)} URLs")
-        
-        # 5. Generated potential domains (lowest priority)
-        generated_results = self.generate_potential_health_domains()
-        all_results.extend(generated_results)
-        discovery_methods.append(f"Generated Domains: {len(generated_results)} URLs")
-        
-        # Validate and filter
-        filtered_results = self.validate_and_filter_urls(all_results)
+        # Streamed records arrive deduplicated; rank them by confidence (highest first)
+        filtered_results = sorted(self.iter_startups(), key=lambda x: x.confidence, reverse=True)
+        summary = self.stream_summary
+        discovery_methods = [
+            f"User Verified: {summary['user_verified']} URLs",
+            f"Public Directories: {summary['public_directories']} URLs",
+            f"GitHub Projects: {summary['github_projects']} URLs",
+            f"Conference Exhibitors: {summary['conference_exhibitors']} URLs",
+            f"Generated Domains: {summary['generated_domains']} URLs"
+        ]
         
         # Prepare final results
         final_results = {
@@ -377,12 +419,12 @@ class EnhancedStartupDiscovery:
             'discovery_methods': discovery_methods,
             'urls': filtered_results,
             'summary': {
-                'user_verified': len(user_results),
-                'public_directories': len(directory_results),
-                'github_projects': len(github_results),
-                'conference_exhibitors': len(conference_results),
-                'generated_domains': len(generated_results),
-                'total_before_filtering': len(all_results),
+                'user_verified': summary['user_verified'],
+                'public_directories': summary['public_directories'],
+                'github_projects': summary['github_projects'],
+                'conference_exhibitors': summary['conference_exhibitors'],
+                'generated_domains': summary['generated_domains'],
+                'total_before_filtering': summary['total_before_filtering'],
                 'total_after_filtering': len(filtered_results)
             }
         }
@@ -403,16 +445,17 @@ class EnhancedStartupDiscovery:
         
         # Save CSV
         with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['url', 'source', 'confidence', 'category']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            # Every record field, so optional ones (country, company_name, ...) have a column
+            writer = csv.DictWriter(csvfile, fieldnames=list(RECORD_FIELDS))
             writer.writeheader()
             
             for url_data in results['urls']:
-                writer.writerow(url_data)
+                writer.writerow(url_data.to_dict())
         
         # Save JSON
         with open(json_filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump(results, jsonfile, indent=2, ensure_ascii=False)
+            json_results = dict(results, urls=records_to_dicts(results['urls']))
+            json.dump(json_results, jsonfile, indent=2, ensure_ascii=False)
         
         print(f"\n📁 Results saved:")
         print(f"  • CSV: {csv_filename}")
@@ -446,7 +489,7 @@ def main():
     print(f"📁 Files created: {csv_file}, {json_file}")
     print("\n🔍 Top 10 Discovered URLs:")
     for i, url_data in enumerate(results['urls'][:10], 1):
-        print(f"  {i:2d}. {url_data['url']} ({url_data['source']}, confidence: {url_data['confidence']})")
+        print(f"  {i:2d}. {url_data.url} ({url_data.source}, confidence: {url_data.confidence})")
     
     print(f"\n✅ Ready for URL evaluation and company name extraction!")
     print(f"📋 Next steps:")
@@ -5,65 +5,146 @@ Uses Google search results to find digital health startups
 Scrapes search results for real startup URLs
 """
 
-import requests
 import time
 import re
+import random
 from urllib.parse import urljoin, urlparse, quote_plus
-from bs4 import BeautifulSoup
 import json
 import csv
 from datetime import datetime
-from typing import List, Dict, Set
+from typing import AsyncIterator, Iterator, List, Dict, Optional, Set
+
+from http_session import create_session
+from query_scheduler import QueryYieldScheduler
+from record_stream import aiter_records
+from search_backends import DEFAULT_BACKENDS, SearchFanout, create_backend
+from seed_corpus import SeedCorpus, get_seed_corpus
+from startup_record import StartupRecord, records_to_dicts
+
+# Google query categories and the labels their results are recorded with
+SEARCH_CATEGORIES = {
+    'german': {
+        'queries': [
+            "digital health startup Germany site:.de",
+            "telemedicine startup Deutschland",
+            "health tech company Berlin Munich",
+            "medical AI startup Germany",
+            "e-health startup Deutschland site:.de",
+            "digital therapeutics Germany",
+            "healthtech startup Berlin",
+            "medtech company Germany innovation"
+        ],
+        'confidence': 7,
+        'category': 'German Health Tech',
+        'country': 'Germany'
+    },
+    'european': {
+        'queries': [
+            "digital health startup Europe",
+            "telemedicine company France UK Netherlands",
+            "health tech startup Switzerland Austria",
+            "medical AI Europe startup",
+            "e-health platform Scandinavia",
+            "digital therapeutics startup Nordic",
+            "healthtech company Italy Spain",
+            "health app startup Europe"
+        ],
+        'confidence': 6,
+        'category': 'European Health Tech',
+        'country': 'Europe'
+    },
+    'domain_specific': {
+        'queries': [
+            "AI diagnostics startup Europe",
+            "telemedicine platform Germany",
+            "digital therapeutics app",
+            "remote patient monitoring startup",
+            "health data analytics company",
+            "medical device software startup",
+            "clinical trial platform Europe",
+            "pharmacy automation startup"
+        ],
+        'confidence': 6,
+        'category': 'Domain Specific',
+        'country': 'Various'
+    },
+    'directories': {
+        'queries': [
+            "startup directory health tech Germany",
+            "European health startup list",
+            "digital health company directory",
+            "medical technology startup database"
+        ],
+        # These might be directories, so lower confidence
+        'confidence': 5,
+        'category': 'Directory Listed',
+        'country': 'Various'
+    }
+}
+
+# Domain keywords that raise a result's health score and confidence
+HEALTH_KEYWORDS = [
+    'health', 'medical', 'medicine', 'clinic', 'hospital', 'patient',
+    'therapy', 'treatment', 'diagnostic', 'pharma', 'biotech',
+    'telemedicine', 'digital health', 'e-health', 'medtech',
+    'ai', 'artificial intelligence', 'data', 'analytics', 'platform'
+]
 
 class GoogleSearchStartupFinder:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    def __init__(self, session=None, max_queries: Optional[int] = None,
+                 scheduler: Optional[QueryYieldScheduler] = None, seed_corpus: Optional[SeedCorpus] = None):
+        self.session = session or create_session(
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        )
         self.delay = 3  # Respectful delay between searches
         self.found_urls = set()
+        self.max_queries = max_queries  # Cap on Google queries per run, None for all
+        self.queries_run = 0
+        self.last_search_failed = False
+        self.last_search_error = None
+        self.retry_queue = None  # RetryQueue that failed queries are handed to, if any
+        self.stream_summary = {}  # Records per phase seen by the latest iter_startups
+        self.rng = random.Random()  # Draws the retired queries to re-try; seeded for reproducible record/replay runs
+        self.scheduler = scheduler or QueryYieldScheduler(rng=self.rng)
+        self.seed_corpus = seed_corpus or get_seed_corpus()
+        self.set_search_backends(DEFAULT_BACKENDS)
+        
+    def set_search_backends(self, specs: List[str], deterministic: bool = False):
+        """Choose the search providers, e.g. ['google', 'duckduckgo', 'searxng=http://localhost:8888']"""
+        backends = [create_backend(spec, self.session) for spec in specs]
+        if getattr(self, 'search_fanout', None) is not None:
+            self.search_fanout.close()
+        self.search_fanout = SearchFanout(backends, max_results=20, deterministic=deterministic)
+
+    def close(self):
+        """Stop the search threads; the finder can still be used afterwards"""
+        self.search_fanout.close()
+        
+    def query_budget_left(self) -> bool:
+        """Whether another search may be issued under the query and request budgets"""
+        if self.max_queries is not None and self.queries_run >= self.max_queries:
+            return False
+        return not self.session.budget_exhausted
         
     def search_google(self, query: str, num_results: int = 20) -> List[str]:
-        """Search Google and extract URLs from results"""
-        print(f"🔍 Searching Google for: '{query}'")
+        """Search all enabled backends concurrently and extract candidate startup URLs"""
+        if not self.query_budget_left():
+            return []
+        self.queries_run += 1
+        self.last_search_failed = False
+        backend_names = ', '.join(backend.name for backend in self.search_fanout.active_backends)
+        print(f"🔍 Searching for: '{query}' ({backend_names or 'no backends left'})")
         
         try:
-            # URL encode the query
-            encoded_query = quote_plus(query)
-            search_url = f"https://www.google.com/search?q={encoded_query}&num={num_results}"
-            
             time.sleep(self.delay)
-            response = self.session.get(search_url, timeout=15)
-            response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find search result links
-            urls = []
-            
-            # Google search result selectors (these may change)
-            result_selectors = [
-                'div.g a[href^="http"]',
-                'div.r a[href^="http"]',
-                'h3 a[href^="http"]',
-                'a[href^="http"]:has(h3)'
-            ]
-            
-            for selector in result_selectors:
-                links = soup.select(selector)
-                for link in links:
-                    href = link.get('href')
-                    if href and href.startswith('http'):
-                        # Clean URL
-                        clean_url = href.split('&')[0]  # Remove Google tracking parameters
-                        if clean_url not in urls:
-                            urls.append(clean_url)
+            # First distinct results across backends, redirect wrappers already decoded
+            urls = self.search_fanout.search(query, num_results)
             
             # Filter out Google, YouTube, and other non-startup URLs
             startup_urls = []
             exclude_domains = [
-                'google.com', 'youtube.com', 'facebook.com', 'twitter.com', 'linkedin.com',
+                'google.com', 'duckduckgo.com', 'youtube.com', 'facebook.com', 'twitter.com', 'linkedin.com',
                 'wikipedia.org', 'crunchbase.com', 'angel.co', 'techcrunch.com',
                 'forbes.com', 'reuters.com', 'bloomberg.com'
             ]
@@ -79,302 +160,186 @@ class GoogleSearchStartupFinder:
             return startup_urls[:15]  # Limit results
             
         except Exception as e:
-            print(f"  ⚠️ Error searching Google: {str(e)}")
+            print(f"  ⚠️ Error searching: {str(e)}")
+            self.last_search_failed = True
+            self.last_search_error = e
             return []
 
-    def discover_german_health_startups(self) -> List[Dict]:
-        """Discover German digital health startups"""
-        print("🇩🇪 Discovering German digital health startups...")
+    def search_query_records(self, query: str, category_name: str) -> List[StartupRecord]:
+        """Run one search query and return records for URLs not found before"""
+        spec = SEARCH_CATEGORIES[category_name]
+        results = []
+        if not self.query_budget_left():
+            return results
         
-        german_queries = [
-            "digital health startup Germany site:.de",
-            "telemedicine startup Deutschland",
-            "health tech company Berlin Munich",
-            "medical AI startup Germany",
-            "e-health startup Deutschland site:.de",
-            "digital therapeutics Germany",
-            "healthtech startup Berlin",
-            "medtech company Germany innovation"
-        ]
+        urls = self.search_google(query)
+        for url in urls:
+            # Seeds are listed with better labels already, whatever form the search result has
+            if url not in self.found_urls and url not in self.seed_corpus:
+                self.found_urls.add(url)
+                results.append(StartupRecord(
+                    url=url,
+                    source=f'Google: {query}',
+                    confidence=spec['confidence'],
+                    category=spec['category'],
+                    country=spec['country']
+                ))
         
-        results = []
-        for query in german_queries:
-            urls = self.search_google(query)
-            for url in urls:
-                if url not in self.found_urls:
-                    self.found_urls.add(url)
-                    results.append({
-                        'url': url,
-                        'source': f'Google: {query}',
-                        'confidence': 7,
-                        'category': 'German Health Tech',
-                        'country': 'Germany'
-                    })
-                    
+        # Failed requests say nothing about the query, so only successful ones count toward its yield
+        if not self.last_search_failed:
+            self.scheduler.record(query, category_name, requests=1, new_urls=len(results))
+        elif self.retry_queue is not None:
+            self.retry_queue.record_failure('google_query', {'query': query, 'category': category_name},
+                                            self.last_search_error)
+        return results
+
+    def iter_search_category(self, category_name: str) -> Iterator[StartupRecord]:
+        """Yield a search category's records query by query, in order of yield, stopping once they stop paying off"""
+        queries = SEARCH_CATEGORIES[category_name]['queries']
+        planned = self.scheduler.plan(queries)
+        if len(planned) < len(queries):
+            print(f"  ⏭️ Skipping {len(queries) - len(planned)} low-yield queries")
+        
+        try:
+            for query in planned:
+                if not self.query_budget_left():
+                    break
+                yield from self.search_query_records(query, category_name)
+                if self.scheduler.category_exhausted(category_name):
+                    print(f"  ⏹️ Marginal yield below {self.scheduler.stop_threshold} new URLs/request, stopping category early")
+                    break
+        finally:
+            self.scheduler.save()
+
+    def run_search_category(self, category_name: str) -> List[StartupRecord]:
+        """Run a search category's queries in order of yield, stopping once they stop paying off"""
+        return list(self.iter_search_category(category_name))
+
+    def discover_german_health_startups(self) -> List[StartupRecord]:
+        """Discover German digital health startups"""
+        print("🇩🇪 Discovering German digital health startups...")
+        results = self.run_search_category('german')
         print(f"🇩🇪 Found {len(results)} German startup URLs")
         return results
 
-    def discover_european_health_startups(self) -> List[Dict]:
+    def discover_european_health_startups(self) -> List[StartupRecord]:
         """Discover European digital health startups"""
         print("🇪🇺 Discovering European digital health startups...")
-        
-        european_queries = [
-            "digital health startup Europe",
-            "telemedicine company France UK Netherlands",
-            "health tech startup Switzerland Austria",
-            "medical AI Europe startup",
-            "e-health platform Scandinavia",
-            "digital therapeutics startup Nordic",
-            "healthtech company Italy Spain",
-            "health app startup Europe"
-        ]
-        
-        results = []
-        for query in european_queries:
-            urls = self.search_google(query)
-            for url in urls:
-                if url not in self.found_urls:
-                    self.found_urls.add(url)
-                    results.append({
-                        'url': url,
-                        'source': f'Google: {query}',
-                        'confidence': 6,
-                        'category': 'European Health Tech',
-                        'country': 'Europe'
-                    })
-                    
+        results = self.run_search_category('european')
         print(f"🇪🇺 Found {len(results)} European startup URLs")
         return results
 
-    def discover_specific_health_domains(self) -> List[Dict]:
+    def discover_specific_health_domains(self) -> List[StartupRecord]:
         """Discover startups in specific health domains"""
         print("🎯 Discovering domain-specific health startups...")
-        
-        domain_queries = [
-            "AI diagnostics startup Europe",
-            "telemedicine platform Germany",
-            "digital therapeutics app",
-            "remote patient monitoring startup",
-            "health data analytics company",
-            "medical device software startup",
-            "clinical trial platform Europe",
-            "pharmacy automation startup"
-        ]
-        
-        results = []
-        for query in domain_queries:
-            urls = self.search_google(query)
-            for url in urls:
-                if url not in self.found_urls:
-                    self.found_urls.add(url)
-                    results.append({
-                        'url': url,
-                        'source': f'Google: {query}',
-                        'confidence': 6,
-                        'category': 'Domain Specific',
-                        'country': 'Various'
-                    })
-                    
+        results = self.run_search_category('domain_specific')
         print(f"🎯 Found {len(results)} domain-specific startup URLs")
         return results
 
-    def discover_startup_directories(self) -> List[Dict]:
+    def discover_startup_directories(self) -> List[StartupRecord]:
         """Find startups through directory searches"""
         print("📁 Searching startup directories...")
-        
-        directory_queries = [
-            "startup directory health tech Germany",
-            "European health startup list",
-            "digital health company directory",
-            "medical technology startup database"
-        ]
-        
-        results = []
-        for query in directory_queries:
-            urls = self.search_google(query)
-            for url in urls:
-                if url not in self.found_urls:
-                    self.found_urls.add(url)
-                    # These might be directories, so lower confidence
-                    results.append({
-                        'url': url,
-                        'source': f'Google: {query}',
-                        'confidence': 5,
-                        'category': 'Directory Listed',
-                        'country': 'Various'
-                    })
-                    
+        results = self.run_search_category('directories')
         print(f"📁 Found {len(results)} directory URLs")
         return results
 
-    def validate_health_tech_urls(self, urls: List[Dict]) -> List[Dict]:
-        """Validate that URLs are likely health tech companies"""
-        print("🧪 Validating health tech relevance...")
+    @staticmethod
+    def score_health_relevance(url_data: StartupRecord) -> StartupRecord:
+        """Set a record's health score from its domain and raise its confidence accordingly"""
+        domain = urlparse(url_data.url).netloc.lower()
         
-        health_keywords = [
-            'health', 'medical', 'medicine', 'clinic', 'hospital', 'patient', 
-            'therapy', 'treatment', 'diagnostic', 'pharma', 'biotech',
-            'telemedicine', 'digital health', 'e-health', 'medtech',
-            'ai', 'artificial intelligence', 'data', 'analytics', 'platform'
-        ]
+        # Check if domain contains health-related keywords
+        domain_health_score = sum(1 for keyword in HEALTH_KEYWORDS if keyword in domain)
         
-        validated_urls = []
+        # Higher confidence for domains with health keywords; others are kept with their confidence
+        if domain_health_score > 0:
+            url_data.confidence = min(url_data.confidence + domain_health_score, 10)
+        url_data.health_score = domain_health_score
+        return url_data
+
+    def validate_health_tech_urls(self, urls: List[StartupRecord]) -> List[StartupRecord]:
+        """Validate that URLs are likely health tech companies"""
+        print("🧪 Validating health tech relevance...")
         
-        for url_data in urls:
-            url = url_data['url']
-            domain = urlparse(url).netloc.lower()
-            
-            # Check if domain contains health-related keywords
-            domain_health_score = sum(1 for keyword in health_keywords if keyword in domain)
-            
-            # Higher confidence for domains with health keywords
-            if domain_health_score > 0:
-                url_data['confidence'] = min(url_data['confidence'] + domain_health_score, 10)
-                url_data['health_score'] = domain_health_score
-                validated_urls.append(url_data)
-            else:
-                # Keep but with lower confidence
-                url_data['health_score'] = 0
-                validated_urls.append(url_data)
+        validated_urls = [self.score_health_relevance(url_data) for url_data in urls]
         
         print(f"🧪 Validated {len(validated_urls)} URLs")
         return validated_urls
 
-    def get_user_hardcoded_urls(self) -> List[Dict]:
+    def get_user_hardcoded_urls(self) -> List[StartupRecord]:
         """Get user's hardcoded URLs with highest priority"""
-        user_urls = [
-            'https://www.acalta.de',
-            'https://www.actimi.com',
-            'https://www.emmora.de',
-            'https://www.alfa-ai.com',
-            'https://www.apheris.com',
-            'https://www.aporize.com/',
-            'https://www.arztlena.com/',
-            'https://shop.getnutrio.com/',
-            'https://www.auta.health/',
-            'https://visioncheckout.com/',
-            'https://www.avayl.tech/',
-            'https://www.avimedical.com/avi-impact',
-            'https://de.becureglobal.com/',
-            'https://bellehealth.co/de/',
-            'https://www.biotx.ai/',
-            'https://www.brainjo.de/',
-            'https://brea.app/',
-            'https://breathment.com/',
-            'https://de.caona.eu/',
-            'https://www.careanimations.de/',
-            'https://sfs-healthcare.com',
-            'https://www.climedo.de/',
-            'https://www.cliniserve.de/',
-            'https://cogthera.de/#erfahren',
-            'https://www.comuny.de/',
-            'https://curecurve.de/elina-app/',
-            'https://www.cynteract.com/de/rehabilitation',
-            'https://www.healthmeapp.de/de/',
-            'https://deepeye.ai/',
-            'https://www.deepmentation.ai/',
-            'https://denton-systems.de/',
-            'https://www.derma2go.com/',
-            'https://www.dianovi.com/',
-            'http://dopavision.com/',
-            'https://www.dpv-analytics.com/',
-            'http://www.ecovery.de/',
-            'https://elixionmedical.com/',
-            'https://www.empident.de/',
-            'https://eye2you.ai/',
-            'https://www.fitwhit.de',
-            'https://www.floy.com/',
-            'https://fyzo.de/assistant/',
-            'https://www.gesund.de/app',
-            'https://www.glaice.de/',
-            'https://gleea.de/',
-            'https://www.guidecare.de/',
-            'https://www.apodienste.com/',
-            'https://www.help-app.de/',
-            'https://www.heynanny.com/',
-            'https://incontalert.de/',
-            'https://home.informme.info/',
-            'https://www.kranushealth.com/de/therapien/haeufiger-harndrang',
-            'https://www.kranushealth.com/de/therapien/inkontinenz'
-        ]
-        
-        results = []
-        for url in user_urls:
-            results.append({
-                'url': url,
-                'source': 'User Verified',
-                'confidence': 10,
-                'category': 'Verified Health Tech',
-                'country': 'Germany/Europe',
-                'health_score': 10
-            })
-            self.found_urls.add(url)
+        results = self.seed_corpus.records('verified', country='Germany/Europe', health_score=10)
+        for result in results:
+            self.found_urls.add(result.url)
             
         return results
 
+    def iter_startups(self) -> Iterator[StartupRecord]:
+        """Yield health-scored records as each search returns, deduplicated by URL
+        
+        Verified seeds come first, then the German, European, domain-specific
+        and directory searches. Per phase counts are kept in
+        ``stream_summary`` as the stream advances.
+        """
+        phases = (
+            ('user_verified', "1️⃣ Loading user verified URLs...", self.get_user_hardcoded_urls),
+            ('german_startups', "2️⃣ Discovering German health startups...",
+             lambda: self.iter_search_category('german')),
+            ('european_startups', "3️⃣ Discovering European health startups...",
+             lambda: self.iter_search_category('european')),
+            ('domain_specific', "4️⃣ Discovering domain-specific startups...",
+             lambda: self.iter_search_category('domain_specific')),
+            ('directory_results', "5️⃣ Searching startup directories...",
+             lambda: self.iter_search_category('directories')),
+        )
+        self.stream_summary = {key: 0 for key, _, _ in phases}
+        seen_urls = set()
+        
+        try:
+            for key, title, discover in phases:
+                print(f"\n{title}")
+                for url_data in discover():
+                    self.stream_summary[key] += 1
+                    self.score_health_relevance(url_data)
+                    if url_data.url not in seen_urls:
+                        seen_urls.add(url_data.url)
+                        yield url_data
+                print(f"  ✅ {self.stream_summary[key]} URLs")
+        finally:
+            self.close()
+
+    async def aiter_startups(self) -> AsyncIterator[StartupRecord]:
+        """``iter_startups`` as an async iterator, for use from an event loop"""
+        async for url_data in aiter_records(self.iter_startups()):
+            yield url_data
+
     def discover_all_startups(self) -> Dict:
         """Main discovery method"""
         print("🚀 GOOGLE SEARCH-BASED STARTUP DISCOVERY")
         print("=" * 60)
         
-        all_results = []
-        
-        # 1. User hardcoded URLs (highest priority)
-        print("\n1️⃣ Loading user verified URLs...")
-        user_results = self.get_user_hardcoded_urls()
-        all_results.extend(user_results)
-        
-        # 2. German health startups
-        print("\n2️⃣ Discovering German health startups...")
-        german_results = self.discover_german_health_startups()
-        all_results.extend(german_results)
-        
-        # 3. European health startups
-        print("\n3️⃣ Discovering European health startups...")
-        european_results = self.discover_european_health_startups()
-        all_results.extend(european_results)
-        
-        # 4. Domain-specific startups
-        print("\n4️⃣ Discovering domain-specific startups...")
-        domain_results = self.discover_specific_health_domains()
-        all_results.extend(domain_results)
-        
-        # 5. Directory searches
-        print("\n5️⃣ Searching startup directories...")
-        directory_results = self.discover_startup_directories()
-        all_results.extend(directory_results)
-        
-        # Validate health tech relevance
-        print("\n🧪 Validating health tech relevance...")
-        validated_results = self.validate_health_tech_urls(all_results)
-        
-        # Remove duplicates and sort by confidence
-        unique_results = []
-        seen_urls = set()
-        
-        for result in sorted(validated_results, key=lambda x: x['confidence'], reverse=True):
-            if result['url'] not in seen_urls:
-                seen_urls.add(result['url'])
-                unique_results.append(result)
+        # Streamed records arrive deduplicated; rank them by confidence (highest first)
+        unique_results = sorted(self.iter_startups(), key=lambda x: x.confidence, reverse=True)
+        summary = self.stream_summary
         
         # Prepare final results
         final_results = {
             'total_urls_discovered': len(unique_results),
             'urls': unique_results,
             'summary': {
-                'user_verified': len(user_results),
-                'german_startups': len(german_results),
-                'european_startups': len(european_results),
-                'domain_specific': len(domain_results),
-                'directory_results': len(directory_results),
+                'user_verified': summary['user_verified'],
+                'german_startups': summary['german_startups'],
+                'european_startups': summary['european_startups'],
+                'domain_specific': summary['domain_specific'],
+                'directory_results': summary['directory_results'],
                 'total_unique': len(unique_results)
             },
             'discovery_methods': [
-                f"User Verified: {len(user_results)}",
-                f"German Health Tech: {len(german_results)}",
-                f"European Health Tech: {len(european_results)}",
-                f"Domain Specific: {len(domain_results)}",
-                f"Directory Searches: {len(directory_results)}"
+                f"User Verified: {summary['user_verified']}",
+                f"German Health Tech: {summary['german_startups']}",
+                f"European Health Tech: {summary['european_startups']}",
+                f"Domain Specific: {summary['domain_specific']}",
+                f"Directory Searches: {summary['directory_results']}"
             ]
         }
         
@@ -396,11 +361,12 @@ class GoogleSearchStartupFinder:
             writer.writeheader()
             
             for url_data in results['urls']:
-                writer.writerow(url_data)
+                writer.writerow(url_data.to_dict())
         
         # Save JSON
         with open(json_filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump(results, jsonfile, indent=2, ensure_ascii=False)
+            json_results = dict(results, urls=records_to_dicts(results['urls']))
+            json.dump(json_results, jsonfile, indent=2, ensure_ascii=False)
         
         print(f"\n📁 Results saved:")
         print(f"  • CSV: {csv_filename}")
@@ -435,7 +401,7 @@ def main():
     
     print(f"\n🔍 Top 10 Discovered URLs:")
     for i, url_data in enumerate(results['urls'][:10], 1):
-        print(f"  {i:2d}. {url_data['url']} ({url_data['category']}, confidence: {url_data['confidence']})")
+        print(f"  {i:2d}. {url_data.url} ({url_data.category}, confidence: {url_data.confidence})")
     
     print(f"\n📊 Discovery Breakdown:")
     for method in results['discovery_methods']:
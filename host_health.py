@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+HOST HEALTH
+Per-host latency tracking, adaptive timeouts and circuit breakers
+Dead or hanging hosts fail fast instead of costing the full timeout on every request
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import requests
+
+
+class HostCircuitOpen(requests.ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+def percentile(samples, fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty sample"""
+    ordered = sorted(samples)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class HostState:
+    """Latency samples and breaker state of one host"""
+
+    __slots__ = ('latencies', 'consecutive_failures', 'state', 'opened_at', 'cooldown', 'probing')
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.state = 'closed'
+        self.opened_at = 0.0
+        self.cooldown = 0.0
+        self.probing = False
+
+
+class HostHealth:
+    """Shared by every session of a run; all methods are thread-safe
+
+    Timeouts: once a host has ``min_samples`` successful responses, its
+    timeout becomes ``multiplier`` times its p95 latency, clamped between
+    ``min_timeout`` and the timeout the caller asked for. Hosts without
+    history use the same rule on the run-wide latencies, which is what
+    keeps thousands of dead generated domains cheap.
+
+    Breaker: ``failure_threshold`` consecutive failures (connection errors,
+    timeouts, 5xx) open a host's circuit and requests fail fast with
+    HostCircuitOpen. After ``cooldown`` seconds one half-open probe is let
+    through; success closes the circuit, failure reopens it with the
+    cooldown doubled up to ``max_cooldown``.
+    """
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60, max_cooldown: float = 900,
+                 min_samples: int = 5, window: int = 50, multiplier: float = 4.0, min_timeout: float = 3.0,
+                 clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.min_samples = min_samples
+        self.window = window
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.clock = clock
+        self.hosts: Dict[str, HostState] = {}
+        self.all_latencies = deque(maxlen=window * 10)
+        self.fail_fast = 0
+        self.lock = threading.Lock()
+
+    def _host(self, host: str) -> HostState:
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostState(self.window)
+        return state
+
+    def timeout_for(self, host: str, requested):
+        """Adaptive timeout for a request, never longer than the one requested"""
+        if requested is None or isinstance(requested, tuple):
+            return requested
+        with self.lock:
+            samples = self._host(host).latencies
+            if len(samples) < self.min_samples:
+                samples = self.all_latencies
+                if len(samples) < self.min_samples * 4:
+                    return requested
+            adaptive = percentile(samples, 0.95) * self.multiplier
+        return min(max(adaptive, self.min_timeout), requested)
+
+    def before_request(self, host: str):
+        """Raise HostCircuitOpen if the host's circuit does not allow a request now"""
+        with self.lock:
+            state = self._host(host)
+            if state.state == 'closed':
+                return
+            if state.state == 'open' and self.clock() - state.opened_at >= state.cooldown:
+                state.state = 'half_open'
+                state.probing = False
+            if state.state == 'half_open' and not state.probing:
+                state.probing = True  # This request is the probe
+                return
+            self.fail_fast += 1
+        raise HostCircuitOpen(f"Circuit open for {host} after {state.consecutive_failures} consecutive failures")
+
+    def release_probe(self, host: str):
+        """Hand back a half-open probe whose request ended without telling whether the host recovered"""
+        with self.lock:
+            self._host(host).probing = False
+
+    def record_success(self, host: str, latency: float):
+        with self.lock:
+            state = self._host(host)
+            state.latencies.append(latency)
+            self.all_latencies.append(latency)
+            state.consecutive_failures = 0
+            state.state = 'closed'
+            state.probing = False
+            state.cooldown = 0.0
+
+    def record_failure(self, host: str):
+        with self.lock:
+            state = self._host(host)
+            state.consecutive_failures += 1
+            if state.state == 'half_open':
+                # The probe failed: back off further before the next one
+                state.cooldown = min(state.cooldown * 2, self.max_cooldown)
+            elif state.consecutive_failures >= self.failure_threshold:
+                state.cooldown = state.cooldown or self.base_cooldown
+            else:
+                return
+            state.state = 'open'
+            state.opened_at = self.clock()
+            state.probing = False
+
+    def open_hosts(self) -> Dict[str, int]:
+        """Hosts whose circuit is not closed, with their consecutive failures"""
+        with self.lock:
+            return {host: state.consecutive_failures for host, state in self.hosts.items()
+                    if state.state != 'closed'}
+
+    def latency_summary(self, host: str) -> Optional[Dict[str, float]]:
+        """p50/p95 latency of a host, if it has samples"""
+        with self.lock:
+            samples = list(self._host(host).latencies)
+        if not samples:
+            return None
+        return {'p50': percentile(samples, 0.5), 'p95': percentile(samples, 0.95), 'samples': len(samples)}
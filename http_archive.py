@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+HTTP ARCHIVE
+Record every HTTP exchange of a discovery run to a compressed archive
+and replay the run from it offline, without network access or delays
+"""
+
+import base64
+import gzip
+import json
+import threading
+from collections import defaultdict, deque
+from datetime import datetime
+from io import BytesIO
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from host_health import HostCircuitOpen
+
+ARCHIVE_FORMAT = 'startup-discovery-archive/1'
+
+
+class ArchiveMiss(requests.ConnectionError):
+    """Raised in replay mode for a request that was never recorded"""
+
+
+def _exchange_key(method: str, url: str) -> str:
+    return f"{method.upper()} {url}"
+
+
+def _exception_class(name: str):
+    """Map a recorded exception name back to the requests exception class"""
+    exception_class = getattr(requests.exceptions, name, None)
+    if isinstance(exception_class, type) and issubclass(exception_class, Exception):
+        return exception_class
+    return requests.ConnectionError
+
+
+class RecordedStream:
+    """Wraps the raw body of a streamed response and archives only the bytes the caller read
+
+    A capped streaming read (see page_stream) then costs the same transfer
+    while recording as it does live, and the replay serves exactly the
+    bytes the recorded run saw. The exchange is written when the
+    connection is released or closed, or when the recorder closes.
+    """
+
+    def __init__(self, raw, archive: 'HttpArchiveRecorder', request, response):
+        self._raw = raw
+        self._archive = archive
+        self._request = request
+        self._response = response
+        self._chunks = []
+        self._written = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        for chunk in self._raw.stream(amt, decode_content=decode_content):
+            self._chunks.append(chunk)
+            yield chunk
+
+    def read(self, *args, **kwargs):
+        data = self._raw.read(*args, **kwargs)
+        self._chunks.append(data)
+        return data
+
+    def write(self):
+        """Archive the exchange with the body read so far (only once)"""
+        if self._written:
+            return
+        self._written = True
+        self._archive.untrack(self)
+        self._archive.write_response(self._request, self._response, b''.join(self._chunks))
+
+    def release_conn(self):
+        self.write()
+        self._raw.release_conn()
+
+    def close(self):
+        self.write()
+        self._raw.close()
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that performs real requests and archives each exchange"""
+
+    def __init__(self, archive: 'HttpArchiveRecorder'):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        try:
+            response = super().send(request, **kwargs)
+        except requests.RequestException as e:
+            self.archive.write_error(request, e)
+            raise
+        if kwargs.get('stream') and hasattr(response.raw, 'stream'):
+            response.raw = self.archive.track(RecordedStream(response.raw, self.archive, request, response))
+        else:
+            # Read the body now so it can be archived
+            response.content
+            self.archive.write_response(request, response)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter that answers requests from a recorded archive"""
+
+    def __init__(self, archive: 'HttpArchiveReplayer'):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        entry = self.archive.next_entry(request.method, request.url)
+        if entry['type'] == 'error':
+            raise _exception_class(entry['exception'])(entry['message'], request=request)
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry.get('reason', '')
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = entry.get('final_url', request.url)
+        response.request = request
+        body = base64.b64decode(entry.get('body', ''))
+        response.raw = BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+class HttpArchiveRecorder:
+    """Writes HTTP exchanges to a gzip-compressed JSON Lines archive
+
+    The first line holds run metadata (start time and random seed) so a
+    replay can reproduce the run exactly; every following line is one
+    response or transport error, in the order the requests were made, or a
+    named piece of run state the replay has to start from.
+    """
+
+    mode = 'record'
+
+    def __init__(self, path: str, run_started: datetime, seed: int):
+        self.path = path
+        self.run_started = run_started
+        self.seed = seed
+        self.exchanges = 0
+        self.lock = threading.Lock()
+        self.open_streams = set()
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+        self._write({
+            'type': 'info',
+            'format': ARCHIVE_FORMAT,
+            'run_started': run_started.isoformat(),
+            'seed': seed
+        })
+
+    def _write(self, entry: Dict):
+        with self.lock:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def write_state(self, name: str, data: Dict):
+        """Archive a piece of run state (e.g. scheduler statistics) that a replay must reuse"""
+        self._write({'type': 'state', 'name': name, 'data': data})
+
+    def write_response(self, request, response, body: Optional[bytes] = None):
+        """Archive a response; ``body`` is the part of a streamed body that was read"""
+        if body is None:
+            body = response.content or b''
+        self.exchanges += 1
+        self._write({
+            'type': 'response',
+            'method': request.method,
+            'url': request.url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': dict(response.headers),
+            'final_url': response.url,
+            'body': base64.b64encode(body).decode('ascii')
+        })
+
+    def write_error(self, request, error: Exception):
+        self.exchanges += 1
+        self._write({
+            'type': 'error',
+            'method': request.method,
+            'url': request.url,
+            'exception': type(error).__name__,
+            'message': str(error)
+        })
+
+    def write_fail_fast(self, method: str, url: str, error: Exception):
+        """Archive a request that a circuit breaker refused without sending it"""
+        self.exchanges += 1
+        self._write({
+            'type': 'fail_fast',
+            'method': method,
+            'url': url,
+            'exception': type(error).__name__,
+            'message': str(error)
+        })
+
+    def track(self, stream: RecordedStream) -> RecordedStream:
+        """Remember a streamed response so it is archived even if it is never closed"""
+        with self.lock:
+            self.open_streams.add(stream)
+        return stream
+
+    def untrack(self, stream: RecordedStream):
+        with self.lock:
+            self.open_streams.discard(stream)
+
+    def attach(self, session: requests.Session):
+        """Route all of a session's traffic through the recorder"""
+        adapter = RecordingAdapter(self)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+    def close(self):
+        with self.lock:
+            streams = list(self.open_streams)
+        for stream in streams:
+            stream.write()
+        with self.lock:
+            self.file.close()
+        print(f"📼 Recorded {self.exchanges} HTTP exchanges to {self.path}")
+
+
+class HttpArchiveReplayer:
+    """Serves recorded HTTP exchanges back in request order, without network access"""
+
+    mode = 'replay'
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = defaultdict(deque)
+        self.lock = threading.Lock()
+        self.run_started: Optional[datetime] = None
+        self.seed: Optional[int] = None
+        self.states: Dict[str, Dict] = {}
+
+        with gzip.open(path, 'rt', encoding='utf-8') as archive_file:
+            for line in archive_file:
+                entry = json.loads(line)
+                if entry['type'] == 'info':
+                    self.run_started = datetime.fromisoformat(entry['run_started'])
+                    self.seed = entry.get('seed')
+                elif entry['type'] == 'state':
+                    self.states[entry['name']] = entry['data']
+                else:
+                    self.entries[_exchange_key(entry['method'], entry['url'])].append(entry)
+
+    def next_entry(self, method: str, url: str) -> Dict:
+        """Return the next recorded exchange for a request"""
+        with self.lock:
+            queue = self.entries.get(_exchange_key(method, url))
+            if not queue:
+                raise ArchiveMiss(f"No archived response for {method} {url}")
+            return queue.popleft()
+
+    def replay_fail_fast(self, method: str, url: str):
+        """Raise the recorded breaker refusal if that is what the next exchange for a request was"""
+        with self.lock:
+            queue = self.entries.get(_exchange_key(method, url))
+            if not queue or queue[0]['type'] != 'fail_fast':
+                return
+            entry = queue.popleft()
+        raise HostCircuitOpen(entry['message'])
+
+    def attach(self, session: requests.Session):
+        """Route all of a session's traffic to the archive"""
+        adapter = ReplayAdapter(self)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+    def close(self):
+        remaining = sum(len(queue) for queue in self.entries.values())
+        if remaining:
+            print(f"📼 Replay finished with {remaining} unused archived exchanges")
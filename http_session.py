@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+HTTP SESSION
+Shared requests session factory for all discovery sources
+Adds a run-wide request budget, per-stage deadlines, adaptive timeouts and per-host circuit breakers on top of requests.Session
+"""
+
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+
+from host_health import HostCircuitOpen, HostHealth
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+class RequestBudgetExceeded(requests.RequestException):
+    """Raised when a session would exceed the run's request budget"""
+
+
+class BudgetScope:
+    """Time and request allowance of one stage of a run, e.g. one source
+
+    Checked cooperatively: discoverers poll ``session.budget_exhausted``
+    between units of work (a query, a directory page, a site), so a spent
+    scope lets the unit in flight finish and stops the stage before the
+    next one. ``reason`` says why the stage was cut short, None while it
+    has budget left.
+
+    ``cutoff`` replaces the clock: the scope reports itself spent at that
+    check, as counted by ``checks``. Recorded runs archive the check a
+    scope ran out at, so a replay (which runs at a different speed) stops
+    its stages at the same units.
+    """
+
+    def __init__(self, name: str, deadline: Optional[float] = None, deadline_reason: str = 'time budget',
+                 max_requests: Optional[int] = None, cutoff: Optional[int] = None,
+                 cutoff_reason: Optional[str] = None, clock=time.monotonic):
+        self.name = name
+        self.deadline = deadline  # clock() value the stage must stop by
+        self.deadline_reason = deadline_reason
+        self.max_requests = max_requests
+        self.cutoff = cutoff
+        self.cutoff_reason = cutoff_reason
+        self.clock = clock
+        self.requests = 0
+        self.checks = 0
+        self.reason: Optional[str] = None
+
+    def spent(self) -> bool:
+        """Count a check and say whether the stage must stop"""
+        if self.reason is None:
+            self.checks += 1
+            if self.cutoff is not None and self.checks >= self.cutoff:
+                self.reason = self.cutoff_reason or 'time budget'
+            elif self.max_requests is not None and self.requests >= self.max_requests:
+                self.reason = 'request budget'
+            elif self.deadline is not None and self.clock() >= self.deadline:
+                self.reason = self.deadline_reason
+        return self.reason is not None
+
+
+class RequestBudget:
+    """Run-wide cap on the number of HTTP requests, shared by every session
+
+    While a BudgetScope is set as ``scope``, the budget also counts as
+    exhausted once that stage's own allowance is spent.
+    """
+
+    def __init__(self, max_requests: Optional[int] = None):
+        self.max_requests = max_requests
+        self.used = 0
+        self.lock = threading.Lock()
+        self.scope: Optional[BudgetScope] = None
+
+    @property
+    def capped(self) -> bool:
+        """Whether the run-wide request cap is reached"""
+        return self.max_requests is not None and self.used >= self.max_requests
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether no further unit of work should start"""
+        scope = self.scope
+        with self.lock:
+            if self.capped:
+                if scope is not None and scope.reason is None:
+                    scope.reason = 'run request budget'
+                return True
+            return scope is not None and scope.spent()
+
+    def reset(self):
+        """Start a new budget period, e.g. for the next source run of a daemon"""
+        with self.lock:
+            self.used = 0
+
+    def consume(self, url: str = ''):
+        """Account for one request, raising once the budget is spent"""
+        with self.lock:
+            if self.capped:
+                raise RequestBudgetExceeded(f"Request budget of {self.max_requests} exhausted before {url}")
+            self.used += 1
+            if self.scope is not None:
+                self.scope.requests += 1
+
+    def refund(self):
+        """Give back the request last consumed, when it was never sent"""
+        with self.lock:
+            self.used -= 1
+            if self.scope is not None:
+                self.scope.requests -= 1
+
+
+class DiscoverySession(requests.Session):
+    """requests.Session that charges every request against a RequestBudget
+
+    With ``host_health`` set, timeouts adapt to each host's observed
+    latency and hosts with an open circuit fail fast with HostCircuitOpen
+    before any budget is spent. Fail-fast decisions are written to a
+    recording archive so a replay (which runs without host health, as its
+    timing differs) fails the same requests.
+    """
+
+    def __init__(self, budget: Optional[RequestBudget] = None, host_health: Optional[HostHealth] = None,
+                 archive=None):
+        super().__init__()
+        self.budget = budget or RequestBudget()
+        self.host_health = host_health
+        self.archive = archive
+
+    @property
+    def budget_exhausted(self) -> bool:
+        return self.budget.exhausted
+
+    def _archived_url(self, method, url, kwargs) -> str:
+        return self.prepare_request(requests.Request(method.upper(), url, params=kwargs.get('params'))).url
+
+    def request(self, method, url, *args, **kwargs):
+        host = urlparse(url).hostname or ''
+        mode = getattr(self.archive, 'mode', None)
+        # Charged first, so a spent budget never leaves a half-open probe taken but unsent
+        self.budget.consume(url)
+        try:
+            if mode == 'replay':
+                self.archive.replay_fail_fast(method, self._archived_url(method, url, kwargs))
+            elif self.host_health is not None:
+                try:
+                    self.host_health.before_request(host)
+                except HostCircuitOpen as e:
+                    if mode == 'record':
+                        self.archive.write_fail_fast(method.upper(), self._archived_url(method, url, kwargs), e)
+                    raise
+                if 'timeout' in kwargs:
+                    kwargs['timeout'] = self.host_health.timeout_for(host, kwargs['timeout'])
+        except HostCircuitOpen:
+            self.budget.refund()
+            raise
+
+        if self.host_health is None:
+            return super().request(method, url, *args, **kwargs)
+
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            self.host_health.record_failure(host)
+            raise
+        except BaseException:
+            # Not a verdict on the host (redirect loop, bad URL, interrupted body...): let the next request probe
+            self.host_health.release_probe(host)
+            raise
+        if response.status_code >= 500:
+            self.host_health.record_failure(host)
+        else:
+            self.host_health.record_success(host, response.elapsed.total_seconds())
+        return response
+
+
+def create_session(user_agent: str = DEFAULT_USER_AGENT,
+                   budget: Optional[RequestBudget] = None, archive=None,
+                   host_health: Optional[HostHealth] = None) -> DiscoverySession:
+    """Create the session used by a discovery class
+
+    ``archive`` is an http_archive recorder or replayer that the session's
+    traffic is routed through. ``host_health`` is shared by all sessions of
+    a run; a private one is created when none is given, except for replays.
+    """
+    if host_health is None and getattr(archive, 'mode', None) != 'replay':
+        host_health = HostHealth()
+    session = DiscoverySession(budget, host_health, archive)
+    session.headers.update({'User-Agent': user_agent})
+    if archive is not None:
+        archive.attach(session)
+    return session
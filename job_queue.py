@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+JOB QUEUE
+SQLite-backed queue of discovery work units with leases
+Lets several worker processes, on one host or several hosts sharing storage, split a run
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+from startup_record import StartupRecord, records_to_dicts
+
+DEFAULT_QUEUE_PATH = 'discovery_jobs.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    job_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, lease_expires);
+"""
+
+
+class Job:
+    """A claimed unit of discovery work"""
+
+    def __init__(self, job_id: int, kind: str, payload: Dict, attempts: int):
+        self.id = job_id
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+
+    def __repr__(self) -> str:
+        return f"Job({self.id}, {self.kind!r}, attempts={self.attempts})"
+
+
+def default_worker_id() -> str:
+    """Worker identity that is unique across hosts sharing the queue"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """Discovery jobs stored in SQLite and handed out under time-limited leases
+
+    A worker that crashes simply lets its lease expire; the job then becomes
+    claimable again until ``max_attempts`` is reached. Several hosts can share
+    one queue file on network storage as long as it supports SQLite locking.
+    """
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute('PRAGMA busy_timeout = 30000')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def enqueue(self, kind: str, payload: Dict, job_key: Optional[str] = None) -> bool:
+        """Add a job unless one with the same key exists; returns True if it was added"""
+        job_key = job_key or f"{kind}:{json.dumps(payload, sort_keys=True)}"
+        cursor = self.conn.execute(
+            'INSERT OR IGNORE INTO jobs (kind, job_key, payload, updated) VALUES (?, ?, ?, ?)',
+            (kind, job_key, json.dumps(payload, ensure_ascii=False), time.time())
+        )
+        return cursor.rowcount == 1
+
+    def claim(self, worker_id: str, lease_seconds: float = 300) -> Optional[Job]:
+        """Lease the oldest pending job, or one whose previous lease expired"""
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Leases that ran out on their last allowed attempt are given up on
+            self.conn.execute(
+                """UPDATE jobs SET status = 'failed', error = 'Lease expired', updated = ?
+                   WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?""",
+                (now, now, self.max_attempts)
+            )
+            row = self.conn.execute(
+                """SELECT id, kind, payload, attempts FROM jobs
+                   WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?))
+                     AND attempts < ?
+                   ORDER BY id LIMIT 1""",
+                (now, self.max_attempts)
+            ).fetchone()
+            if row is None:
+                self.conn.execute('COMMIT')
+                return None
+            job_id, kind, payload, attempts = row
+            self.conn.execute(
+                """UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                   attempts = attempts + 1, updated = ? WHERE id = ?""",
+                (worker_id, now + lease_seconds, now, job_id)
+            )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return Job(job_id, kind, json.loads(payload), attempts + 1)
+
+    def extend_lease(self, job: Job, worker_id: str, lease_seconds: float = 300) -> bool:
+        """Renew a lease for a long-running job; False if it was lost to another worker"""
+        cursor = self.conn.execute(
+            """UPDATE jobs SET lease_expires = ?, updated = ?
+               WHERE id = ? AND status = 'leased' AND lease_owner = ?""",
+            (time.time() + lease_seconds, time.time(), job.id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job: Job, worker_id: str, records: List[StartupRecord]) -> bool:
+        """Store a job's records; ignored if the lease has meanwhile passed to another worker"""
+        cursor = self.conn.execute(
+            """UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_expires = NULL, updated = ?
+               WHERE id = ? AND status = 'leased' AND lease_owner = ?""",
+            (json.dumps(records_to_dicts(records), ensure_ascii=False), time.time(), job.id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job: Job, worker_id: str, error: str):
+        """Release a job after an error so it can be retried, or mark it failed"""
+        status = 'failed' if job.attempts >= self.max_attempts else 'pending'
+        self.conn.execute(
+            """UPDATE jobs SET status = ?, error = ?, lease_expires = NULL, updated = ?
+               WHERE id = ? AND lease_owner = ?""",
+            (status, error, time.time(), job.id, worker_id)
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        return dict(self.conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'))
+
+    def finished_results(self, kind: Optional[str] = None) -> List[StartupRecord]:
+        """Records from every completed job (optionally of one kind), in job order"""
+        sql = "SELECT result FROM jobs WHERE status = 'done'"
+        params = []
+        if kind:
+            sql += ' AND kind = ?'
+            params.append(kind)
+        records = []
+        for (result,) in self.conn.execute(sql + ' ORDER BY id', params):
+            records.extend(StartupRecord.from_dict(row) for row in json.loads(result))
+        return records
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+LINK GRAPH DISCOVERY
+Snowball crawl of outbound links from verified and curated startup homepages
+Partners, investors, accelerators and sister startups, ranked by how many known startups link to them
+"""
+
+import hashlib
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from http_session import create_session
+from page_stream import LinkStream
+from seed_corpus import SeedCorpus, get_seed_corpus
+from startup_record import StartupRecord, extract_domain
+
+# Seed sets whose homepages start the crawl
+FRONTIER_SEED_SETS = ('verified', 'curated', 'conference')
+
+# Outbound links that are never startups: social networks, platforms, stores and site tooling
+EXCLUDED_DOMAINS = (
+    'linkedin.com', 'twitter.com', 'x.com', 'facebook.com', 'instagram.com', 'youtube.com', 'youtu.be',
+    'xing.com', 'tiktok.com', 'pinterest.com', 'medium.com', 'github.com', 'google.com', 'google.de',
+    'goo.gl', 'apple.com', 'microsoft.com', 'wordpress.org', 'wordpress.com', 'wix.com', 'vimeo.com',
+    'hubspot.com', 'hsforms.com', 'mailchimp.com', 'typeform.com', 'calendly.com', 'cookiebot.com',
+    'usercentrics.eu', 'onetrust.com', 'w3.org', 'schema.org', 'crunchbase.com', 'wikipedia.org',
+    'bit.ly', 'gstatic.com', 'googleapis.com', 'cloudflare.com', 'spotify.com', 'whatsapp.com',
+)
+
+# Same-site pages worth reading after the homepage (partner, investor and portfolio lists)
+NETWORK_PAGE_PATTERN = re.compile(
+    r'partner|investor|portfolio|network|netzwerk|kooperation|cooperation|about|ueber-uns|uber-uns',
+    re.IGNORECASE
+)
+
+# Inbound links from known startups -> confidence of a candidate
+INBOUND_CONFIDENCE = ((4, 7), (3, 6), (2, 5), (1, 4))
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set: no false negatives, ``error_rate`` false positives at ``capacity``
+
+    Used for the crawl's seed and visited domain sets, so memory does not
+    grow with the number of sites read.
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> bool:
+        """Add an item; returns True if it was (probably) already present"""
+        present = True
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                present = False
+                self.bits[byte] |= 1 << bit
+        return present
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+
+def is_excluded(domain: str) -> bool:
+    return any(domain == excluded or domain.endswith('.' + excluded) for excluded in EXCLUDED_DOMAINS)
+
+
+class SnowballDiscovery:
+    """Bounded breadth-first crawl of the startup link graph
+
+    Depth 0 reads the homepages of the seed startups. Every external domain
+    they link to becomes a candidate, scored by the number of distinct
+    known startups linking to it. Candidates linked from at least
+    ``promote_inbound`` known startups count as known themselves and are
+    read at the next depth, up to ``max_depth``. Every site contributes at
+    most ``max_pages_per_domain`` pages (the homepage plus partner or
+    investor pages) and ``max_links_per_domain`` candidates, and the whole
+    crawl reads at most ``max_pages`` pages.
+    """
+
+    def __init__(self, session=None, seed_corpus: Optional[SeedCorpus] = None, max_depth: int = 2,
+                 max_pages: int = 300, max_pages_per_domain: int = 2, max_links_per_domain: int = 40,
+                 promote_inbound: int = 2, max_workers: int = 8, max_bytes: int = 512 * 1024):
+        self.session = session or create_session()
+        self.seed_corpus = seed_corpus or get_seed_corpus()
+        self.delay = 1  # Respectful delay between pages of the same site
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.max_pages_per_domain = max_pages_per_domain
+        self.max_links_per_domain = max_links_per_domain
+        self.promote_inbound = promote_inbound
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.pages_read = 0
+
+    def read_links(self, url: str) -> List[str]:
+        """Absolute links of one page, or none when it cannot be read"""
+        try:
+            with LinkStream(self.session, url, max_bytes=self.max_bytes, timeout=10) as links:
+                return [urljoin(url, href) for href in links]
+        except Exception:
+            return []
+
+    def crawl_site(self, homepage: str) -> Tuple[List[Tuple[str, str]], int]:
+        """Read a site's homepage and network pages
+
+        Returns (domain, host) of the site's outbound links in page order and
+        the number of pages read.
+        """
+        site = extract_domain(homepage)
+        outbound: Dict[str, str] = {}
+        queue, queued = [homepage], {homepage}
+        pages = 0
+        while queue and pages < self.max_pages_per_domain and not self.session.budget_exhausted:
+            if pages:
+                time.sleep(self.delay)
+            url = queue.pop(0)
+            pages += 1
+            for link in self.read_links(url):
+                parsed = urlparse(link)
+                if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+                    continue
+                domain = extract_domain(link)
+                if domain == site or domain.endswith('.' + site):
+                    page = link.split('#')[0]
+                    if page not in queued and NETWORK_PAGE_PATTERN.search(parsed.path):
+                        queued.add(page)
+                        queue.append(page)
+                elif '.' in domain and not domain.replace('.', '').isdigit() and not is_excluded(domain):
+                    if domain not in outbound and len(outbound) < self.max_links_per_domain:
+                        outbound[domain] = parsed.netloc.lower().split('@')[-1]
+        return list(outbound.items()), pages
+
+    def discover_from_link_graph(self) -> List[StartupRecord]:
+        """Crawl outward from the seed startups and return the linked companies, best connected first"""
+        print("🕸️ Crawling the startup link graph...")
+        frontier: List[str] = []
+        known = BloomFilter()  # Seed startup domains, never reported as candidates
+        for name in FRONTIER_SEED_SETS:
+            for url in self.seed_corpus.urls.get(name, []):
+                domain = extract_domain(url)
+                if not known.add(domain):
+                    frontier.append(f"https://{urlparse(url).netloc}/")
+
+        crawled = BloomFilter()  # Sites already read; each is read once
+        inbound: Dict[str, int] = {}
+        hosts: Dict[str, str] = {}
+        depths: Dict[str, int] = {}
+        site_budget = self.max_pages // self.max_pages_per_domain
+
+        for depth in range(self.max_depth):
+            frontier = [url for url in frontier if not crawled.add(extract_domain(url))][:site_budget]
+            if not frontier or self.session.budget_exhausted:
+                break
+            site_budget -= len(frontier)
+            print(f"  • Depth {depth}: reading {len(frontier)} sites")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                crawls = list(executor.map(self.crawl_site, frontier))
+
+            promoted: List[str] = []
+            for homepage, (links, pages) in zip(frontier, crawls):
+                self.pages_read += pages
+                for domain, host in links:
+                    # crawl_site lists each outbound domain once, so this counts distinct linking sites
+                    if domain in known or '.'.join(domain.split('.')[-2:]) in known:
+                        continue
+                    inbound[domain] = inbound.get(domain, 0) + 1
+                    hosts.setdefault(domain, host)
+                    depths.setdefault(domain, depth + 1)
+                    if inbound[domain] == self.promote_inbound:
+                        promoted.append(f"https://{hosts[domain]}/")
+            frontier = promoted
+
+        results = []
+        for domain, count in sorted(inbound.items(), key=lambda item: (-item[1], depths[item[0]], item[0])):
+            confidence = next(value for minimum, value in INBOUND_CONFIDENCE if count >= minimum)
+            results.append(StartupRecord(
+                url=f"https://{hosts[domain]}",
+                source=f'Link Graph: linked from {count} startups',
+                confidence=confidence,
+                category='Startup Network'
+            ))
+        print(f"✅ Found {len(results)} linked companies from {self.pages_read} pages")
+        return results
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+NEAR DUPLICATES
+MinHash fingerprints of discovered homepages in a locality-sensitive hashing index
+Collapses the same company listed under several domains or paths, without pairwise comparison
+"""
+
+import hashlib
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+
+from page_stream import body_encoding, is_html, read_capped
+from startup_record import StartupRecord
+
+SHINGLE_WORDS = 5
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16  # 16 bands of 4 rows: pairs above ~0.5 Jaccard become candidates
+
+# Pages with less text than this (JavaScript shells, parking pages) are not fingerprinted,
+# otherwise every empty single-page app would look like a duplicate of every other
+MIN_SHINGLES = 20
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed seed so signatures are comparable across processes and runs
+_rng = random.Random(0x5eed)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+_SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+
+
+class _TextExtractor(HTMLParser):
+    """Collects the visible text of a page"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self.skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+
+def page_shingles(html: str, size: int = SHINGLE_WORDS) -> set:
+    """Hashed word n-grams of a page's visible text"""
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    words = _WORD_RE.findall(' '.join(extractor.parts).lower())
+    shingles = set()
+    for start in range(max(len(words) - size + 1, 0)):
+        shingle = ' '.join(words[start:start + size]).encode('utf-8')
+        # Python's hash() is salted per process, blake2b keeps signatures stable
+        shingles.add(int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), 'big'))
+    return shingles
+
+
+def minhash_signature(shingles: set) -> Tuple[int, ...]:
+    """MinHash signature of a shingle set"""
+    return tuple(
+        min((a * shingle + b) % _MERSENNE_PRIME for shingle in shingles)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def estimated_similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the pages behind two signatures"""
+    return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+
+class MinHashLSH:
+    """Banded LSH index: each signature is bucketed once per band
+
+    Two signatures become candidates when any band matches exactly, so
+    finding the near-duplicates of a page costs one dictionary lookup per
+    band instead of a comparison against every page already indexed.
+    """
+
+    def __init__(self, bands: int = LSH_BANDS):
+        self.bands = bands
+        self.rows = NUM_PERMUTATIONS // bands
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def candidates(self, signature: Tuple[int, ...]) -> List[str]:
+        """Indexed keys sharing at least one band with the signature, in insertion order"""
+        found = {}
+        for band_key in self._band_keys(signature):
+            for key in self.buckets.get(band_key, ()):
+                found[key] = True
+        return list(found)
+
+    def insert(self, key: str, signature: Tuple[int, ...]):
+        self.signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self.buckets.setdefault(band_key, []).append(key)
+
+    def query(self, signature: Tuple[int, ...], threshold: float) -> Optional[str]:
+        """First indexed key whose estimated similarity reaches the threshold"""
+        for key in self.candidates(signature):
+            if estimated_similarity(signature, self.signatures[key]) >= threshold:
+                return key
+        return None
+
+
+class NearDuplicateDetector:
+    """Fetches result homepages concurrently and collapses near-duplicate sites"""
+
+    def __init__(self, session, threshold: float = 0.8, max_workers: int = 8,
+                 max_bytes: int = 256 * 1024, timeout: float = 10,
+                 on_page: Optional[Callable[[str, bytes, str], None]] = None):
+        self.session = session
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes  # Enough for the visible text of a homepage
+        self.timeout = timeout
+        self.on_page = on_page  # Receives (url, body, encoding) of every page read, for reuse by later stages
+
+    def fetch_signature(self, url: str) -> Optional[Tuple[int, ...]]:
+        """Signature of the page at a URL, or None when it cannot be fingerprinted"""
+        if self.session.budget_exhausted:
+            return None
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                if response.status_code >= 400:
+                    return None
+                if not is_html(response):
+                    return None
+                body = read_capped(response, self.max_bytes)
+                encoding = body_encoding(response)
+        except Exception:
+            return None
+        if self.on_page is not None:
+            self.on_page(url, body, encoding)
+
+        shingles = page_shingles(body.decode(encoding, errors='replace'))
+        if len(shingles) < MIN_SHINGLES:
+            return None
+        return minhash_signature(shingles)
+
+    def collapse(self, records: List[StartupRecord]) -> Tuple[List[StartupRecord], Dict[str, List[str]]]:
+        """Drop records whose page nearly matches a better-ranked record's page
+
+        ``records`` must already be ranked best first; the first record of
+        each duplicate group is kept. Returns the kept records and a mapping
+        from each kept URL to the URLs collapsed into it.
+        """
+        print(f"🪞 Fingerprinting {len(records)} homepages...")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            signatures = list(executor.map(self.fetch_signature, [record.url for record in records]))
+
+        index = MinHashLSH()
+        kept = []
+        duplicates: Dict[str, List[str]] = {}
+        for record, signature in zip(records, signatures):
+            if signature is not None:
+                original = index.query(signature, self.threshold)
+                if original is not None:
+                    duplicates.setdefault(original, []).append(record.url)
+                    continue
+                index.insert(record.url, signature)
+            kept.append(record)
+
+        fingerprinted = sum(1 for signature in signatures if signature is not None)
+        collapsed = len(records) - len(kept)
+        print(f"✅ Fingerprinted {fingerprinted} pages, collapsed {collapsed} near-duplicates")
+        return kept, duplicates
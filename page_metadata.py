@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+PAGE METADATA
+Head-only metadata extraction for discovered homepages
+Title, og:site_name, description, lang/hreflang and the Impressum link; the country comes from the TLD and language tags
+"""
+
+import codecs
+import re
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin
+
+from page_stream import body_encoding, is_html, iter_body
+from startup_record import StartupRecord, extract_domain
+
+# Country-code TLDs and language regions -> country label used in the results
+COUNTRY_CODES = {
+    'de': 'Germany', 'at': 'Austria', 'ch': 'Switzerland', 'fr': 'France', 'nl': 'Netherlands',
+    'be': 'Belgium', 'lu': 'Luxembourg', 'uk': 'United Kingdom', 'gb': 'United Kingdom',
+    'ie': 'Ireland', 'se': 'Sweden', 'dk': 'Denmark', 'no': 'Norway', 'fi': 'Finland',
+    'es': 'Spain', 'pt': 'Portugal', 'it': 'Italy', 'pl': 'Poland', 'cz': 'Czech Republic',
+    'ee': 'Estonia', 'lt': 'Lithuania', 'lv': 'Latvia',
+}
+
+# Link text or path of a legal notice page; an Impressum is mandatory for German sites
+IMPRESSUM_PATTERN = re.compile(r'impressum|imprint|legal[-_ ]notice', re.IGNORECASE)
+
+# Separators between the page name and the site name in a <title>
+TITLE_SEPARATORS = re.compile(r'\s+[|\-–—:·•]\s+')
+
+MAX_COMPANY_NAME_LENGTH = 60
+
+# Title segments that name a page rather than the company
+GENERIC_TITLES = {'home', 'homepage', 'start', 'startseite', 'welcome', 'willkommen', 'index', 'accueil', 'inicio'}
+
+# Tags that may appear in <head>; any other tag means the body has started
+HEAD_TAGS = {'head', 'title', 'meta', 'link', 'base', 'script', 'style', 'noscript', 'template'}
+
+
+class PageMetadata:
+    """What the head (and the first bytes of the body) of a homepage says about the site"""
+
+    __slots__ = ('url', 'title', 'site_name', 'description', 'lang', 'hreflangs', 'impressum_url')
+
+    def __init__(self, url: str):
+        self.url = url
+        self.title: Optional[str] = None
+        self.site_name: Optional[str] = None
+        self.description: Optional[str] = None
+        self.lang: Optional[str] = None
+        self.hreflangs: List[str] = []
+        self.impressum_url: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.__slots__ if getattr(self, field)}
+
+
+class MetadataParser(HTMLParser):
+    """Incremental parser that fills a PageMetadata and knows when it has seen enough
+
+    Everything but the Impressum link lives in ``<head>``; the Impressum
+    link usually sits in the navigation or footer, so parsing continues
+    into the body until it is found or the caller's byte cap is reached.
+    """
+
+    def __init__(self, metadata: PageMetadata):
+        super().__init__(convert_charrefs=True)
+        self.metadata = metadata
+        self.head_done = False
+        self.in_title = False
+        self.title_parts: List[str] = []
+        self.anchor_href: Optional[str] = None
+        self.anchor_text: List[str] = []
+
+    @property
+    def done(self) -> bool:
+        return self.head_done and self.metadata.impressum_url is not None
+
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: (value or '').strip() for name, value in attrs}
+        metadata = self.metadata
+        if tag == 'html':
+            metadata.lang = metadata.lang or attributes.get('lang') or None
+            return
+        if tag not in HEAD_TAGS:
+            self.head_done = True  # <body> and </head> are optional in HTML5
+        if self.head_done:
+            if tag == 'a':
+                self.anchor_href = attributes.get('href')
+                self.anchor_text = []
+            return
+
+        if tag == 'title' and metadata.title is None:
+            self.in_title = True
+        elif tag == 'meta':
+            key = (attributes.get('property') or attributes.get('name') or '').lower()
+            content = attributes.get('content')
+            if not content:
+                return
+            if key == 'og:site_name':
+                metadata.site_name = content
+            elif key == 'description' or (key == 'og:description' and metadata.description is None):
+                metadata.description = content
+            elif attributes.get('http-equiv', '').lower() == 'content-language' and metadata.lang is None:
+                metadata.lang = content.split(',')[0].strip()
+        elif tag == 'link' and attributes.get('hreflang') and 'alternate' in attributes.get('rel', '').lower():
+            metadata.hreflangs.append(attributes['hreflang'])
+
+    def handle_data(self, data):
+        if self.in_title:
+            self.title_parts.append(data)
+        elif self.anchor_href is not None:
+            self.anchor_text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == 'title' and self.in_title:
+            self.in_title = False
+            self.metadata.title = ' '.join(''.join(self.title_parts).split()) or None
+        elif tag == 'head':
+            self.head_done = True
+        elif tag == 'a' and self.anchor_href is not None:
+            href, text = self.anchor_href, ''.join(self.anchor_text)
+            self.anchor_href = None
+            if self.metadata.impressum_url is None and href and (
+                    IMPRESSUM_PATTERN.search(href) or IMPRESSUM_PATTERN.search(text)):
+                self.metadata.impressum_url = urljoin(self.metadata.url, href)
+
+
+def parse_metadata(url: str, chunks: Iterable[bytes], encoding: str = 'utf-8') -> PageMetadata:
+    """Parse page chunks until the metadata is complete or the chunks run out"""
+    metadata = PageMetadata(url)
+    parser = MetadataParser(metadata)
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            break
+    return metadata
+
+
+def _compact(text: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', text.lower())
+
+
+def infer_country(metadata: PageMetadata) -> Optional[str]:
+    """Country from, in order: the TLD, the page language's region, agreeing hreflang regions
+
+    An Impressum link is not evidence of a country on its own: Austrian and
+    Swiss sites have one too, and 'imprint' or 'legal notice' pages are
+    common across the EU, so such pages are left without a country.
+    """
+    tld = extract_domain(metadata.url).rsplit('.', 1)[-1]
+    if tld in COUNTRY_CODES:
+        return COUNTRY_CODES[tld]
+
+    def region(language_tag: str) -> Optional[str]:
+        parts = language_tag.replace('_', '-').lower().split('-')
+        return parts[1] if len(parts) > 1 and parts[1] in COUNTRY_CODES else None
+
+    if metadata.lang and region(metadata.lang):
+        return COUNTRY_CODES[region(metadata.lang)]
+    regions = {region(tag) for tag in metadata.hreflangs if tag.lower() != 'x-default'}
+    if len(regions) == 1 and None not in regions:
+        return COUNTRY_CODES[regions.pop()]
+    return None
+
+
+def infer_company_name(metadata: PageMetadata) -> Optional[str]:
+    """Company name from og:site_name, else the title segment that matches the domain"""
+    if metadata.site_name and len(metadata.site_name) <= MAX_COMPANY_NAME_LENGTH:
+        return metadata.site_name
+    if not metadata.title:
+        return None
+
+    label = _compact(extract_domain(metadata.url).split('.')[0])
+    segments = [segment.strip() for segment in TITLE_SEPARATORS.split(metadata.title)
+                if segment.strip() and segment.strip().lower() not in GENERIC_TITLES]
+    for segment in segments:
+        compact = _compact(segment)
+        if len(compact) >= 3 and len(label) >= 3 and (compact in label or label in compact) and len(segment.split()) <= 5:
+            return segment
+    # No segment names the domain: only trust a short brand-like segment
+    if len(segments) > 1:
+        shortest = min(segments, key=len)
+        return shortest if len(shortest.split()) <= 3 else None
+    return segments[0] if segments and len(segments[0].split()) <= 3 else None
+
+
+class MetadataEnricher:
+    """Fetches homepages concurrently and fills in missing country and company names
+
+    Each worker streams at most ``max_bytes`` of one page and stops as soon
+    as the head and an Impressum link have been parsed, so memory stays at
+    one capped page per worker. Pages another stage already downloaded can
+    be handed in with ``add_page`` and are not fetched again.
+    """
+
+    def __init__(self, session, max_workers: int = 8, max_bytes: int = 128 * 1024, timeout: float = 10):
+        self.session = session
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.pages: Dict[str, PageMetadata] = {}
+
+    def add_page(self, url: str, body: bytes, encoding: str):
+        """Parse a page body fetched elsewhere (e.g. by near-duplicate detection)"""
+        self.pages[url] = parse_metadata(url, [body[:self.max_bytes]], encoding)
+
+    def fetch_metadata(self, url: str) -> Optional[PageMetadata]:
+        """Metadata of the page at a URL, or None when it cannot be read"""
+        if self.session.budget_exhausted:
+            return None
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                if response.status_code >= 400 or not is_html(response):
+                    return None
+                return parse_metadata(url, iter_body(response, self.max_bytes), body_encoding(response))
+        except Exception:
+            return None
+
+    def enrich(self, records: List[StartupRecord]) -> Dict[str, int]:
+        """Fill unset ``country`` and ``company_name`` fields in place; returns counts for the analysis"""
+        pending = [record.url for record in records if record.url not in self.pages]
+        print(f"🏷️ Reading page heads of {len(pending)} homepages "
+              f"({len(records) - len(pending)} already fetched)...")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for url, metadata in zip(pending, executor.map(self.fetch_metadata, pending)):
+                if metadata is not None:
+                    self.pages[url] = metadata
+
+        stats = {'pages_read': 0, 'countries_filled': 0, 'company_names_filled': 0, 'impressum_links': 0}
+        for record in records:
+            metadata = self.pages.get(record.url)
+            if metadata is None:
+                continue
+            stats['pages_read'] += 1
+            stats['impressum_links'] += metadata.impressum_url is not None
+            if record.country in (None, 'Unknown'):
+                country = infer_country(metadata)
+                if country:
+                    record['country'] = country
+                    stats['countries_filled'] += 1
+            if record.company_name is None:
+                record.company_name = infer_company_name(metadata)
+                stats['company_names_filled'] += record.company_name is not None
+        return stats
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+PAGE STREAM
+Streaming page fetches with a byte cap and content-type gating
+Links are extracted while the body is still arriving, so a scraper can stop as soon as it has enough
+"""
+
+import codecs
+from html.parser import HTMLParser
+from typing import Iterator, List, Optional
+
+import requests
+
+# Content types worth parsing for links; anything else is rejected before the body is read
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+CHUNK_SIZE = 16384
+
+
+class UnsupportedContentType(requests.RequestException):
+    """Raised when a page turns out not to be HTML (PDFs, images, archives...)"""
+
+
+def is_html(response: requests.Response) -> bool:
+    """Whether a response declares an HTML body; a missing Content-Type counts as HTML"""
+    content_type = response.headers.get('Content-Type', 'text/html').split(';')[0].strip().lower()
+    return content_type in HTML_CONTENT_TYPES
+
+
+def body_encoding(response: requests.Response) -> str:
+    """Charset from the Content-Type header, else UTF-8
+
+    requests falls back to ISO-8859-1 for any text/* response without a
+    charset, which mangles the UTF-8 most pages are actually served in.
+    """
+    if 'charset' in response.headers.get('Content-Type', '').lower() and response.encoding:
+        return response.encoding
+    return 'utf-8'
+
+
+def iter_body(response: requests.Response, max_bytes: int = DEFAULT_MAX_BYTES) -> Iterator[bytes]:
+    """Chunks of a streamed response body, stopping after exactly ``max_bytes``"""
+    remaining = max_bytes
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if len(chunk) >= remaining:
+            yield chunk[:remaining]
+            return
+        remaining -= len(chunk)
+        yield chunk
+
+
+def read_capped(response: requests.Response, max_bytes: int = DEFAULT_MAX_BYTES) -> bytes:
+    """At most ``max_bytes`` of a streamed response body"""
+    return b''.join(iter_body(response, max_bytes))
+
+
+class LinkParser(HTMLParser):
+    """Incremental parser that collects ``<a href>`` values as they are fed"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            if href:
+                self.links.append(href.strip())
+
+    def take(self) -> List[str]:
+        """Links parsed since the last call"""
+        links, self.links = self.links, []
+        return links
+
+
+class LinkStream:
+    """Streams a page and yields its links while the body is downloading
+
+    Use as a context manager; entering sends the request and rejects
+    non-HTML responses with UnsupportedContentType before any of the body
+    is read. Iteration stops at ``max_bytes`` of body, or earlier when the
+    caller stops iterating, and leaving the block closes the connection
+    without downloading the rest.
+    """
+
+    def __init__(self, session: requests.Session, url: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 timeout: float = 15):
+        self.session = session
+        self.url = url
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.response: Optional[requests.Response] = None
+        self.bytes_read = 0
+        self.truncated = False  # True when the byte cap cut the page short
+
+    def __enter__(self) -> 'LinkStream':
+        self.response = self.session.get(self.url, timeout=self.timeout, stream=True)
+        try:
+            self.response.raise_for_status()
+            if not is_html(self.response):
+                raise UnsupportedContentType(
+                    f"{self.url} is {self.response.headers.get('Content-Type')}, not HTML", response=self.response
+                )
+        except Exception:
+            self.response.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        self.response.close()
+
+    def __iter__(self) -> Iterator[str]:
+        parser = LinkParser()
+        decoder = codecs.getincrementaldecoder(body_encoding(self.response))(errors='replace')
+        for chunk in iter_body(self.response, self.max_bytes):
+            self.bytes_read += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            yield from parser.take()
+        self.truncated = self.bytes_read >= self.max_bytes
+        if not self.truncated:
+            parser.feed(decoder.decode(b'', final=True))
+            parser.close()
+            yield from parser.take()
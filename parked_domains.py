@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+PARKED DOMAINS
+Fingerprints of registrar parking, domain-for-sale and default hosting pages
+Placeholder sites are recognized from their DNS names and the first chunk of their homepage, before any further crawling
+"""
+
+import hashlib
+import json
+import os
+import re
+import socket
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from page_metadata import parse_metadata
+from startup_record import extract_domain
+
+try:
+    import dns.resolver
+except ImportError:  # Optional: without dnspython only CNAME chains are checked, not nameservers
+    dns = None
+
+DEFAULT_FINGERPRINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parked_fingerprints.json')
+
+# Placeholder pages show their tell-tale markup early; the rest of the body is never read
+FIRST_CHUNK_BYTES = 16 * 1024
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def content_hash(chunk: bytes, host: str, encoding: str = 'utf-8') -> str:
+    """Hash of a page's first chunk that is the same for every domain a template is served on
+
+    The host and its registered domain are blanked out, and case and
+    whitespace are normalized.
+    """
+    text = chunk[:FIRST_CHUNK_BYTES].decode(encoding, errors='replace').lower()
+    for name in sorted({host.lower(), extract_domain(f"https://{host}")}, key=len, reverse=True):
+        if name:
+            text = text.replace(name, '{domain}')
+    return hashlib.sha256(WHITESPACE.sub(' ', text).strip().encode('utf-8')).hexdigest()
+
+
+def dns_names(host: str) -> List[str]:
+    """CNAME chain of a host, plus its registered domain's nameservers when dnspython is installed"""
+    names = []
+    try:
+        canonical, aliases, _ = socket.gethostbyname_ex(host)
+        names.extend([canonical] + aliases)
+    except (OSError, UnicodeError):
+        pass
+    if dns is not None:
+        try:
+            answers = dns.resolver.resolve(extract_domain(f"https://{host}"), 'NS', lifetime=5)
+            names.extend(answer.to_text() for answer in answers)
+        except Exception:
+            pass
+    return [name.lower().rstrip('.') for name in names if name]
+
+
+class ParkedFingerprints:
+    """Library of placeholder-page fingerprints, loaded from JSON data files
+
+    Each file lists ``fingerprints``, whose ``dns`` name suffixes (CNAME
+    targets or nameservers), ``title`` regexes and ``body`` regexes are
+    matched case-insensitively, and ``content_hashes`` (see
+    ``content_hash``) mapped to a fingerprint name. Later files add to
+    the ones loaded before, so a local file extends the shipped library.
+    """
+
+    def __init__(self, paths: Sequence[str] = (DEFAULT_FINGERPRINT_PATH,)):
+        self.dns_suffixes: Dict[str, str] = {}
+        self.title_patterns = []
+        self.body_patterns = []
+        self.content_hashes: Dict[str, str] = {}
+        for path in paths:
+            self.load(path)
+
+    def load(self, path: str):
+        """Add the fingerprints of one data file"""
+        with open(path, encoding='utf-8') as fingerprint_file:
+            data = json.load(fingerprint_file)
+        for fingerprint in data.get('fingerprints', []):
+            name = fingerprint['name']
+            for suffix in fingerprint.get('dns', []):
+                self.dns_suffixes[suffix.lower().rstrip('.')] = name
+            self.title_patterns.extend((re.compile(pattern, re.I), name) for pattern in fingerprint.get('title', []))
+            self.body_patterns.extend((re.compile(pattern, re.I), name) for pattern in fingerprint.get('body', []))
+        self.content_hashes.update(data.get('content_hashes', {}))
+
+    def match_dns(self, names: Iterable[str]) -> Optional[str]:
+        """Fingerprint whose DNS suffix ends one of the names, or None"""
+        for name in names:
+            labels = name.split('.')
+            for start in range(len(labels)):
+                fingerprint = self.dns_suffixes.get('.'.join(labels[start:]))
+                if fingerprint is not None:
+                    return fingerprint
+        return None
+
+    def match_page(self, host: str, chunk: bytes, encoding: str = 'utf-8') -> Optional[str]:
+        """Fingerprint matching the first chunk of a homepage, or None"""
+        fingerprint = self.content_hashes.get(content_hash(chunk, host, encoding))
+        if fingerprint is not None:
+            return fingerprint
+        chunk = chunk[:FIRST_CHUNK_BYTES]
+        title = parse_metadata(f"https://{host}/", [chunk], encoding).title
+        if title:
+            for pattern, fingerprint in self.title_patterns:
+                if pattern.search(title):
+                    return fingerprint
+        text = chunk.decode(encoding, errors='replace')
+        for pattern, fingerprint in self.body_patterns:
+            if pattern.search(text):
+                return fingerprint
+        return None
+
+
+_libraries: Dict[tuple, ParkedFingerprints] = {}
+_libraries_lock = threading.Lock()
+
+
+def get_parked_fingerprints(paths: Sequence[str] = (DEFAULT_FINGERPRINT_PATH,)) -> ParkedFingerprints:
+    """The process-wide library for a set of data files, loaded on first use"""
+    key = tuple(os.path.abspath(path) for path in paths)
+    with _libraries_lock:
+        if key not in _libraries:
+            _libraries[key] = ParkedFingerprints(key)
+        return _libraries[key]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Print the fingerprint match and content hash of pages, for extending the data file"""
+    from http_session import create_session
+    from page_stream import body_encoding, read_capped
+
+    urls = argv if argv is not None else sys.argv[1:]
+    if not urls:
+        print("Usage: python parked_domains.py URL [URL ...]")
+        raise SystemExit(2)
+    library = get_parked_fingerprints()
+    session = create_session()
+    for url in urls:
+        host = urlparse(url).hostname or ''
+        try:
+            with session.get(url, timeout=10, stream=True) as response:
+                chunk = read_capped(response, FIRST_CHUNK_BYTES)
+                encoding = body_encoding(response)
+        except Exception as e:
+            print(f"⚠️ {url}: {str(e)}")
+            continue
+        names = dns_names(host)
+        match = library.match_dns(names) or library.match_page(host, chunk, encoding)
+        print(f"{url}")
+        print(f"  • DNS names: {', '.join(names) or '-'}")
+        print(f"  • Content hash: {content_hash(chunk, host, encoding)}")
+        print(f"  • Fingerprint: {match or 'no match'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+QUERY SCHEDULER
+Yield-driven scheduling of search queries
+Tracks how many new unique URLs each query finds per request and spends the budget where it still pays off
+"""
+
+import json
+import os
+import random
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows: concurrent savers may then lose each other's updates, never crash
+    fcntl = None
+
+DEFAULT_STATS_PATH = 'query_yield_stats.json'
+
+# Optimistic prior so queries without history are tried before proven low-yield ones
+PRIOR_NEW_URLS = 10
+PRIOR_REQUESTS = 1
+
+
+class QueryYieldScheduler:
+    """Orders, budgets and early-stops search queries by their historical yield
+
+    Yield is new unique URLs per request. Across runs the per-query totals
+    are persisted to ``stats_path``; within a run each query category keeps
+    its own history so a category stops once its marginal yield drops below
+    ``stop_threshold``. Queries whose long-run yield is below
+    ``retire_threshold`` after ``min_samples`` requests are skipped.
+
+    Totals decay by ``decay`` every time a query runs, so old samples (a
+    rate-limited run, a query that has since picked up) weigh less than
+    recent ones. Retirement is not final: each plan gives every retired
+    query an ``explore_rate`` chance to run again, drawn from ``rng`` so a
+    seeded replay plans the same queries.
+
+    Several processes may share one statistics file (sharded workers): each
+    keeps the totals it recorded since its last save apart and adds them to
+    the file's current contents under a file lock when saving.
+    """
+
+    def __init__(self, stats_path: Optional[str] = DEFAULT_STATS_PATH, stop_threshold: float = 1.0,
+                 retire_threshold: float = 0.5, min_queries_per_category: int = 3,
+                 min_samples: int = 3, window: int = 2, decay: float = 0.9, explore_rate: float = 0.1,
+                 rng: Optional[random.Random] = None):
+        self.stats_path = stats_path  # None keeps statistics in memory only
+        self.stop_threshold = stop_threshold
+        self.retire_threshold = retire_threshold
+        self.min_queries_per_category = min_queries_per_category
+        self.min_samples = min_samples
+        self.window = window
+        self.decay = decay
+        self.explore_rate = explore_rate
+        self.rng = rng or random.Random()
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.pending: Dict[str, Dict[str, float]] = {}  # Recorded since the last save, not yet in the file
+        self.run_history: Dict[str, List[float]] = {}
+
+        if stats_path:
+            self.stats = self.read_stats()
+
+    def read_stats(self) -> Dict[str, Dict[str, float]]:
+        """Statistics currently in the file, empty when there is none yet"""
+        if not os.path.exists(self.stats_path):
+            return {}
+        with open(self.stats_path, encoding='utf-8') as stats_file:
+            return json.load(stats_file)
+
+    def snapshot(self) -> Dict:
+        """Copy of the persisted statistics, e.g. for a record/replay archive"""
+        return {query: dict(stats) for query, stats in self.stats.items()}
+
+    def restore(self, stats: Dict):
+        """Replace the statistics with a snapshot"""
+        self.stats = {query: dict(values) for query, values in stats.items()}
+
+    def expected_yield(self, query: str) -> float:
+        """Smoothed new URLs per request for a query"""
+        stats = self.stats.get(query, {})
+        return (stats.get('new_urls', 0) + PRIOR_NEW_URLS) / (stats.get('requests', 0) + PRIOR_REQUESTS)
+
+    def is_retired(self, query: str) -> bool:
+        """Whether a query has proven not worth a request any more"""
+        stats = self.stats.get(query)
+        if not stats or stats['requests'] < self.min_samples:
+            return False
+        return stats['new_urls'] / stats['requests'] < self.retire_threshold
+
+    def plan(self, queries: List[str]) -> List[str]:
+        """Queries worth running, highest expected yield first (ties keep list order)
+
+        Retired queries drawn for exploration go first, so an early stop or
+        the query budget cannot crowd them out.
+        """
+        active = [query for query in queries if not self.is_retired(query)]
+        explored = [query for query in queries if self.is_retired(query) and self.rng.random() < self.explore_rate]
+        return explored + sorted(active, key=self.expected_yield, reverse=True)
+
+    def record(self, query: str, category: str, requests: int, new_urls: int):
+        """Account for a finished query"""
+        stats = self.stats.setdefault(query, {'runs': 0, 'requests': 0, 'new_urls': 0})
+        stats['runs'] += 1
+        stats['requests'] = stats['requests'] * self.decay + requests
+        stats['new_urls'] = stats['new_urls'] * self.decay + new_urls
+        # Kept undecayed; save() decays the file's totals once per run recorded here
+        pending = self.pending.setdefault(query, {'runs': 0, 'requests': 0, 'new_urls': 0})
+        pending['runs'] += 1
+        pending['requests'] += requests
+        pending['new_urls'] += new_urls
+        if requests:
+            self.run_history.setdefault(category, []).append(new_urls / requests)
+
+    def category_exhausted(self, category: str) -> bool:
+        """Whether the category's recent marginal yield fell below the stop threshold"""
+        history = self.run_history.get(category, [])
+        if len(history) < self.min_queries_per_category:
+            return False
+        recent = history[-self.window:]
+        return sum(recent) / len(recent) < self.stop_threshold
+
+    @contextmanager
+    def locked(self):
+        """Hold an exclusive lock on the statistics file's companion lock file"""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.stats_path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self):
+        """Add the statistics recorded since the last save to the file, atomically
+
+        The file is re-read under the lock, so totals other processes saved
+        meanwhile are kept, and each save writes its own temporary file.
+        """
+        if not self.stats_path:
+            return
+        with self.locked():
+            stats = self.read_stats()
+            for query, recorded in self.pending.items():
+                totals = stats.setdefault(query, {'runs': 0, 'requests': 0, 'new_urls': 0})
+                factor = self.decay ** recorded['runs']
+                totals['runs'] += recorded['runs']
+                for key in ('requests', 'new_urls'):
+                    totals[key] = round(totals[key] * factor + recorded[key], 3)
+            directory = os.path.dirname(os.path.abspath(self.stats_path))
+            descriptor, temp_path = tempfile.mkstemp(prefix='.query_yield_', suffix='.tmp', dir=directory)
+            try:
+                with os.fdopen(descriptor, 'w', encoding='utf-8') as stats_file:
+                    json.dump(stats, stats_file, indent=2, ensure_ascii=False, sort_keys=True)
+                os.replace(temp_path, self.stats_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        self.stats = stats
+        self.pending = {}
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+RECORD STREAM
+Helpers for streaming discovered records instead of returning them in one list
+Deduplication on the fly and an async view of the synchronous discovery generators
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, Iterator, Optional, Set
+
+from startup_record import StartupRecord
+
+_DONE = object()
+
+
+def unique_records(records: Iterable[StartupRecord], seen: Optional[Set[str]] = None) -> Iterator[StartupRecord]:
+    """Records whose URL has not been seen yet, in arrival order; ``seen`` is updated in place"""
+    seen = set() if seen is None else seen
+    for record in records:
+        if record.url not in seen:
+            seen.add(record.url)
+            yield record
+
+
+async def aiter_records(records: Iterator[StartupRecord]) -> AsyncIterator[StartupRecord]:
+    """Async iterator over a blocking record generator
+
+    The generator advances on one dedicated worker thread, so the event
+    loop stays free while requests are in flight and the discoverer's
+    session is only ever used from that thread. Leaving the ``async for``
+    early closes the generator, which stops discovery at its next record.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='discovery') as executor:
+        try:
+            while True:
+                record = await loop.run_in_executor(executor, next, records, _DONE)
+                if record is _DONE:
+                    return
+                yield record
+        finally:
+            close = getattr(records, 'close', None)
+            if close is not None:
+                await loop.run_in_executor(executor, close)
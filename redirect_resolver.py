@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+REDIRECT RESOLVER
+Follows each URL's redirect chain once and remembers where it ends
+Persistent source -> final URL map with a TTL, so later stages and runs skip the round-trips
+"""
+
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from startup_record import StartupRecord
+
+DEFAULT_REDIRECT_MAP_PATH = 'redirect_map.db'
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS redirects (
+    source_url TEXT PRIMARY KEY,
+    final_url TEXT NOT NULL,
+    status INTEGER,
+    resolved_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_redirects_final ON redirects(final_url);
+"""
+
+
+class RedirectMap:
+    """SQLite map of source URL to final URL; entries older than ``ttl`` are ignored
+
+    ``path=None`` keeps the map in memory only (used when replaying an archive).
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_REDIRECT_MAP_PATH, ttl: float = DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self.conn = sqlite3.connect(path or ':memory:', timeout=30)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Final URLs for those sources that have a fresh entry"""
+        oldest = time.time() - self.ttl
+        found = {}
+        for url in urls:
+            row = self.conn.execute(
+                'SELECT final_url FROM redirects WHERE source_url = ? AND resolved_at >= ?', (url, oldest)
+            ).fetchone()
+            if row:
+                found[url] = row[0]
+        return found
+
+    def store(self, resolved: Dict[str, str], statuses: Optional[Dict[str, int]] = None,
+              resolved_at: Optional[float] = None):
+        """Insert or refresh entries"""
+        resolved_at = time.time() if resolved_at is None else resolved_at
+        statuses = statuses or {}
+        with self.conn:
+            self.conn.executemany(
+                """INSERT INTO redirects (source_url, final_url, status, resolved_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(source_url) DO UPDATE SET final_url = excluded.final_url,
+                       status = excluded.status, resolved_at = excluded.resolved_at""",
+                [(url, final, statuses.get(url), resolved_at) for url, final in resolved.items()]
+            )
+
+    def purge_expired(self) -> int:
+        """Delete stale entries; returns how many were removed"""
+        with self.conn:
+            cursor = self.conn.execute('DELETE FROM redirects WHERE resolved_at < ?', (time.time() - self.ttl,))
+        return cursor.rowcount
+
+
+class RedirectResolver:
+    """Resolves redirect chains concurrently, answering from the RedirectMap when it can"""
+
+    def __init__(self, session, redirect_map: RedirectMap, max_workers: int = 8, timeout: float = 10):
+        self.session = session
+        self.redirect_map = redirect_map
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache_hits: Dict[str, str] = {}  # Answers served from the map during this run
+
+    def follow(self, url: str):
+        """Follow one redirect chain; returns (final URL, status) or None on failure"""
+        if self.session.budget_exhausted:
+            return None
+        try:
+            response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in (403, 405, 501):
+                # Some servers refuse HEAD; a streamed GET follows the chain without the body
+                with self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True) as get_response:
+                    response = get_response
+            return response.url, response.status_code
+        except Exception:
+            return None
+
+    def resolve(self, urls: List[str]) -> Dict[str, str]:
+        """Map each URL to its final URL; URLs that could not be resolved map to themselves"""
+        urls = list(dict.fromkeys(urls))
+        self.cache_hits = self.redirect_map.lookup(urls)
+        pending = [url for url in urls if url not in self.cache_hits]
+
+        print(f"↪️ Resolving {len(urls)} URLs ({len(self.cache_hits)} from the redirect map)...")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            answers = list(executor.map(self.follow, pending))
+
+        resolved = {}
+        statuses = {}
+        for url, answer in zip(pending, answers):
+            if answer is not None:
+                resolved[url], statuses[url] = answer
+        self.redirect_map.store(resolved, statuses)
+
+        final_urls = dict(self.cache_hits)
+        final_urls.update(resolved)
+        # requests adds a trailing slash to bare hosts, which is not a redirect
+        redirected = sum(1 for url in urls
+                         if final_urls.get(url, url).rstrip('/') != url.split('#')[0].rstrip('/'))
+        print(f"✅ Resolved {len(resolved)} URLs over the network, {redirected} redirect elsewhere, "
+              f"{len(pending) - len(resolved)} unreachable")
+        return {url: final_urls.get(url, url) for url in urls}
+
+    def canonicalize(self, records: List[StartupRecord]) -> List[StartupRecord]:
+        """Rewrite records to their final URL and keep the first record per final URL
+
+        ``records`` should be ranked best first, so the surviving record for
+        ``http://x.com`` and ``https://www.x.com/`` is the higher-ranked one.
+        """
+        final_urls = self.resolve([record.url for record in records])
+        seen = set()
+        unique = []
+        for record in records:
+            final_url = final_urls[record.url].split('#')[0]
+            if final_url in seen:
+                continue
+            seen.add(final_url)
+            record.url = final_url
+            unique.append(record)
+        print(f"✅ {len(records) - len(unique)} URLs collapsed onto an already listed final URL")
+        return unique
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+RESULT API
+Local read-only HTTP API over the discovered-URL corpus
+In-memory indexes by confidence, country, category, method and domain; reloads when a new run lands
+"""
+
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from result_store import DEFAULT_STORE_PATH, ResultStore
+from startup_record import StartupRecord, extract_domain, normalize_url
+
+DEFAULT_PORT = 8765
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+# Query parameters answered from exact-match facet indexes
+FACETS = ('country', 'category', 'method', 'domain')
+
+
+class ResultIndex:
+    """Immutable in-memory view of a result set with one posting list per facet value
+
+    Records are kept best first (confidence, then URL). Every facet maps a
+    value to the ascending positions of its records, plus the same
+    positions as a set for membership tests, so a filtered page is an
+    intersection of posting lists and results come out in ranking order
+    without sorting per request.
+    """
+
+    def __init__(self, records: Iterable[StartupRecord], loaded_from: str = ''):
+        self.records: List[StartupRecord] = sorted(records, key=lambda record: (-record.confidence, record.url))
+        self.loaded_from = loaded_from
+        self.loaded_at = time.time()
+        self.by_url: Dict[str, int] = {}
+        self.by_confidence: Dict[int, List[int]] = {}
+        self.facets: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+
+        for position, record in enumerate(self.records):
+            self.by_url.setdefault(normalize_url(record.url), position)
+            self.by_confidence.setdefault(record.confidence, []).append(position)
+            values = {
+                'country': record.country or 'Unknown',
+                'category': record.category or 'Unknown',
+                'method': record.method or 'Unknown',
+                'domain': extract_domain(record.url),
+            }
+            for facet, value in values.items():
+                self.facets[facet].setdefault(value, []).append(position)
+        self.facet_sets: Dict[str, Dict[str, frozenset]] = {
+            facet: {value: frozenset(positions) for value, positions in values.items()}
+            for facet, values in self.facets.items()
+        }
+
+    def lookup(self, url: str) -> Optional[StartupRecord]:
+        """Point lookup by normalized URL (scheme, 'www.' and trailing slash ignored)"""
+        position = self.by_url.get(normalize_url(url))
+        return None if position is None else self.records[position]
+
+    def confidence_span(self, min_confidence: Optional[int] = None, max_confidence: Optional[int] = None) -> range:
+        """Positions of the records in a confidence range: one contiguous span, as records are sorted by confidence"""
+        if min_confidence is None and max_confidence is None:
+            return range(len(self.records))
+        low = min_confidence if min_confidence is not None else float('-inf')
+        high = max_confidence if max_confidence is not None else float('inf')
+        buckets = [positions for confidence, positions in self.by_confidence.items() if low <= confidence <= high]
+        if not buckets:
+            return range(0)
+        return range(min(bucket[0] for bucket in buckets), max(bucket[-1] for bucket in buckets) + 1)
+
+    def filter(self, filters: Dict[str, str], min_confidence: Optional[int] = None,
+               max_confidence: Optional[int] = None, offset: int = 0,
+               limit: Optional[int] = None) -> Tuple[int, List[int]]:
+        """Number of records matching every filter and the positions of the page at ``offset``, in ranking order
+
+        Only the page is materialized: the confidence range is a span that
+        posting lists are cut to by bisection, and with several facets the
+        shortest list is walked against the precomputed sets of the others.
+        """
+        span = self.confidence_span(min_confidence, max_confidence)
+        stop = None if limit is None else offset + limit
+        postings = []
+        for facet, value in filters.items():
+            if facet == 'domain':
+                value = extract_domain(value) if '://' in value else value.lower()
+            positions = self.facets[facet].get(value, [])
+            postings.append((facet, value, positions,
+                             bisect_left(positions, span.start), bisect_left(positions, span.stop)))
+
+        if not postings:
+            return len(span), list(span[offset:stop])
+
+        postings.sort(key=lambda posting: posting[4] - posting[3])
+        _, _, positions, first, last = postings[0]
+        if len(postings) == 1:
+            return last - first, positions[first + offset:last if stop is None else min(last, first + stop)]
+
+        others = [self.facet_sets[facet][value] for facet, value, _, _, _ in postings[1:]]
+        total = 0
+        page = []
+        for index in range(first, last):
+            position = positions[index]
+            if all(position in allowed for allowed in others):
+                if total >= offset and (stop is None or total < stop):
+                    page.append(position)
+                total += 1
+        return total, page
+
+    def stats(self) -> Dict:
+        return {
+            'total_urls': len(self.records),
+            'loaded_from': self.loaded_from,
+            'loaded_at': self.loaded_at,
+            'confidence': {str(value): len(positions) for value, positions in sorted(self.by_confidence.items())},
+            **{facet: {value: len(positions) for value, positions in values.items()}
+               for facet, values in self.facets.items() if facet != 'domain'}
+        }
+
+
+class ResultSource:
+    """Where the corpus is loaded from: the SQLite store or the newest results file matching a glob"""
+
+    def __init__(self, store_path: Optional[str] = None, results_glob: Optional[str] = None):
+        self.store_path = store_path
+        self.results_glob = results_glob
+
+    def current_path(self) -> Optional[str]:
+        if self.results_glob:
+            paths = glob.glob(self.results_glob)
+            return max(paths, key=os.path.getmtime) if paths else None
+        return self.store_path if self.store_path and os.path.exists(self.store_path) else None
+
+    def signature(self):
+        """Changes whenever a new run finished writing"""
+        path = self.current_path()
+        if path is None:
+            return None
+        related = [path, path + '-wal'] if not self.results_glob else [path]
+        return path, tuple(os.stat(p).st_mtime_ns for p in related if os.path.exists(p))
+
+    def load(self) -> ResultIndex:
+        path = self.current_path()
+        if path is None:
+            return ResultIndex([], loaded_from='')
+        if self.results_glob:
+            from result_export import read_export
+
+            return ResultIndex(read_export(path), loaded_from=path)
+        with ResultStore(path) as store:
+            return ResultIndex(store.iter_records(), loaded_from=path)
+
+
+class ResultApiHandler(BaseHTTPRequestHandler):
+    server_version = 'StartupResultAPI/1.0'
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        index = self.server.index  # One snapshot per request, reloads swap it atomically
+        try:
+            if parsed.path == '/results':
+                self.send_json(200, self.list_results(index, params))
+            elif parsed.path == '/lookup':
+                if 'url' not in params:
+                    raise ValueError("Missing 'url' parameter")
+                record = index.lookup(params['url'])
+                if record is None:
+                    self.send_json(404, {'error': f"Unknown URL {params['url']}"})
+                else:
+                    self.send_json(200, record.to_dict())
+            elif parsed.path == '/stats':
+                self.send_json(200, index.stats())
+            elif parsed.path == '/health':
+                self.send_json(200, {'status': 'ok', 'total_urls': len(index.records)})
+            else:
+                self.send_json(404, {'error': f"Unknown endpoint {parsed.path}",
+                                     'endpoints': ['/results', '/lookup', '/stats', '/health']})
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+
+    def list_results(self, index: ResultIndex, params: Dict[str, str]) -> Dict:
+        def int_param(name: str, default=None):
+            if name not in params:
+                return default
+            try:
+                return int(params[name])
+            except ValueError:
+                raise ValueError(f"'{name}' must be an integer")
+
+        offset = max(int_param('offset', 0), 0)
+        limit = min(max(int_param('limit', DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+        filters = {facet: params[facet] for facet in FACETS if params.get(facet)}
+        total, page = index.filter(filters, int_param('min_confidence'), int_param('max_confidence'), offset, limit)
+        return {
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'next_offset': offset + limit if offset + limit < total else None,
+            'results': [index.records[position].to_dict() for position in page]
+        }
+
+    def send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ResultApiServer(ThreadingHTTPServer):
+    """Threaded HTTP server that hot-reloads its index when the source changes"""
+
+    daemon_threads = True
+
+    def __init__(self, address, source: ResultSource, reload_interval: float = 2.0, verbose: bool = False):
+        super().__init__(address, ResultApiHandler)
+        self.source = source
+        self.reload_interval = reload_interval
+        self.verbose = verbose
+        self.signature = source.signature()
+        self.index = source.load()
+        self.watcher = threading.Thread(target=self.watch, name='result-reload', daemon=True)
+        self.watcher.start()
+
+    def watch(self):
+        while True:
+            time.sleep(self.reload_interval)
+            try:
+                signature = self.source.signature()
+                if signature == self.signature:
+                    continue
+                index = self.source.load()
+            except Exception as e:
+                # A run may still be writing the file; try again on the next tick
+                print(f"⚠️ Reload failed: {str(e)}")
+                continue
+            self.index, self.signature = index, signature
+            print(f"🔄 Reloaded {len(index.records)} URLs from {index.loaded_from}")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Serve the discovered-URL corpus over HTTP"""
+    parser = argparse.ArgumentParser(description="Local HTTP API over discovered startup URLs")
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="SQLite result store to serve")
+    parser.add_argument('--results', metavar='GLOB',
+                        help="Serve the newest results file matching GLOB instead "
+                             "(e.g. 'ultimate_startup_discovery_*.json')")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--reload-interval', type=float, default=2.0, help="Seconds between change checks")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args(argv)
+
+    source = ResultSource(store_path=args.store, results_glob=args.results)
+    server = ResultApiServer((args.host, args.port), source, args.reload_interval, args.verbose)
+    print(f"🌐 Serving {len(server.index.records)} URLs from {server.index.loaded_from or 'nothing yet'} "
+          f"on http://{args.host}:{server.server_address[1]}")
+    print("   GET /results?country=&category=&method=&domain=&min_confidence=&max_confidence=&offset=&limit=")
+    print("   GET /lookup?url=   GET /stats   GET /health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ API stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
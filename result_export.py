@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+RESULT EXPORT
+Compressed and columnar exports of discovered startup URLs
+JSON Lines (gzip or zstd) and Parquet/Arrow, written in fixed-size chunks so memory stays bounded
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from startup_record import StartupRecord
+
+# Same columns, in the same order, as results.csv
+EXPORT_COLUMNS = ('url', 'source', 'confidence', 'category', 'country', 'method', 'company_name')
+
+DEFAULT_CHUNK_SIZE = 50000
+
+
+def _chunks(records: Iterable[StartupRecord], size: int) -> Iterator[List[StartupRecord]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _column(records: List[StartupRecord], column: str) -> list:
+    """One column of a chunk, with unset labels written as '' like the CSV output"""
+    if column == 'confidence':
+        return [record.confidence for record in records]
+    return [getattr(record, column) or '' for record in records]
+
+
+def _row(record: StartupRecord) -> Dict:
+    row = {column: getattr(record, column) or '' for column in EXPORT_COLUMNS}
+    row['confidence'] = record.confidence
+    return row
+
+
+def _open_zstd(path: str, mode: str):
+    """Open a zstd-compressed text stream (needs the optional zstandard package)"""
+    import zstandard
+
+    if 'w' in mode:
+        raw = zstandard.ZstdCompressor(level=10).stream_writer(open(path, 'wb'))
+    else:
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'))
+    return io.TextIOWrapper(raw, encoding='utf-8')
+
+
+def export_jsonl(records: Iterable[StartupRecord], path: str, compression: Optional[str] = 'gzip',
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write one JSON object per line, gzip- or zstd-compressed; returns the row count"""
+    if compression == 'zstd':
+        output = _open_zstd(path, 'w')
+    elif compression == 'gzip':
+        output = gzip.open(path, 'wt', encoding='utf-8', compresslevel=6)
+    else:
+        output = open(path, 'w', encoding='utf-8')
+
+    rows = 0
+    with output:
+        for chunk in _chunks(records, chunk_size):
+            output.write(''.join(json.dumps(_row(record), ensure_ascii=False) + '\n' for record in chunk))
+            rows += len(chunk)
+    return rows
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        (column, pa.int8() if column == 'confidence' else pa.string()) for column in EXPORT_COLUMNS
+    ])
+
+
+def _arrow_batches(records: Iterable[StartupRecord], chunk_size: int):
+    """Record batches of at most ``chunk_size`` rows, built column by column"""
+    import pyarrow as pa
+
+    schema = _arrow_schema()
+    for chunk in _chunks(records, chunk_size):
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(_column(chunk, field.name), type=field.type) for field in schema], schema=schema
+        )
+
+
+def export_parquet(records: Iterable[StartupRecord], path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write a zstd-compressed Parquet file, one row group per chunk (needs pyarrow)"""
+    import pyarrow.parquet as pq
+
+    rows = 0
+    with pq.ParquetWriter(path, _arrow_schema(), compression='zstd', use_dictionary=True) as writer:
+        for batch in _arrow_batches(records, chunk_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+def export_arrow(records: Iterable[StartupRecord], path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write an Arrow IPC file that can be memory-mapped by readers (needs pyarrow)"""
+    import pyarrow as pa
+
+    rows = 0
+    options = pa.ipc.IpcWriteOptions(compression='zstd')
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, _arrow_schema(), options=options) as writer:
+        for batch in _arrow_batches(records, chunk_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
+
+
+# Format name -> (file extension, writer)
+EXPORT_FORMATS: Dict[str, tuple] = {
+    'jsonl.gz': ('.jsonl.gz', lambda records, path, size: export_jsonl(records, path, 'gzip', size)),
+    'jsonl.zst': ('.jsonl.zst', lambda records, path, size: export_jsonl(records, path, 'zstd', size)),
+    'parquet': ('.parquet', export_parquet),
+    'arrow': ('.arrow', export_arrow),
+}
+
+
+def parse_formats(value: Optional[str]) -> List[str]:
+    """Split and validate a comma-separated list of export formats"""
+    formats = [name.strip() for name in (value or '').split(',') if name.strip()]
+    unknown = [name for name in formats if name not in EXPORT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(unknown)} "
+                         f"(available: {', '.join(EXPORT_FORMATS)})")
+    return formats
+
+
+def export_records(records: Callable[[], Iterable[StartupRecord]], base_path: str, formats: List[str],
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[str]:
+    """Write ``base_path`` + extension for every format; returns the files written
+
+    ``records`` is called once per format so a streaming source (e.g. a
+    database cursor) is never materialized. Formats whose optional library
+    is not installed are skipped with a warning.
+    """
+    written = []
+    for name in formats:
+        extension, writer = EXPORT_FORMATS[name]
+        path = base_path + extension
+        try:
+            rows = writer(records(), path, chunk_size)
+        except ImportError as e:
+            print(f"⚠️ Skipping {name} export: {e.name} is not installed")
+            continue
+        print(f"📦 Exported {rows} records to {path}")
+        written.append(path)
+    return written
+
+
+def read_export(path: str) -> Iterator[StartupRecord]:
+    """Stream records back from any of the export formats, or from results.csv / results.json"""
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as csvfile:
+            for row in csv.DictReader(csvfile):
+                yield StartupRecord.from_dict(row)
+        return
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as jsonfile:
+            data = json.load(jsonfile)
+        for row in data['urls'] if isinstance(data, dict) else data:
+            yield StartupRecord.from_dict(row)
+        return
+
+    if path.endswith('.parquet') or path.endswith('.arrow'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if path.endswith('.parquet'):
+            batches = pq.ParquetFile(path).iter_batches()
+        else:
+            reader = pa.ipc.open_file(pa.memory_map(path))
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        for batch in batches:
+            for row in batch.to_pylist():
+                yield StartupRecord.from_dict(row)
+        return
+
+    if path.endswith('.zst'):
+        stream = _open_zstd(path, 'r')
+    elif path.endswith('.gz'):
+        stream = gzip.open(path, 'rt', encoding='utf-8')
+    else:
+        stream = open(path, encoding='utf-8')
+    with stream:
+        for line in stream:
+            yield StartupRecord.from_dict(json.loads(line))
+
+
+def main(argv: Optional[List[str]] = None):
+    """Export the result store, or convert an existing results file, to compact formats"""
+    from result_store import DEFAULT_STORE_PATH, ResultStore
+
+    parser = argparse.ArgumentParser(description="Export discovered URLs to compressed / columnar files")
+    parser.add_argument('source', nargs='?',
+                        help="results.csv / results.json / an earlier export (default: the result store)")
+    parser.add_argument('--db', default=DEFAULT_STORE_PATH, help="SQLite result store to export")
+    parser.add_argument('--format', default='jsonl.gz', help=f"Comma-separated: {', '.join(EXPORT_FORMATS)}")
+    parser.add_argument('--output', default='startup_results', help="Output path without extension")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    try:
+        formats = parse_formats(args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.source is None:
+        with ResultStore(args.db) as store:
+            export_records(store.iter_records, args.output, formats, args.chunk_size)
+    else:
+        export_records(lambda: read_export(args.source), args.output, formats, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
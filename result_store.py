@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+RESULT STORE
+Embedded SQLite store for discovered startup URLs
+Upserts every run's records and answers indexed queries without reloading results.json
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from startup_record import RECORD_FIELDS, StartupRecord, extract_domain, records_to_dicts
+
+DEFAULT_STORE_PATH = 'startup_results.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    url TEXT PRIMARY KEY,
+    domain TEXT NOT NULL,
+    source TEXT,
+    confidence INTEGER NOT NULL DEFAULT 0,
+    category TEXT,
+    country TEXT,
+    method TEXT,
+    health_score INTEGER,
+    company_name TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    last_checked REAL,
+    last_status INTEGER,
+    check_failures INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_results_domain ON results(domain);
+CREATE INDEX IF NOT EXISTS idx_results_confidence ON results(confidence);
+CREATE INDEX IF NOT EXISTS idx_results_method ON results(method);
+CREATE INDEX IF NOT EXISTS idx_results_category ON results(category);
+CREATE INDEX IF NOT EXISTS idx_results_country ON results(country);
+CREATE TABLE IF NOT EXISTS source_runs (
+    name TEXT PRIMARY KEY,
+    last_run REAL NOT NULL
+);
+"""
+
+# Columns added after the first release, created on older stores when they are opened
+MIGRATED_COLUMNS = {
+    'last_checked': 'REAL',
+    'last_status': 'INTEGER',
+    'check_failures': 'INTEGER NOT NULL DEFAULT 0',
+    'company_name': 'TEXT',
+}
+
+# Re-verification interval by minimum confidence, most important first
+VERIFY_INTERVALS = ((8, 24 * 3600), (5, 3 * 24 * 3600), (0, 7 * 24 * 3600))
+
+UPSERT_SQL = """
+INSERT INTO results (url, domain, source, confidence, category, country, method,
+                     health_score, company_name, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(url) DO UPDATE SET
+    domain = excluded.domain,
+    source = excluded.source,
+    confidence = excluded.confidence,
+    category = excluded.category,
+    country = COALESCE(excluded.country, results.country),
+    method = excluded.method,
+    health_score = excluded.health_score,
+    company_name = COALESCE(excluded.company_name, results.company_name),
+    last_seen = excluded.last_seen
+"""
+
+
+class ResultStore:
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        existing = {row[1] for row in self.conn.execute('PRAGMA table_info(results)')}
+        with self.conn:
+            for column, definition in MIGRATED_COLUMNS.items():
+                if column not in existing:
+                    self.conn.execute(f'ALTER TABLE results ADD COLUMN {column} {definition}')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_results_last_checked ON results(last_checked)')
+
+    def close(self):
+        """Close the underlying database connection"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def upsert_records(self, records: Iterable[StartupRecord], seen_at: Optional[str] = None) -> int:
+        """Insert new records or refresh existing ones, keyed by URL"""
+        seen_at = seen_at or datetime.now().isoformat(timespec='seconds')
+        rows = (
+            (record.url, extract_domain(record.url), record.source, record.confidence,
+             record.category, record.country, record.method, record.health_score,
+             record.company_name, seen_at, seen_at)
+            for record in records
+        )
+        with self.conn:
+            cursor = self.conn.executemany(UPSERT_SQL, rows)
+        return cursor.rowcount
+
+    def query(self, domain: Optional[str] = None, min_confidence: Optional[int] = None,
+              max_confidence: Optional[int] = None, method: Optional[str] = None,
+              category: Optional[str] = None, country: Optional[str] = None,
+              source_prefix: Optional[str] = None, limit: Optional[int] = None) -> List[StartupRecord]:
+        """Return records matching all given filters, highest confidence first"""
+        clauses = []
+        params = []
+        if domain:
+            clauses.append('domain = ?')
+            params.append(extract_domain(domain) if '://' in domain else domain.lower())
+        if min_confidence is not None:
+            clauses.append('confidence >= ?')
+            params.append(min_confidence)
+        if max_confidence is not None:
+            clauses.append('confidence <= ?')
+            params.append(max_confidence)
+        for column, value in (('method', method), ('category', category), ('country', country)):
+            if value:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if source_prefix:
+            clauses.append("source LIKE ? ESCAPE '\\'")
+            escaped = source_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(escaped + '%')
+
+        sql = 'SELECT ' + ', '.join(RECORD_FIELDS) + ' FROM results'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY confidence DESC, url'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        return [StartupRecord(*row) for row in self.conn.execute(sql, params)]
+
+    def iter_records(self) -> Iterator[StartupRecord]:
+        """Stream every stored record, highest confidence first, without loading them all"""
+        sql = 'SELECT ' + ', '.join(RECORD_FIELDS) + ' FROM results ORDER BY confidence DESC, url'
+        for row in self.conn.execute(sql):
+            yield StartupRecord(*row)
+
+    def count(self) -> int:
+        """Return the number of stored URLs"""
+        return self.conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def counts_by(self, column: str) -> Dict:
+        """Return record counts grouped by one of the indexed columns"""
+        if column not in ('domain', 'confidence', 'method', 'category', 'country'):
+            raise ValueError(f"Cannot group by {column}")
+        sql = f'SELECT {column}, COUNT(*) FROM results GROUP BY {column} ORDER BY COUNT(*) DESC'
+        return {value if value is not None else 'Unknown': count
+                for value, count in self.conn.execute(sql)}
+
+    def due_for_verification(self, now: float, limit: int,
+                             intervals=VERIFY_INTERVALS) -> List[StartupRecord]:
+        """Records whose last check is older than their interval, most overdue first
+
+        Overdue-ness is the time since the last check divided by the record's
+        interval, so a confidence-10 URL one day stale ranks with a
+        confidence-3 URL a week stale. Never-checked records come first.
+        """
+        interval = 'CASE ' + ' '.join(
+            f'WHEN confidence >= {int(minimum)} THEN {float(seconds)}' for minimum, seconds in intervals
+        ) + f' ELSE {float(intervals[-1][1])} END'
+        sql = (
+            'SELECT ' + ', '.join(RECORD_FIELDS) + ' FROM results'
+            f' WHERE last_checked IS NULL OR ? - last_checked >= {interval}'
+            f' ORDER BY (? - COALESCE(last_checked, 0)) / {interval} DESC, confidence DESC, url'
+            ' LIMIT ?'
+        )
+        return [StartupRecord(*row) for row in self.conn.execute(sql, (now, now, limit))]
+
+    def record_checks(self, checks: Iterable, checked_at: float) -> int:
+        """Store (url, status) verification outcomes; status None means unreachable"""
+        rows = ((checked_at, status, 0 if status is not None and status < 400 else 1, url)
+                for url, status in checks)
+        with self.conn:
+            cursor = self.conn.executemany(
+                """UPDATE results SET last_checked = ?, last_status = ?,
+                       check_failures = CASE WHEN ? THEN check_failures + 1 ELSE 0 END
+                   WHERE url = ?""",
+                rows
+            )
+        return cursor.rowcount
+
+    def source_runs(self) -> Dict[str, float]:
+        """When each discovery source last finished, as epoch seconds"""
+        return dict(self.conn.execute('SELECT name, last_run FROM source_runs'))
+
+    def mark_source_run(self, name: str, finished_at: float):
+        with self.conn:
+            self.conn.execute(
+                'INSERT INTO source_runs (name, last_run) VALUES (?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET last_run = excluded.last_run',
+                (name, finished_at)
+            )
+
+    def import_json(self, path: str) -> int:
+        """Import a results.json / discovery JSON file"""
+        with open(path, encoding='utf-8') as jsonfile:
+            data = json.load(jsonfile)
+        rows = data['urls'] if isinstance(data, dict) else data
+        seen_at = data.get('discovery_timestamp') if isinstance(data, dict) else None
+        if seen_at:
+            seen_at = datetime.strptime(seen_at, "%Y%m%d_%H%M%S").isoformat()
+        return self.upsert_records((StartupRecord.from_dict(row) for row in rows), seen_at)
+
+    def import_csv(self, path: str) -> int:
+        """Import a results.csv / discovery CSV file"""
+        with open(path, newline='', encoding='utf-8') as csvfile:
+            return self.upsert_records(StartupRecord.from_dict(row) for row in csv.DictReader(csvfile))
+
+    def import_file(self, path: str) -> int:
+        """Import a CSV or JSON results file based on its extension"""
+        if path.endswith('.json'):
+            return self.import_json(path)
+        return self.import_csv(path)
+
+
+def write_records(records: List[StartupRecord], output, fmt: str):
+    """Write records to an open file as csv, json or a plain table"""
+    if fmt == 'csv':
+        writer = csv.DictWriter(output, fieldnames=list(RECORD_FIELDS))
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record.to_dict())
+    elif fmt == 'json':
+        json.dump(records_to_dicts(records), output, indent=2, ensure_ascii=False)
+        output.write('\n')
+    else:
+        for record in records:
+            output.write(f"{record.confidence:2d}  {record.url}  "
+                         f"({record.method or 'Unknown'}, {record.country or 'Unknown'}, {record.source})\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line interface for importing, querying and exporting stored results"""
+    parser = argparse.ArgumentParser(description="Query the SQLite store of discovered startup URLs")
+    parser.add_argument('--db', default=DEFAULT_STORE_PATH, help="Path to the SQLite store")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="Import results.json / results.csv files")
+    import_parser.add_argument('files', nargs='+')
+
+    query_parser = subparsers.add_parser('query', help="Filter stored URLs")
+    query_parser.add_argument('--domain')
+    query_parser.add_argument('--min-confidence', type=int)
+    query_parser.add_argument('--max-confidence', type=int)
+    query_parser.add_argument('--method')
+    query_parser.add_argument('--category')
+    query_parser.add_argument('--country')
+    query_parser.add_argument('--source', dest='source_prefix', help="Source prefix, e.g. 'GitHub'")
+    query_parser.add_argument('--limit', type=int)
+    query_parser.add_argument('--format', choices=['table', 'csv', 'json'], default='table')
+    query_parser.add_argument('--output', help="Write to this file instead of stdout")
+
+    stats_parser = subparsers.add_parser('stats', help="Show counts per column")
+    stats_parser.add_argument('--by', default='method',
+                              choices=['confidence', 'method', 'category', 'country'])
+
+    args = parser.parse_args(argv)
+
+    with ResultStore(args.db) as store:
+        if args.command == 'import':
+            for path in args.files:
+                imported = store.import_file(path)
+                print(f"✅ Imported {imported} records from {path}")
+            print(f"📊 Store now holds {store.count()} URLs")
+
+        elif args.command == 'query':
+            records = store.query(
+                domain=args.domain, min_confidence=args.min_confidence,
+                max_confidence=args.max_confidence, method=args.method,
+                category=args.category, country=args.country,
+                source_prefix=args.source_prefix, limit=args.limit
+            )
+            if args.output:
+                with open(args.output, 'w', newline='', encoding='utf-8') as output:
+                    write_records(records, output, args.format)
+                print(f"📁 Exported {len(records)} records to {args.output}")
+            else:
+                write_records(records, sys.stdout, args.format)
+
+        elif args.command == 'stats':
+            print(f"📊 {store.count()} URLs by {args.by}:")
+            for value, count in store.counts_by(args.by).items():
+                print(f"  • {value}: {count}")
+
+
+if __name__ == "__main__":
+    main()
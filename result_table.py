@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+RESULT TABLE
+Columnar in-memory table of discovered startup URLs
+Integer-coded label columns and a compact confidence column, with filtering, sorting and group-by counts
+"""
+
+from array import array
+from collections import Counter
+from itertools import islice
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from startup_record import StartupRecord
+
+try:
+    import numpy as np
+except ImportError:  # Optional: the array-module fallback gives identical results, only slower
+    np = None
+
+# Low-cardinality text columns stored as integer codes into a label list
+LABEL_COLUMNS = ('source', 'category', 'country', 'method')
+
+# Confidence bands of the quality metrics: (name, lowest confidence, weight in the quality score)
+CONFIDENCE_BANDS = (('high_confidence', 8, 3), ('medium_confidence', 5, 2), ('low_confidence', None, 1))
+
+# Stored in the health_score column for records without one
+MISSING_SCORE = -1
+
+
+class ResultTable:
+    """One array per column instead of one object per record
+
+    Label columns hold ``int32`` codes into per-column label lists, in
+    order of first appearance; confidence is ``int8`` and health scores
+    ``int16``. URLs and company names stay plain lists. With NumPy
+    installed the columns are NumPy arrays and filtering, sorting and
+    group-by counts are vectorized; without it the same operations run
+    over ``array.array`` columns with identical results.
+
+    Tables are immutable: ``filter`` and ``sort_by`` return new tables
+    that share the label lists of the table they came from.
+    """
+
+    def __init__(self, urls: List[str], confidence, codes: Dict[str, object], labels: Dict[str, List[Optional[str]]],
+                 health_scores, company_names: List[Optional[str]]):
+        self.urls = urls
+        self.confidence = confidence
+        self.codes = codes
+        self.labels = labels
+        self.health_scores = health_scores
+        self.company_names = company_names
+
+    @classmethod
+    def from_records(cls, records: Iterable[StartupRecord], chunk_size: int = 50000) -> 'ResultTable':
+        """Build a table from records (a list, a generator or a store cursor), a chunk at a time"""
+        urls: List[str] = []
+        company_names: List[Optional[str]] = []
+        confidence = array('b')
+        health_scores = array('h')
+        codes = {column: array('i') for column in LABEL_COLUMNS}
+        lookups: Dict[str, Dict[Optional[str], int]] = {column: {} for column in LABEL_COLUMNS}
+
+        iterator = iter(records)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            urls.extend(map(attrgetter('url'), chunk))
+            company_names.extend(map(attrgetter('company_name'), chunk))
+            confidence.extend(map(attrgetter('confidence'), chunk))
+            health_scores.extend(MISSING_SCORE if record.health_score is None else record.health_score
+                                 for record in chunk)
+            for column in LABEL_COLUMNS:
+                # setdefault hands out the next code to labels not seen before, so codes follow first appearance
+                lookup = lookups[column]
+                codes[column].extend([lookup.setdefault(value, len(lookup)) for value in map(attrgetter(column), chunk)])
+
+        labels = {column: list(lookup) for column, lookup in lookups.items()}
+        if np is not None:
+            confidence = np.array(confidence, dtype=np.int8)
+            health_scores = np.array(health_scores, dtype=np.int16)
+            codes = {column: np.array(values, dtype=np.int32) for column, values in codes.items()}
+        return cls(urls, confidence, codes, labels, health_scores, company_names)
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def _take(self, positions) -> 'ResultTable':
+        """New table with the rows at ``positions``, in that order"""
+        if np is not None:
+            positions = np.asarray(positions, dtype=np.intp)
+            urls = [self.urls[position] for position in positions.tolist()]
+            names = [self.company_names[position] for position in positions.tolist()]
+            return ResultTable(urls, self.confidence[positions],
+                               {column: codes[positions] for column, codes in self.codes.items()},
+                               self.labels, self.health_scores[positions], names)
+        return ResultTable(
+            [self.urls[position] for position in positions],
+            array('b', (self.confidence[position] for position in positions)),
+            {column: array('i', (codes[position] for position in positions)) for column, codes in self.codes.items()},
+            self.labels,
+            array('h', (self.health_scores[position] for position in positions)),
+            [self.company_names[position] for position in positions]
+        )
+
+    def filter(self, min_confidence: Optional[int] = None, max_confidence: Optional[int] = None,
+               **label_values: Optional[str]) -> 'ResultTable':
+        """Rows within the confidence range whose labels equal every given value
+
+        ``table.filter(min_confidence=8, country='Germany')``
+        """
+        unknown = [column for column in label_values if column not in LABEL_COLUMNS]
+        if unknown:
+            raise ValueError(f"Cannot filter on {', '.join(unknown)} (label columns: {', '.join(LABEL_COLUMNS)})")
+        wanted = {}
+        for column, value in label_values.items():
+            if value not in self.labels[column]:
+                return self._take([])
+            wanted[column] = self.labels[column].index(value)
+
+        if np is not None:
+            mask = np.ones(len(self), dtype=bool)
+            if min_confidence is not None:
+                mask &= self.confidence >= min_confidence
+            if max_confidence is not None:
+                mask &= self.confidence <= max_confidence
+            for column, code in wanted.items():
+                mask &= self.codes[column] == code
+            return self._take(np.flatnonzero(mask))
+
+        low = min_confidence if min_confidence is not None else float('-inf')
+        high = max_confidence if max_confidence is not None else float('inf')
+        return self._take([
+            position for position, confidence in enumerate(self.confidence)
+            if low <= confidence <= high
+            and all(self.codes[column][position] == code for column, code in wanted.items())
+        ])
+
+    def sort_by(self, column: str = 'confidence', descending: bool = False) -> 'ResultTable':
+        """Rows ordered by one column; stable, so equal keys keep their current order
+
+        Label columns sort by label text, with unset labels first.
+        """
+        if column == 'confidence':
+            keys = self.confidence
+        elif column in LABEL_COLUMNS:
+            labels = self.labels[column]
+            ordered = sorted(range(len(labels)), key=lambda code: (labels[code] is not None, labels[code] or ''))
+            ranks = [0] * len(labels)
+            for rank, code in enumerate(ordered):
+                ranks[code] = rank
+            keys = (np.array(ranks, dtype=np.int32)[self.codes[column]] if np is not None
+                    else array('i', (ranks[code] for code in self.codes[column])))
+        else:
+            raise ValueError(f"Cannot sort by {column} (sortable: confidence, {', '.join(LABEL_COLUMNS)})")
+
+        if np is not None:
+            keys = keys.astype(np.int32)
+            return self._take(np.argsort(-keys if descending else keys, kind='stable'))
+        return self._take(sorted(range(len(self)), key=lambda position: -keys[position] if descending else keys[position]))
+
+    def value_counts(self, column: str, missing: str = 'Unknown') -> Dict:
+        """Rows per value of a column, in order of first appearance
+
+        Unset and empty labels are counted under ``missing``.
+        """
+        if column == 'confidence':
+            values, labels = self.confidence, None
+        elif column in LABEL_COLUMNS:
+            values, labels = self.codes[column], self.labels[column]
+        else:
+            raise ValueError(f"Cannot count {column} (countable: confidence, {', '.join(LABEL_COLUMNS)})")
+
+        if np is not None:
+            if not len(values):
+                return {}
+            distinct, first, totals = np.unique(values, return_index=True, return_counts=True)
+            order = np.argsort(first, kind='stable')
+            pairs = zip(distinct[order].tolist(), totals[order].tolist())
+        else:
+            pairs = Counter(values).items()  # Counter keeps first-appearance order
+
+        counts: Dict = {}
+        for value, total in pairs:
+            key = value if labels is None else (labels[value] or missing)
+            counts[key] = counts.get(key, 0) + total
+        return counts
+
+    def summary(self) -> Dict:
+        """Totals, group-by counts and quality metrics of the table"""
+        confidence_distribution = self.value_counts('confidence')
+        bands = {name: 0 for name, _, _ in CONFIDENCE_BANDS}
+        for confidence, total in confidence_distribution.items():
+            name = next(name for name, lowest, _ in CONFIDENCE_BANDS if lowest is None or confidence >= lowest)
+            bands[name] += total
+        weighted = sum(bands[name] * weight for name, _, weight in CONFIDENCE_BANDS)
+        return {
+            'total_urls': len(self),
+            'method_counts': self.value_counts('method'),
+            'confidence_distribution': confidence_distribution,
+            'category_counts': self.value_counts('category'),
+            'country_counts': self.value_counts('country'),
+            'quality_metrics': {**bands, 'quality_score': weighted / len(self) if len(self) else 0}
+        }
+
+    def records(self) -> Iterator[StartupRecord]:
+        """Rows as StartupRecords, in table order"""
+        confidence = self.confidence.tolist()
+        health_scores = self.health_scores.tolist()
+        codes = {column: values.tolist() for column, values in self.codes.items()}
+        for position, url in enumerate(self.urls):
+            health_score = health_scores[position]
+            yield StartupRecord(
+                url=url,
+                source=self.labels['source'][codes['source'][position]],
+                confidence=confidence[position],
+                category=self.labels['category'][codes['category'][position]],
+                country=self.labels['country'][codes['country'][position]],
+                method=self.labels['method'][codes['method'][position]],
+                health_score=None if health_score == MISSING_SCORE else health_score,
+                company_name=self.company_names[position]
+            )
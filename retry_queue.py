@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+RETRY QUEUE
+Persistent queue of discovery units that failed, with exponential backoff
+Failed directory pages, searches and whole sources are retried later in the run and carried over to the next one
+"""
+
+import json
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_RETRY_PATH = 'discovery_retries.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS retries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    unit_key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error_class TEXT,
+    error TEXT,
+    first_failed REAL NOT NULL,
+    last_failed REAL NOT NULL,
+    next_eligible REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_retries_due ON retries(status, next_eligible);
+"""
+
+# Client error statuses worth retrying (timeouts, rate limits); any other 4xx fails the same way every time
+TRANSIENT_HTTP_STATUSES = (408, 425, 429)
+
+
+def is_permanent(error: Exception) -> bool:
+    """Whether retrying cannot help: client errors other than timeouts and rate limits, non-HTML pages"""
+    import requests
+
+    from page_stream import UnsupportedContentType
+
+    if isinstance(error, UnsupportedContentType):
+        return True
+    response = getattr(error, 'response', None)
+    if isinstance(error, requests.HTTPError) and response is not None:
+        return 400 <= response.status_code < 500 and response.status_code not in TRANSIENT_HTTP_STATUSES
+    return False
+
+
+def unit_key(kind: str, payload: Dict) -> str:
+    """Identity of a unit of work; the same key as the JobQueue uses"""
+    return f"{kind}:{json.dumps(payload, sort_keys=True)}"
+
+
+class RetryUnit:
+    """A failed unit of discovery work waiting for its next attempt"""
+
+    def __init__(self, kind: str, payload: Dict, attempts: int, error_class: str, error: str,
+                 next_eligible: float, status: str = 'pending'):
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+        self.error_class = error_class
+        self.error = error
+        self.next_eligible = next_eligible
+        self.status = status
+
+    def __repr__(self) -> str:
+        return f"RetryUnit({self.kind!r}, {self.payload!r}, attempts={self.attempts}, {self.error_class})"
+
+
+class ManualClock:
+    """Clock that only moves when slept on, for runs that must retry identically (record/replay)"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += max(seconds, 0)
+
+
+class RetryQueue:
+    """Failed units stored in SQLite until they succeed or run out of attempts
+
+    A unit that fails for the n-th time becomes eligible again after
+    ``base_delay * 2 ** (n - 1)`` seconds (capped at ``max_delay``); after
+    ``max_attempts`` failures, or one permanent failure (see
+    ``is_permanent``), it is kept as 'gave_up' for inspection and never
+    handed out again. A unit that succeeds is removed.
+
+    ``path=None`` keeps the queue in memory for a single run.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_RETRY_PATH, max_attempts: int = 5, base_delay: float = 5.0,
+                 max_delay: float = 3600.0, clock=time.time):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.conn = sqlite3.connect(path or ':memory:', timeout=30, isolation_level=None)
+        self.conn.execute('PRAGMA busy_timeout = 30000')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds to wait after a unit's ``attempts``-th failure"""
+        return min(self.base_delay * 2 ** max(attempts - 1, 0), self.max_delay)
+
+    def record_failure(self, kind: str, payload: Dict, error: Exception) -> RetryUnit:
+        """Add a failed unit, or count another failure of one already queued"""
+        now = self.clock()
+        attempts = self.attempts(kind, payload) + 1
+        status = 'gave_up' if attempts >= self.max_attempts or is_permanent(error) else 'pending'
+        next_eligible = now + self.backoff(attempts)
+        self.conn.execute(
+            """INSERT INTO retries (unit_key, kind, payload, status, attempts, error_class, error,
+                                    first_failed, last_failed, next_eligible)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(unit_key) DO UPDATE SET
+                   status = excluded.status, attempts = excluded.attempts,
+                   error_class = excluded.error_class, error = excluded.error,
+                   last_failed = excluded.last_failed, next_eligible = excluded.next_eligible""",
+            (unit_key(kind, payload), kind, json.dumps(payload, ensure_ascii=False), status, attempts,
+             type(error).__name__, str(error), now, now, next_eligible)
+        )
+        return RetryUnit(kind, payload, attempts, type(error).__name__, str(error), next_eligible, status)
+
+    def resolve(self, kind: str, payload: Dict):
+        """Drop a unit that has now succeeded, if it was queued"""
+        self.conn.execute('DELETE FROM retries WHERE unit_key = ?', (unit_key(kind, payload),))
+
+    def attempts(self, kind: str, payload: Dict) -> int:
+        """Failures recorded for a unit so far, 0 when it is not queued"""
+        row = self.conn.execute(
+            'SELECT attempts FROM retries WHERE unit_key = ?', (unit_key(kind, payload),)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _units(self, where: str, params=()) -> List[RetryUnit]:
+        rows = self.conn.execute(
+            f"""SELECT kind, payload, attempts, error_class, error, next_eligible, status FROM retries
+                WHERE {where} ORDER BY next_eligible, id""",
+            params
+        )
+        return [RetryUnit(kind, json.loads(payload), attempts, error_class, error, next_eligible, status)
+                for kind, payload, attempts, error_class, error, next_eligible, status in rows]
+
+    def due(self) -> List[RetryUnit]:
+        """Pending units whose backoff has passed, earliest first"""
+        return self._units("status = 'pending' AND next_eligible <= ?", (self.clock(),))
+
+    def pending(self) -> List[RetryUnit]:
+        """Every pending unit, due or still backing off"""
+        return self._units("status = 'pending'")
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Time until the next pending unit becomes due, None when nothing is pending"""
+        row = self.conn.execute("SELECT MIN(next_eligible) FROM retries WHERE status = 'pending'").fetchone()
+        return None if row[0] is None else max(row[0] - self.clock(), 0.0)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of units per status"""
+        return dict(self.conn.execute('SELECT status, COUNT(*) FROM retries GROUP BY status'))
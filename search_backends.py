@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+SEARCH BACKENDS
+Pluggable web search providers with concurrent fan-out
+Google HTML, DuckDuckGo HTML and SearxNG-style JSON endpoints; blocked providers are disabled automatically
+"""
+
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from serp_extractor import clean_result_url, extract_serp_urls
+
+DEFAULT_BACKENDS = ['google', 'duckduckgo']
+
+
+class SearchBlocked(Exception):
+    """Raised when a provider answers with a CAPTCHA or rate-limit page"""
+
+
+class SearchBackend(ABC):
+    """One search provider: builds the request, detects blocking and parses results"""
+
+    name = 'backend'
+    blocked_markers: List[str] = []
+
+    def __init__(self, session, timeout: float = 15):
+        self.session = session
+        self.timeout = timeout
+        self.disabled = False
+        self.consecutive_errors = 0
+
+    @abstractmethod
+    def fetch(self, query: str, num_results: int):
+        """Send the search request and return the response"""
+
+    @abstractmethod
+    def parse(self, response) -> List[str]:
+        """Result URLs of a response that is not a block page"""
+
+    def is_blocked(self, response) -> bool:
+        """Whether the response is a CAPTCHA / rate-limit page rather than results"""
+        if response.status_code == 429:
+            return True
+        text = response.text.lower()
+        return any(marker in text for marker in self.blocked_markers)
+
+    def search(self, query: str, num_results: int = 20) -> List[str]:
+        """Return result URLs for a query, raising SearchBlocked when challenged"""
+        response = self.fetch(query, num_results)
+        if self.is_blocked(response):
+            raise SearchBlocked(f"{self.name} returned a CAPTCHA or rate-limit page")
+        response.raise_for_status()
+        return self.parse(response)
+
+
+class GoogleHtmlBackend(SearchBackend):
+    name = 'google'
+    blocked_markers = ['unusual traffic from your computer', 'id="captcha-form"', 'g-recaptcha']
+
+    def fetch(self, query: str, num_results: int):
+        return self.session.get('https://www.google.com/search',
+                                params={'q': query, 'num': num_results}, timeout=self.timeout)
+
+    def is_blocked(self, response) -> bool:
+        return '/sorry/' in response.url or super().is_blocked(response)
+
+    def parse(self, response) -> List[str]:
+        return extract_serp_urls(response.text)
+
+
+class _DuckDuckGoParser(HTMLParser):
+    """Collects ``a.result__a`` links from the DuckDuckGo HTML endpoint"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.hrefs: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            attributes = dict(attrs)
+            if 'result__a' in (attributes.get('class') or '').split() and attributes.get('href'):
+                self.hrefs.append(attributes['href'])
+
+
+class DuckDuckGoHtmlBackend(SearchBackend):
+    name = 'duckduckgo'
+    blocked_markers = ['anomaly-modal', 'please complete the following challenge']
+
+    def fetch(self, query: str, num_results: int):
+        return self.session.get('https://html.duckduckgo.com/html/', params={'q': query}, timeout=self.timeout)
+
+    def parse(self, response) -> List[str]:
+        parser = _DuckDuckGoParser()
+        parser.feed(response.text)
+        urls = []
+        for href in parser.hrefs:
+            parsed = urlparse(href)
+            # Results are wrapped as //duckduckgo.com/l/?uddg=TARGET
+            if parsed.path == '/l/':
+                href = (parse_qs(parsed.query).get('uddg') or [''])[0]
+            url = clean_result_url(href)
+            if url and url not in urls:
+                urls.append(url)
+        return urls
+
+
+class SearxngBackend(SearchBackend):
+    """SearxNG (or any compatible) instance answering /search?format=json"""
+
+    name = 'searxng'
+
+    def __init__(self, session, base_url: str = 'http://localhost:8888', timeout: float = 15):
+        super().__init__(session, timeout)
+        self.base_url = base_url.rstrip('/')
+
+    def fetch(self, query: str, num_results: int):
+        return self.session.get(f"{self.base_url}/search",
+                                params={'q': query, 'format': 'json'}, timeout=self.timeout)
+
+    def is_blocked(self, response) -> bool:
+        return response.status_code == 429
+
+    def parse(self, response) -> List[str]:
+        urls = []
+        for result in response.json().get('results', []):
+            url = clean_result_url(result.get('url', ''))
+            if url and url not in urls:
+                urls.append(url)
+        return urls
+
+
+def create_backend(spec: str, session) -> SearchBackend:
+    """Build a backend from 'google', 'duckduckgo' or 'searxng=http://host:port'"""
+    name, _, argument = spec.partition('=')
+    name = name.strip().lower()
+    if name == 'google':
+        return GoogleHtmlBackend(session)
+    if name == 'duckduckgo':
+        return DuckDuckGoHtmlBackend(session)
+    if name == 'searxng':
+        return SearxngBackend(session, argument or 'http://localhost:8888')
+    raise ValueError(f"Unknown search backend '{name}' (available: google, duckduckgo, searxng=URL)")
+
+
+class SearchFanout:
+    """Queries every enabled backend concurrently and keeps the first distinct results
+
+    In the default mode results are merged in completion order and the call
+    returns as soon as ``max_results`` distinct URLs are in, so one slow or
+    blocked provider no longer stalls a query. With ``deterministic=True``
+    (used for record/replay runs) all backends are awaited and merged in
+    configuration order, so the output does not depend on timing.
+    """
+
+    def __init__(self, backends: List[SearchBackend], max_results: int = 15,
+                 max_consecutive_errors: int = 3, deterministic: bool = False):
+        self.backends = backends
+        self.max_results = max_results
+        self.max_consecutive_errors = max_consecutive_errors
+        self.deterministic = deterministic
+        self.executor: Optional[ThreadPoolExecutor] = None  # Started on the first search, stopped by close()
+        self.stats: Dict[str, Dict[str, int]] = {
+            backend.name: {'queries': 0, 'failures': 0, 'results': 0} for backend in backends
+        }
+
+    @property
+    def active_backends(self) -> List[SearchBackend]:
+        return [backend for backend in self.backends if not backend.disabled]
+
+    def _run_backend(self, backend: SearchBackend, query: str, num_results: int) -> List[str]:
+        self.stats[backend.name]['queries'] += 1
+        try:
+            urls = backend.search(query, num_results)
+        except SearchBlocked as e:
+            backend.disabled = True
+            self.stats[backend.name]['failures'] += 1
+            print(f"  🚫 Disabling {backend.name}: {str(e)}")
+            raise
+        except Exception as e:
+            self.stats[backend.name]['failures'] += 1
+            backend.consecutive_errors += 1
+            if backend.consecutive_errors >= self.max_consecutive_errors:
+                backend.disabled = True
+                print(f"  🚫 Disabling {backend.name} after {backend.consecutive_errors} consecutive errors")
+            raise
+        backend.consecutive_errors = 0
+        self.stats[backend.name]['results'] += len(urls)
+        return urls
+
+    def search(self, query: str, num_results: int = 20) -> List[str]:
+        """Distinct result URLs from all active backends; raises if every backend failed"""
+        backends = self.active_backends
+        if not backends:
+            raise SearchBlocked("All search backends are disabled")
+
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=max(len(self.backends), 1), thread_name_prefix='search')
+        futures = {self.executor.submit(self._run_backend, backend, query, num_results): backend
+                   for backend in backends}
+        results: Dict[str, List[str]] = {}
+        errors = []
+        merged: List[str] = []
+        seen = set()
+
+        def merge(urls: List[str]):
+            for url in urls:
+                if url not in seen and len(merged) < self.max_results:
+                    seen.add(url)
+                    merged.append(url)
+
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                backend = futures[future]
+                try:
+                    results[backend.name] = future.result()
+                except Exception as e:
+                    errors.append(f"{backend.name}: {str(e)}")
+                    continue
+                if not self.deterministic:
+                    merge(results[backend.name])
+            if not self.deterministic and len(merged) >= self.max_results:
+                break  # First N distinct results win; slower backends finish in the background
+
+        if self.deterministic:
+            for backend in backends:
+                merge(results.get(backend.name, []))
+
+        if not results:
+            raise SearchBlocked("; ".join(errors) or "No search backend answered")
+        return merged
+
+    def close(self):
+        """Stop the worker threads; a later search starts new ones"""
+        if self.executor is not None:
+            # Backends still running after an early return finish in the background
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
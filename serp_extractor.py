@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+SERP EXTRACTOR
+Single-pass extraction of organic result URLs from search result pages
+Decodes Google /url?q= redirect wrappers and keeps legitimate query strings intact
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from html.parser import HTMLParser
+from typing import List, Optional
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlparse, urlunparse
+
+# Query parameters added by search engines for click tracking
+TRACKING_PARAMS = {'sa', 'ved', 'usg', 'ei', 'oq', 'gs_lcp', 'sclient', 'rct', 'cd', 'cad', 'uact'}
+TRACKING_PREFIXES = ('utm_',)
+
+# Classes of the containers that wrap one organic result
+RESULT_CONTAINER_CLASSES = {'g', 'r'}
+
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'serp_fixtures')
+
+
+def decode_result_href(href: str) -> Optional[str]:
+    """Turn a result link into the target URL, unwrapping redirect links"""
+    if not href:
+        return None
+    parsed = urlparse(href)
+
+    # Redirect wrappers: /url?q=TARGET&sa=... or https://www.google.de/url?url=TARGET
+    is_google_host = not parsed.netloc or 'google.' in parsed.netloc
+    if parsed.path == '/url' and is_google_host:
+        params = parse_qs(parsed.query)
+        target = (params.get('q') or params.get('url') or [None])[0]
+        if not target:
+            return None
+        return clean_result_url(target)
+
+    if parsed.scheme not in ('http', 'https'):
+        return None
+    return clean_result_url(href)
+
+
+def clean_result_url(url: str) -> Optional[str]:
+    """Drop tracking parameters and text-fragment anchors but keep real query strings"""
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+        return None
+    params = parse_qsl(parsed.query, keep_blank_values=True)
+    kept = [
+        (key, value) for key, value in params
+        if key not in TRACKING_PARAMS and not key.startswith(TRACKING_PREFIXES)
+    ]
+    text_fragment = parsed.fragment.startswith(':~:')
+    if len(kept) == len(params) and not text_fragment:
+        return url
+    query = urlencode(kept, doseq=True) if len(kept) != len(params) else parsed.query
+    fragment = '' if text_fragment else parsed.fragment
+    return urlunparse(parsed._replace(query=query, fragment=fragment))
+
+
+class SerpParser(HTMLParser):
+    """Streaming parser that collects result links in one walk over the document
+
+    A link counts as a result when it sits inside a result container
+    (``div.g``/``div.r``), inside an ``<h3>``, or wraps an ``<h3>`` — the same
+    cases the old CSS selectors covered.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.urls: List[str] = []
+        self.seen = set()
+        self.div_stack: List[bool] = []
+        self.container_depth = 0
+        self.h3_depth = 0
+        self.anchor_href: Optional[str] = None
+        self.anchor_is_result = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'div':
+            classes = set((dict(attrs).get('class') or '').split())
+            is_container = bool(classes & RESULT_CONTAINER_CLASSES)
+            self.div_stack.append(is_container)
+            self.container_depth += is_container
+        elif tag == 'h3':
+            self.h3_depth += 1
+            if self.anchor_href is not None:
+                self.anchor_is_result = True
+        elif tag == 'a':
+            self.anchor_href = dict(attrs).get('href')
+            self.anchor_is_result = self.container_depth > 0 or self.h3_depth > 0
+
+    def handle_endtag(self, tag):
+        if tag == 'div' and self.div_stack:
+            self.container_depth -= self.div_stack.pop()
+        elif tag == 'h3' and self.h3_depth:
+            self.h3_depth -= 1
+        elif tag == 'a' and self.anchor_href is not None:
+            if self.anchor_is_result:
+                self.add(self.anchor_href)
+            self.anchor_href = None
+            self.anchor_is_result = False
+
+    def add(self, href: str):
+        url = decode_result_href(href)
+        if url and url not in self.seen:
+            self.seen.add(url)
+            self.urls.append(url)
+
+
+def extract_serp_urls(html: str) -> List[str]:
+    """Return the distinct result URLs of a search result page, in page order"""
+    parser = SerpParser()
+    parser.feed(html)
+    parser.close()
+    return parser.urls
+
+
+def _legacy_extract(html: str) -> List[str]:
+    """The previous four-selector BeautifulSoup extraction, for benchmarking"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    urls = []
+    for selector in ['div.g a[href^="http"]', 'div.r a[href^="http"]', 'h3 a[href^="http"]', 'a[href^="http"]:has(h3)']:
+        for link in soup.select(selector):
+            clean_url = link.get('href').split('&')[0]
+            if clean_url not in urls:
+                urls.append(clean_url)
+    return urls
+
+
+def validate_fixtures(fixture_dir: str, rounds: int = 20) -> bool:
+    """Check the extractor against saved SERPs (NAME.html + NAME.expected.json) and time it"""
+    ok = True
+    fixtures = sorted(glob.glob(os.path.join(fixture_dir, '*.html')))
+    if not fixtures:
+        print(f"⚠️ No SERP fixtures found in {fixture_dir}")
+        return False
+
+    for html_path in fixtures:
+        expected_path = html_path[:-len('.html')] + '.expected.json'
+        with open(html_path, encoding='utf-8') as html_file:
+            html = html_file.read()
+        with open(expected_path, encoding='utf-8') as expected_file:
+            expected = json.load(expected_file)
+
+        urls = extract_serp_urls(html)
+        name = os.path.basename(html_path)
+        if urls == expected:
+            print(f"✅ {name}: {len(urls)} URLs match")
+        else:
+            ok = False
+            print(f"❌ {name}: extracted {len(urls)} URLs, expected {len(expected)}")
+            for url in urls:
+                if url not in expected:
+                    print(f"    + {url}")
+            for url in expected:
+                if url not in urls:
+                    print(f"    - {url}")
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            extract_serp_urls(html)
+        single_pass = (time.perf_counter() - started) / rounds
+        try:
+            started = time.perf_counter()
+            for _ in range(rounds):
+                _legacy_extract(html)
+            legacy = (time.perf_counter() - started) / rounds
+            print(f"    ⏱️ {single_pass * 1000:.2f} ms single pass vs {legacy * 1000:.2f} ms with CSS selectors")
+        except ImportError:
+            print(f"    ⏱️ {single_pass * 1000:.2f} ms single pass")
+
+    return ok
+
+
+def main(argv: Optional[List[str]] = None):
+    """Validate the extractor against the saved SERP fixture corpus"""
+    parser = argparse.ArgumentParser(description="Validate SERP extraction against saved result pages")
+    parser.add_argument('fixture_dir', nargs='?', default=DEFAULT_FIXTURE_DIR)
+    parser.add_argument('--rounds', type=int, default=20, help="Timing repetitions per fixture")
+    args = parser.parse_args(argv)
+    raise SystemExit(0 if validate_fixtures(args.fixture_dir, args.rounds) else 1)
+
+
+if __name__ == "__main__":
+    main()
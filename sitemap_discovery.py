@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+SITEMAP DISCOVERY
+Enumerates startup directory profiles from the directories' sitemaps instead of paging through listing HTML
+Sitemaps are found via robots.txt, may be gzipped or nested indexes, and are parsed with a streaming iterparse
+"""
+
+import gzip
+import io
+import re
+import time
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlparse
+
+from http_session import create_session
+from link_graph import is_excluded
+from page_stream import LinkStream, iter_body
+from seed_corpus import SeedCorpus, get_seed_corpus
+from startup_record import StartupRecord, extract_domain
+
+# Directories enumerated through their sitemaps
+#   sitemap_pattern: child sitemaps of an index worth following (None follows all)
+#   entry_pattern: URLs that are company profiles or articles
+#   links_per_entry: external links taken from each profile page as company websites
+SITEMAP_DIRECTORIES = [
+    {
+        'site': 'https://www.startbase.de',
+        'name': 'Startbase',
+        'sitemap_pattern': r'organi[sz]ation|compan|startup',
+        'entry_pattern': r'/(?:organization|organisation|company|startup)s?/',
+        'links_per_entry': 1
+    },
+    {
+        'site': 'https://www.deutsche-startups.de',
+        'name': 'Deutsche Startups',
+        'sitemap_pattern': r'post',
+        'entry_pattern': r'/\d{4}/\d{2}/\d{2}/',
+        'links_per_entry': 3
+    }
+]
+
+# Slugs of healthcare profiles and articles
+HEALTHCARE_PATTERN = re.compile(
+    r'health|medi[cz]|medtech|med[-_]|care(?!er)|clinic|klinik|pharma|therap|doctor|doc[-_]|arzt|aerzt|patient|'
+    r'pflege|diagnos|dental|zahn|praxis|gesund|vital|nurs',
+    re.IGNORECASE
+)
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _local_name(tag: str) -> str:
+    """Tag name without its XML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+class ChunkReader(io.RawIOBase):
+    """File-like view of an iterator of byte chunks, so parsers can pull a streamed body"""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self.chunks = chunks
+        self.pending = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self.pending:
+            self.pending = next(self.chunks, b'')
+            if not self.pending:
+                return 0
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+
+def iter_sitemap(stream) -> Iterator[Tuple[str, str]]:
+    """Yield ('sitemap', url) for index entries and ('url', url) for page entries
+
+    Elements are cleared as soon as their <loc> is read, so memory stays
+    constant however many entries the sitemap lists.
+    """
+    root = None
+    for event, element in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            continue
+        name = _local_name(element.tag)
+        if name in ('sitemap', 'url'):
+            loc = next((child.text for child in element if _local_name(child.tag) == 'loc'), None)
+            if loc and loc.strip():
+                yield name, loc.strip()
+            root.clear()
+
+
+class SitemapDiscovery:
+    """Lists healthcare company profiles from directory sitemaps and reads the company websites off them"""
+
+    def __init__(self, session=None, seed_corpus: Optional[SeedCorpus] = None, max_sitemaps: int = 20,
+                 max_profiles: int = 60, max_sitemap_bytes: int = 50 * 1024 * 1024):
+        self.session = session or create_session()
+        self.seed_corpus = seed_corpus or get_seed_corpus()
+        self.delay = 1  # Between profile pages; they all live on the directory's own host
+        self.retry_queue = None  # RetryQueue that failed profile pages are handed to, if any
+        self.max_sitemaps = max_sitemaps  # Sitemap files read per directory
+        self.max_profiles = max_profiles  # Profile pages read per directory
+        self.max_sitemap_bytes = max_sitemap_bytes  # The sitemap protocol's limit for one uncompressed file
+        self.profiles: Dict[str, List[str]] = {}  # Directory name -> healthcare profile URLs listed
+
+    def find_sitemaps(self, site: str) -> List[str]:
+        """Sitemap URLs announced in robots.txt, else the conventional locations"""
+        try:
+            response = self.session.get(urljoin(site, '/robots.txt'), timeout=10)
+            if response.status_code == 200:
+                sitemaps = [
+                    line.split(':', 1)[1].strip() for line in response.text.splitlines()
+                    if line.lower().startswith('sitemap:')
+                ]
+                if sitemaps:
+                    return sitemaps
+        except Exception as e:
+            print(f"⚠️ robots.txt of {site}: {str(e)}")
+        return [urljoin(site, '/sitemap_index.xml'), urljoin(site, '/sitemap.xml')]
+
+    def read_sitemap(self, url: str) -> Iterator[Tuple[str, str]]:
+        """Stream the entries of one sitemap file, gunzipping it when it is compressed"""
+        with self.session.get(url, timeout=30, stream=True) as response:
+            if response.status_code != 200:
+                return
+            reader = io.BufferedReader(ChunkReader(iter_body(response, self.max_sitemap_bytes)))
+            stream = gzip.GzipFile(fileobj=reader) if reader.peek(2)[:2] == GZIP_MAGIC else reader
+            try:
+                yield from iter_sitemap(stream)
+            except (ET.ParseError, OSError, EOFError) as e:
+                # Truncated at the byte cap or not XML at all: keep what was parsed
+                print(f"⚠️ Sitemap {url}: {str(e)}")
+
+    def list_profiles(self, directory: Dict, raise_errors: bool = False) -> List[str]:
+        """Walk a directory's sitemaps (nested indexes included) and keep healthcare profile URLs
+        
+        A sitemap that fails to load is reported and skipped; with
+        ``raise_errors`` the error is raised instead.
+        """
+        sitemap_pattern = re.compile(directory['sitemap_pattern']) if directory.get('sitemap_pattern') else None
+        entry_pattern = re.compile(directory['entry_pattern'])
+        queue = self.find_sitemaps(directory['site'])
+        seen = set(queue)
+        profiles = []
+        listed = set()  # The same profile is often listed in several sitemaps
+        read = 0
+        while queue and read < self.max_sitemaps and not self.session.budget_exhausted:
+            sitemap = queue.pop(0)
+            read += 1
+            try:
+                for kind, loc in self.read_sitemap(sitemap):
+                    if kind == 'sitemap':
+                        if loc not in seen and (sitemap_pattern is None or sitemap_pattern.search(loc)):
+                            seen.add(loc)
+                            queue.append(loc)
+                        continue
+                    # Slice off scheme and host by hand: urlparse per entry dominates large sitemaps
+                    path = loc[loc.find('/', loc.find('//') + 2):]
+                    if loc not in listed and entry_pattern.search(path) and HEALTHCARE_PATTERN.search(path):
+                        listed.add(loc)
+                        profiles.append(loc)
+            except Exception as e:
+                if raise_errors:
+                    raise
+                print(f"⚠️ Sitemap {sitemap}: {str(e)}")
+        print(f"🗺️ {directory['name']}: {len(profiles)} healthcare entries in {read} sitemaps")
+        return profiles
+
+    def company_links(self, profile_url: str, directory: Dict, raise_errors: bool = False) -> List[str]:
+        """External company websites linked from a profile page
+        
+        A failed page is reported and queued for a retry; with
+        ``raise_errors`` the error is raised instead, for callers that track
+        failures themselves (job runners).
+        """
+        directory_domain = extract_domain(profile_url)
+        websites = []
+        try:
+            with LinkStream(self.session, profile_url, timeout=10) as links:
+                for href in links:
+                    parsed = urlparse(href)
+                    domain = extract_domain(href)
+                    if parsed.scheme not in ('http', 'https') or not domain or domain == directory_domain:
+                        continue
+                    if is_excluded(domain) or domain.endswith('.' + directory_domain):
+                        continue
+                    website = f"https://{parsed.netloc}"
+                    if website not in websites:
+                        websites.append(website)
+                        if len(websites) >= directory['links_per_entry']:
+                            break
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"⚠️ Error reading {directory['name']} profile {profile_url}: {str(e)}")
+            if self.retry_queue is not None:
+                self.retry_queue.record_failure('sitemap_profile', {'url': profile_url, 'name': directory['name']}, e)
+        return websites
+
+    def profile_records(self, directory: Dict, profile_urls: List[str], seen: Set[str],
+                        raise_errors: bool = False) -> List[StartupRecord]:
+        """Company websites linked from profile pages, read one at a time with ``delay`` seconds between them"""
+        results = []
+        for position, profile_url in enumerate(profile_urls):
+            if self.session.budget_exhausted:
+                print(f"⏹️ Budget spent, stopping {directory['name']} profiles")
+                break
+            if position:
+                time.sleep(self.delay)
+            for website in self.company_links(profile_url, directory, raise_errors):
+                if website in seen or website in self.seed_corpus:
+                    continue
+                seen.add(website)
+                results.append(StartupRecord(
+                    url=website,
+                    source=f"Sitemap: {directory['name']}",
+                    confidence=7,
+                    category='Directory Listed'
+                ))
+        return results
+
+    def discover_from_sitemaps(self) -> List[StartupRecord]:
+        """Company websites of healthcare profiles listed in directory sitemaps"""
+        print("🔍 Enumerating directory sitemaps...")
+        results = []
+        seen = set()
+        for directory in SITEMAP_DIRECTORIES:
+            if self.session.budget_exhausted:
+                print(f"⏹️ Budget spent, skipping {directory['name']}")
+                break
+            results.extend(self.discover_directory(directory, seen))
+        return results
+
+    def discover_directory(self, directory: Dict, seen: Optional[Set[str]] = None,
+                           raise_errors: bool = False) -> List[StartupRecord]:
+        """Company websites of one directory's healthcare profiles (a worker job)
+        
+        With ``raise_errors`` a sitemap or profile page that fails to load
+        fails the whole directory instead of being skipped.
+        """
+        profiles = self.list_profiles(directory, raise_errors)
+        self.profiles[directory['name']] = profiles
+
+        selected = profiles[:self.max_profiles]
+        found = self.profile_records(directory, selected, set() if seen is None else seen, raise_errors)
+        print(f"✅ {directory['name']}: {len(found)} company websites from {len(selected)} profiles")
+        return found
+
+
+def get_sitemap_directory(name: str) -> Dict:
+    """The SITEMAP_DIRECTORIES entry of a directory"""
+    for directory in SITEMAP_DIRECTORIES:
+        if directory['name'] == name:
+            return directory
+    raise ValueError(f"Unknown sitemap directory '{name}'")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+STARTUP RECORD
+Compact shared record type for every discovered startup URL
+Used by all discovery classes and serialized to the existing CSV/JSON columns
+"""
+
+import sys
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+# Column order used by the CSV/JSON outputs
+RECORD_FIELDS = ('url', 'source', 'confidence', 'category', 'country', 'method', 'health_score', 'company_name')
+
+# Low-cardinality text fields that are interned so millions of records share one string object
+INTERNED_FIELDS = ('source', 'category', 'country', 'method')
+
+
+def extract_domain(url: str) -> str:
+    """Return the lowercased host of a URL without a leading 'www.'"""
+    domain = urlparse(url).netloc.lower().split('@')[-1].split(':')[0]
+    if domain.startswith('www.'):
+        domain = domain[4:]
+    return domain
+
+
+def normalize_url(url: str) -> str:
+    """Comparison key for a URL: host without 'www.', path without trailing slash, no scheme or fragment
+
+    ``http://www.acalta.de`` and ``https://acalta.de/`` map to the same key,
+    different paths on one host do not.
+    """
+    parsed = urlparse(url.strip())
+    key = extract_domain(url.strip()) + parsed.path.rstrip('/')
+    if parsed.query:
+        key += '?' + parsed.query
+    return key
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a low-cardinality label so equal labels share a single object"""
+    if value is None:
+        return None
+    return sys.intern(str(value))
+
+
+class StartupRecord:
+    """One discovered URL with its provenance and scores
+
+    Behaves like the plain dicts the discovery classes used to build
+    (``record['url']``, ``record.get('country', 'Unknown')``) so existing
+    callers keep working, but stores its fields in ``__slots__`` and interns
+    the repeated labels, which keeps per-record memory several times smaller.
+    Optional fields that were never set (``country``, ``method``,
+    ``health_score``, ``company_name``) are left out of ``to_dict()`` exactly like before.
+    """
+
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, url: str, source: str, confidence: int, category: str,
+                 country: Optional[str] = None, method: Optional[str] = None,
+                 health_score: Optional[int] = None, company_name: Optional[str] = None):
+        self.url = url
+        self.source = _intern(source)
+        self.confidence = int(confidence)
+        self.category = _intern(category)
+        self.country = _intern(country)
+        self.method = _intern(method)
+        self.health_score = health_score
+        self.company_name = company_name
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'StartupRecord':
+        """Build a record from a CSV row or JSON object with the standard columns"""
+        health_score = data.get('health_score')
+        if health_score in ('', None):
+            health_score = None
+        else:
+            health_score = int(health_score)
+        return cls(
+            url=data['url'],
+            source=data.get('source', ''),
+            confidence=int(data.get('confidence') or 0),
+            category=data.get('category', ''),
+            country=data.get('country') or None,
+            method=data.get('method') or None,
+            health_score=health_score,
+            company_name=data.get('company_name') or None
+        )
+
+    def to_dict(self) -> Dict:
+        """Serialize to the existing CSV/JSON column layout"""
+        data = {}
+        for field in RECORD_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        return data
+
+    def copy(self) -> 'StartupRecord':
+        """Return a shallow copy of this record"""
+        return StartupRecord(self.url, self.source, self.confidence, self.category,
+                             self.country, self.method, self.health_score, self.company_name)
+
+    # Mapping-style access so code written against the old dict records keeps working
+
+    def __getitem__(self, key: str):
+        if key not in RECORD_FIELDS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value) -> None:
+        if key not in RECORD_FIELDS:
+            raise KeyError(key)
+        if key in INTERNED_FIELDS:
+            value = _intern(value)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in RECORD_FIELDS and getattr(self, key) is not None
+
+    def get(self, key: str, default=None):
+        """Return a field value, or ``default`` when the field is unset"""
+        if key not in RECORD_FIELDS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def keys(self) -> List[str]:
+        """Return the names of the fields that are set"""
+        return [field for field in RECORD_FIELDS if getattr(self, field) is not None]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, StartupRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in RECORD_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"StartupRecord({self.url!r}, source={self.source!r}, confidence={self.confidence})"
+
+
+def records_to_dicts(records: Iterable[StartupRecord]) -> List[Dict]:
+    """Serialize records for json.dump"""
+    return [record.to_dict() for record in records]
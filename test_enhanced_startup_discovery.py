@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for EnhancedStartupDiscovery result files
+Run with: python -m unittest test_enhanced_startup_discovery
+"""
+
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from enhanced_startup_discovery import EnhancedStartupDiscovery
+from startup_record import StartupRecord
+
+
+class SaveResultsTest(unittest.TestCase):
+    def test_saves_records_with_company_name(self):
+        record = StartupRecord(url='https://acme-health.de', source='Conference: MEDICA 2026', confidence=7,
+                               category='Conference Exhibitor', company_name='Acme Health GmbH')
+        discoverer = EnhancedStartupDiscovery(session=object())
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                csv_file, json_file = discoverer.save_results({'urls': [record]})
+                with open(csv_file, newline='', encoding='utf-8') as csv_input:
+                    rows = list(csv.DictReader(csv_input))
+                with open(json_file, encoding='utf-8') as json_input:
+                    saved = json.load(json_input)
+            finally:
+                os.chdir(cwd)
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['url'], 'https://acme-health.de')
+        self.assertEqual(rows[0]['company_name'], 'Acme Health GmbH')
+        self.assertEqual(rows[0]['country'], '')
+        self.assertEqual(saved['urls'][0]['company_name'], 'Acme Health GmbH')
+
+
+if __name__ == '__main__':
+    unittest.main()
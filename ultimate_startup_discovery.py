@@ -9,241 +9,498 @@ import json
 import csv
 import time
 from datetime import datetime
-from typing import List, Dict, Set
+from typing import AsyncIterator, Iterator, List, Dict, Optional, Set
 import sys
 import os
+import random
+from contextlib import contextmanager
 
-# Import discovery methods
-try:
-    from enhanced_startup_discovery import EnhancedStartupDiscovery
-    from google_search_scraper import GoogleSearchStartupFinder
-except ImportError as e:
-    print(f"⚠️ Import error: {e}")
-    print("Make sure all discovery modules are in the same directory")
-    sys.exit(1)
+import argparse
+
+from discovery_sources import SOURCE_GROUPS, SOURCE_REGISTRY, DiscoverySource, parse_source_limits, resolve_sources
+from record_stream import aiter_records, unique_records
+from startup_record import StartupRecord, records_to_dicts
+from result_store import DEFAULT_STORE_PATH, ResultStore
+from retry_queue import DEFAULT_RETRY_PATH
+from result_table import ResultTable
+from search_backends import DEFAULT_BACKENDS as DEFAULT_SEARCH_BACKENDS
+from seed_corpus import DEFAULT_SEED_DIR, get_seed_corpus
+from result_export import export_records, parse_formats as parse_export_formats
+
+def step_label(step: int) -> str:
+    """Keycap emoji for a progress step number"""
+    if 1 <= step <= 9:
+        return f"{step}\ufe0f\u20e3"
+    return "🔟" if step == 10 else f"{step}."
 
 class UltimateStartupDiscovery:
-    def __init__(self):
+    def __init__(self, store_path: str = DEFAULT_STORE_PATH, sources: Optional[List[str]] = None,
+                 max_queries: Optional[int] = None, max_requests: Optional[int] = None,
+                 record_path: Optional[str] = None, replay_path: Optional[str] = None,
+                 output_dir: str = '.', search_backends: Optional[List[str]] = None,
+                 near_duplicates: bool = False, resolve_redirects: bool = False,
+                 export_formats: Optional[List[str]] = None, seed_dir: str = DEFAULT_SEED_DIR,
+                 enrich_metadata: bool = False, retry_path: Optional[str] = DEFAULT_RETRY_PATH,
+                 retry_failed: bool = False, retry_wait: float = 30, deadline: Optional[float] = None,
+                 source_timeouts: Optional[Dict[str, float]] = None,
+                 source_max_requests: Optional[Dict[str, int]] = None):
         self.all_discovered_urls = set()
         self.final_results = []
-        
-    def get_user_hardcoded_urls(self) -> List[Dict]:
+        self.store_path = store_path  # SQLite result store, None to disable
+        self.sources = resolve_sources(sources)
+        self.max_queries = max_queries
+        self.max_requests = max_requests
+        self.request_budget = None  # Shared by all sessions, created with the first discoverer
+        self.host_health = None  # Shared latency statistics and circuit breakers, off when replaying
+        self.discoverers = {}
+        self.record_path = record_path  # Write every HTTP exchange to this archive
+        self.replay_path = replay_path  # Serve every HTTP exchange from this archive
+        self.output_dir = output_dir
+        self.seed_corpus = get_seed_corpus(seed_dir)  # Loaded once, shared with every discoverer
+        self.search_backends = search_backends  # e.g. ['google', 'searxng=http://localhost:8888']
+        self.resolve_redirects = resolve_redirects  # Rewrite results to their final URL and dedup on it
+        self.export_formats = export_formats or []  # Extra compressed/columnar exports, e.g. ['parquet']
+        self.export_files = []
+        self.near_duplicates = near_duplicates  # Fetch homepages and collapse near-identical sites
+        self.near_duplicate_groups = {}
+        self.enrich_metadata = enrich_metadata  # Read page heads to fill in country and company name
+        self.metadata_enricher = None
+        self.enrichment_stats = {}
+        self.retry_path = retry_path  # SQLite queue of failed units carried over between runs, None to disable
+        self.retry_failed = retry_failed  # Only work through the retry queue instead of running the sources
+        self.retry_wait = retry_wait  # Longest wait for a backing-off unit before leaving it to the next run
+        self.retry_queue = None
+        self.retry_clock = None
+        self.retry_stats = {}
+        self.deadline = deadline  # Seconds the whole run may take; stages stop at their next unit of work after it
+        self.source_timeouts = source_timeouts or {}  # Seconds per source name, '*' for every source
+        self.source_max_requests = source_max_requests or {}  # Requests per source name, '*' for every source
+        self.deadline_at = None  # time.monotonic() value of the run deadline
+        self.scope_runs = {}  # Times each stage has run, to name the cutoffs of recorded runs
+        self.partial_stages = {}  # Stages cut short by a deadline or budget, for the analysis
+        self.step = 0  # Last progress step printed by stream_sources
+        self.http_archive = None
+        self.run_started = None
+        self.seed = None
+        
+    def get_user_hardcoded_urls(self) -> List[StartupRecord]:
         """User's verified hardcoded URLs - Always included with highest priority"""
         print("🔍 Loading user's verified hardcoded URLs...")
         
-        user_urls = [
-            'https://www.acalta.de',
-            'https://www.actimi.com',
-            'https://www.emmora.de',
-            'https://www.alfa-ai.com',
-            'https://www.apheris.com',
-            'https://www.aporize.com/',
-            'https://www.arztlena.com/',
-            'https://shop.getnutrio.com/',
-            'https://www.auta.health/',
-            'https://visioncheckout.com/',
-            'https://www.avayl.tech/',
-            'https://www.avimedical.com/avi-impact',
-            'https://de.becureglobal.com/',
-            'https://bellehealth.co/de/',
-            'https://www.biotx.ai/',
-            'https://www.brainjo.de/',
-            'https://brea.app/',
-            'https://breathment.com/',
-            'https://de.caona.eu/',
-            'https://www.careanimations.de/',
-            'https://sfs-healthcare.com',
-            'https://www.climedo.de/',
-            'https://www.cliniserve.de/',
-            'https://cogthera.de/#erfahren',
-            'https://www.comuny.de/',
-            'https://curecurve.de/elina-app/',
-            'https://www.cynteract.com/de/rehabilitation',
-            'https://www.healthmeapp.de/de/',
-            'https://deepeye.ai/',
-            'https://www.deepmentation.ai/',
-            'https://denton-systems.de/',
-            'https://www.derma2go.com/',
-            'https://www.dianovi.com/',
-            'http://dopavision.com/',
-            'https://www.dpv-analytics.com/',
-            'http://www.ecovery.de/',
-            'https://elixionmedical.com/',
-            'https://www.empident.de/',
-            'https://eye2you.ai/',
-            'https://www.fitwhit.de',
-            'https://www.floy.com/',
-            'https://fyzo.de/assistant/',
-            'https://www.gesund.de/app',
-            'https://www.glaice.de/',
-            'https://gleea.de/',
-            'https://www.guidecare.de/',
-            'https://www.apodienste.com/',
-            'https://www.help-app.de/',
-            'https://www.heynanny.com/',
-            'https://incontalert.de/',
-            'https://home.informme.info/',
-            'https://www.kranushealth.com/de/therapien/haeufiger-harndrang',
-            'https://www.kranushealth.com/de/therapien/inkontinenz'
-        ]
-        
-        results = []
-        for url in user_urls:
-            results.append({
-                'url': url,
-                'source': 'User Verified',
-                'confidence': 10,
-                'category': 'Verified Health Tech',
-                'country': 'Germany/Europe',
-                'method': 'Hardcoded'
-            })
-            self.all_discovered_urls.add(url)
+        results = self.seed_corpus.records('verified', country='Germany/Europe', method='Hardcoded')
+        for result in results:
+            self.all_discovered_urls.add(result.url)
             
         print(f"✅ Loaded {len(results)} verified user URLs")
         return results
 
-    def run_enhanced_discovery(self) -> List[Dict]:
-        """Run the enhanced startup discovery method"""
-        print("\n🚀 Running Enhanced Startup Discovery...")
-        print("-" * 50)
+    def create_session(self):
+        """Create a session on the run's shared request budget and record/replay archive"""
+        # Imported here so the network stack only loads when a network stage runs
+        from http_session import HostHealth, create_session
+        
+        if self.host_health is None and not self.replay_path:
+            self.host_health = HostHealth()
+        return create_session(budget=self.get_request_budget(), archive=self.http_archive,
+                              host_health=self.host_health)
+
+    def get_request_budget(self):
+        """The run's RequestBudget, shared by every session"""
+        from http_session import RequestBudget
         
+        if self.request_budget is None:
+            self.request_budget = RequestBudget(self.max_requests)
+        return self.request_budget
+
+    @staticmethod
+    def source_limit(limits: Dict, name: str):
+        """A source's own limit, else the one for every source, else None"""
+        return limits.get(name, limits.get('*'))
+
+    @contextmanager
+    def budget_scope(self, name: str, max_seconds: Optional[float] = None, max_requests: Optional[int] = None):
+        """Run a stage under the run deadline and its own time and request allowance
+        
+        Yields the stage's BudgetScope, whose ``reason`` is set once the
+        stage is cut short. Recorded runs archive the check each stage ran
+        out at, and replays stop there instead of watching the clock.
+        """
+        from http_session import BudgetScope
+        
+        budget = self.get_request_budget()
+        self.scope_runs[name] = self.scope_runs.get(name, 0) + 1
+        state_name = f"budget_cutoff:{name}:{self.scope_runs[name]}"
+        if self.replay_path:
+            cutoff = self.http_archive.states.get(state_name, {})
+            scope = BudgetScope(name, max_requests=max_requests,
+                                cutoff=cutoff.get('checks'), cutoff_reason=cutoff.get('reason'))
+        else:
+            deadline, reason = self.deadline_at, 'run deadline'
+            if max_seconds is not None and (deadline is None or time.monotonic() + max_seconds < deadline):
+                deadline, reason = time.monotonic() + max_seconds, 'time budget'
+            scope = BudgetScope(name, deadline, reason, max_requests)
+        
+        outer, budget.scope = budget.scope, scope
         try:
-            discoverer = EnhancedStartupDiscovery()
-            results = discoverer.discover_all_startups()
+            yield scope
+        finally:
+            budget.scope = outer
+            if scope.reason is not None and self.http_archive is not None and not self.replay_path:
+                self.http_archive.write_state(state_name, {'checks': scope.checks, 'reason': scope.reason})
+
+    def mark_partial(self, name: str, title: str, scope, urls: Optional[int] = None):
+        """Note a stage that was cut short, if it was"""
+        if scope.reason is None:
+            return
+        self.partial_stages[name] = {'reason': scope.reason, 'requests': scope.requests}
+        kept = ""
+        if urls is not None:
+            self.partial_stages[name]['urls'] = urls
+            kept = f", {urls} URLs kept"
+        print(f"⏹️ {title} stopped early ({scope.reason}) after {scope.requests} requests{kept}")
+
+    def get_discoverer(self, source: DiscoverySource):
+        """Import and create the discoverer behind a source, once per class"""
+        key = (source.module, source.class_name)
+        if key not in self.discoverers:
+            discoverer_class = source.load_class()
+            discoverer = discoverer_class(session=self.create_session(), seed_corpus=self.seed_corpus)
+            if self.seed is not None and hasattr(discoverer, 'rng'):
+                discoverer.rng.seed(self.seed)
+            if self.replay_path:
+                discoverer.delay = 0  # Nothing to be polite to when replaying
+            if self.http_archive is not None and hasattr(discoverer, 'cache_path'):
+                # Cached answers would leave requests out of a recording, so archived runs fetch everything
+                discoverer.cache_path = None
+                discoverer.year = self.run_started.year
+            if self.search_backends or self.http_archive is not None:
+                if hasattr(discoverer, 'set_search_backends'):
+                    # Archived runs merge backend results in a fixed order so replays match
+                    discoverer.set_search_backends(self.search_backends or DEFAULT_SEARCH_BACKENDS,
+                                                   deterministic=self.http_archive is not None)
+            scheduler = getattr(discoverer, 'scheduler', None)
+            if scheduler is not None and self.http_archive is not None:
+                # Query order depends on yield history, so replays start from the recorded history
+                if self.replay_path:
+                    scheduler.restore(self.http_archive.states.get('query_scheduler', {}))
+                    scheduler.stats_path = None
+                else:
+                    self.http_archive.write_state('query_scheduler', scheduler.snapshot())
+            self.discoverers[key] = discoverer
+        
+        discoverer = self.discoverers[key]
+        if hasattr(discoverer, 'retry_queue'):
+            discoverer.retry_queue = self.retry_queue
+        if source.query_limit_option and self.max_queries is not None:
+            setattr(discoverer, source.query_limit_option, self.max_queries)
+        return discoverer
+
+    def reset_seen_urls(self):
+        """Forget the URLs seen so far, here and in the cached discoverers, so the next run reports all it finds"""
+        self.all_discovered_urls.clear()
+        for discoverer in self.discoverers.values():
+            found_urls = getattr(discoverer, 'found_urls', None)
+            if found_urls is not None:
+                found_urls.clear()
+
+    def close_discoverers(self):
+        """Release the threads the cached discoverers hold; they start new ones if used again"""
+        for discoverer in self.discoverers.values():
+            if hasattr(discoverer, 'close'):
+                discoverer.close()
+
+    def open_http_archive(self):
+        """Start recording or replaying HTTP traffic and fix the run's clock, seed and deadline"""
+        self.deadline_at = time.monotonic() + self.deadline if self.deadline else None
+        if self.replay_path:
+            from http_archive import HttpArchiveReplayer
             
-            enhanced_results = []
-            for url_data in results['urls']:
-                if url_data['url'] not in self.all_discovered_urls:
-                    self.all_discovered_urls.add(url_data['url'])
-                    url_data['method'] = 'Enhanced Discovery'
-                    enhanced_results.append(url_data)
+            self.http_archive = HttpArchiveReplayer(self.replay_path)
+            self.run_started = self.http_archive.run_started
+            self.seed = self.http_archive.seed
+            print(f"📼 Replaying HTTP traffic from {self.replay_path}")
+        elif self.record_path:
+            from http_archive import HttpArchiveRecorder
             
-            print(f"✅ Enhanced discovery found {len(enhanced_results)} new URLs")
-            return enhanced_results
+            self.run_started = datetime.now()
+            self.seed = random.randrange(2 ** 32)
+            self.http_archive = HttpArchiveRecorder(self.record_path, self.run_started, self.seed)
+            print(f"📼 Recording HTTP traffic to {self.record_path}")
+        else:
+            self.run_started = datetime.now()
+
+    def close_http_archive(self):
+        """Finish the record/replay archive, if any"""
+        if self.http_archive is not None:
+            self.http_archive.close()
+            self.http_archive = None
+
+    def open_retry_queue(self):
+        """Open the queue failed units are kept in; call after open_http_archive"""
+        from retry_queue import ManualClock, RetryQueue
+        
+        if self.retry_queue is not None:
+            return
+        if self.http_archive is not None:
+            # Carried-over units and wall-clock backoff would change which requests a replay makes,
+            # so archived runs keep their own queue in memory and back off on a virtual clock
+            self.retry_clock = ManualClock()
+            self.retry_queue = RetryQueue(None, clock=self.retry_clock)
+        elif self.retry_path:
+            self.retry_queue = RetryQueue(self.retry_path)
+
+    def close_retry_queue(self):
+        """Close the retry queue; pending units stay in the database for the next run"""
+        if self.retry_queue is not None:
+            self.retry_queue.close()
+            self.retry_queue = None
+
+    def budget_exhausted(self) -> bool:
+        return self.request_budget is not None and self.request_budget.exhausted
+
+    def run_retry_unit(self, unit, runner) -> List[StartupRecord]:
+        """Run one queued unit again and keep only URLs not seen yet"""
+        if unit.kind == 'source':
+            return self.run_source(SOURCE_REGISTRY[unit.payload['name']])
+        
+        new_results = []
+        for record in runner.run(unit):
+            if record.url not in self.all_discovered_urls:
+                self.all_discovered_urls.add(record.url)
+                new_results.append(record)
+        return new_results
+
+    def iter_retried_units(self, max_wait: float) -> Iterator[StartupRecord]:
+        """Retry queued units as their backoff passes, waiting at most ``max_wait`` seconds for the next one
+        
+        Yields the new records of every unit that now succeeds. Units that are
+        still backing off afterwards stay queued for the next run.
+        """
+        from discovery_worker import JobRunner
+        
+        queue = self.retry_queue
+        runner = JobRunner(lambda name: self.get_discoverer(SOURCE_REGISTRY[name]))
+        sleep = self.retry_clock.sleep if self.retry_clock is not None else time.sleep
+        found = retried = recovered = 0
+        while not self.budget_exhausted():
+            units = queue.due()
+            if not units:
+                wait = queue.seconds_until_next()
+                if wait is None or wait > max_wait:
+                    break
+                if self.retry_clock is None and self.deadline_at is not None and time.monotonic() + wait >= self.deadline_at:
+                    print("⏹️ Next retry is due after the run deadline, leaving it to the next run")
+                    break
+                print(f"⏳ Next retry due in {wait:.0f}s")
+                sleep(wait)
+                continue
+            for unit in units:
+                if self.budget_exhausted():
+                    print("⏹️ Budget spent, leaving the rest of the retry queue")
+                    break
+                retried += 1
+                print(f"🔁 Retrying {unit.kind} {json.dumps(unit.payload, ensure_ascii=False)} "
+                      f"(attempt {unit.attempts + 1}, last error {unit.error_class})")
+                try:
+                    records = self.run_retry_unit(unit, runner)
+                except Exception as e:
+                    print(f"⚠️ Retry failed: {str(e)}")
+                    queue.record_failure(unit.kind, unit.payload, e)
+                    continue
+                # Failures inside the discoverers are recorded there and count as another attempt;
+                # a source that ran cleanly has already taken itself off the queue
+                if queue.attempts(unit.kind, unit.payload) in (0, unit.attempts):
+                    queue.resolve(unit.kind, unit.payload)
+                    recovered += 1
+                    found += len(records)
+                    yield from records
+        
+        counts = queue.counts()
+        self.retry_stats = {
+            'retried': retried,
+            'recovered': recovered,
+            'pending': counts.get('pending', 0),
+            'gave_up': counts.get('gave_up', 0)
+        }
+        print(f"✅ Recovered {recovered} of {retried} retried units ({found} new URLs); "
+              f"{self.retry_stats['pending']} carried over, {self.retry_stats['gave_up']} given up")
+
+    def retry_failed_units(self, max_wait: float) -> List[StartupRecord]:
+        """New records of the queued units that succeed on a retry (see iter_retried_units)"""
+        return list(self.iter_retried_units(max_wait))
+
+
+    def print_plan(self):
+        """Print the sources and limits a run would use, without importing them"""
+        print("🧪 DRY RUN - no network requests will be made")
+        print("=" * 60)
+        if self.retry_failed:
+            from retry_queue import RetryQueue
             
-        except Exception as e:
-            print(f"⚠️ Enhanced discovery error: {str(e)}")
-            return []
+            with RetryQueue(self.retry_path) as queue:
+                units = queue.pending()
+                due = len(queue.due())
+            print(f"🔁 Retry queue only: {len(units)} pending units in {self.retry_path}, {due} due now")
+            for unit in units:
+                print(f"  • {unit.kind} {json.dumps(unit.payload, ensure_ascii=False)} "
+                      f"(attempts: {unit.attempts}, last error {unit.error_class})")
+            return
+        total_requests = 0
+        for step, source in enumerate(self.sources, 1):
+            requests_planned = source.estimated_requests
+            if source.query_limit_option and self.max_queries is not None:
+                requests_planned = min(requests_planned, self.max_queries * source.requests_per_query)
+            max_requests = self.source_limit(self.source_max_requests, source.name)
+            if max_requests is not None and source.needs_network:
+                requests_planned = min(requests_planned, max_requests)
+            total_requests += requests_planned
+            print(f"{step_label(step)} {source.title} [{source.name}] - ~{requests_planned} requests")
+            print(f"    {source.description}")
+            timeout = self.source_limit(self.source_timeouts, source.name)
+            if timeout is not None and source.needs_network:
+                print(f"    stops at its next query or page after {timeout:g}s")
+        if self.resolve_redirects:
+            print("↪️ Redirect resolution - one request per URL not yet in the redirect map")
+        if self.near_duplicates:
+            print("🪞 Near-duplicate check - one request per discovered URL")
+        if self.enrich_metadata:
+            reused = " not already read by the near-duplicate check" if self.near_duplicates else ""
+            print(f"🏷️ Metadata enrichment - one capped request per discovered URL{reused}")
+        if self.max_requests is not None:
+            total_requests = min(total_requests, self.max_requests)
+        print(f"\n🌐 Estimated HTTP requests: ~{total_requests}")
+        if self.deadline:
+            print(f"⏱️ Run deadline: {self.deadline:g}s, stages still running then keep partial results")
+        if self.store_path:
+            print(f"🗄️ Results would be upserted into {self.store_path}")
 
-    def run_google_search_discovery(self) -> List[Dict]:
-        """Run the Google search-based discovery method"""
-        print("\n🔍 Running Google Search Discovery...")
+    def iter_source(self, source: DiscoverySource) -> Iterator[StartupRecord]:
+        """Yield one registered source's records as it finds them, keeping only URLs not seen yet
+        
+        Sources that return a list are yielded once it is complete; sources
+        that return an iterator (like GoogleSearchStartupFinder.iter_startups)
+        are passed through record by record. If a source fails, the records
+        it yielded before the error are kept.
+        
+        Network sources run in a budget scope: once the run deadline or the
+        source's own time or request budget is spent, the discoverer stops
+        at its next query or page and what it found so far is kept and
+        marked partial.
+        """
+        if source.module is None:
+            yield from getattr(self, source.method_name)()
+            return
+        
+        print(f"\n🚀 Running {source.title}...")
         print("-" * 50)
         
+        found = 0
+        with self.budget_scope(source.name, self.source_limit(self.source_timeouts, source.name),
+                               self.source_limit(self.source_max_requests, source.name)) as scope:
+            try:
+                if source.needs_network and self.budget_exhausted():
+                    return
+                discoverer = self.get_discoverer(source)
+                results = getattr(discoverer, source.method_name)()
+                if isinstance(results, dict):
+                    # discover_all_startups returns its summary dict, already filtered
+                    results = results['urls']
+                elif isinstance(results, list) and hasattr(discoverer, 'validate_and_filter_urls'):
+                    results = discoverer.validate_and_filter_urls(results)
+                
+                for url_data in unique_records(results, self.all_discovered_urls):
+                    url_data.method = source.method_label
+                    found += 1
+                    yield url_data
+                
+            except Exception as e:
+                kept = f" ({found} URLs found before the error kept)" if found else ""
+                print(f"⚠️ {source.title} error: {str(e)}{kept}")
+                if self.retry_queue is not None:
+                    self.retry_queue.record_failure('source', {'name': source.name}, e)
+                return
+            finally:
+                self.mark_partial(source.name, source.title, scope, found)
+        
+        print(f"✅ {source.title} found {found} new URLs")
+        if self.retry_queue is not None:
+            self.retry_queue.resolve('source', {'name': source.name})
+
+    def run_source(self, source: DiscoverySource) -> List[StartupRecord]:
+        """Run one registered discovery source and keep only URLs not seen yet"""
+        return list(self.iter_source(source))
+
+    def stream_sources(self) -> Iterator[StartupRecord]:
+        """Yield the run's new records source by source, then those of retried units
+        
+        The HTTP archive and retry queue must already be open. ``self.step``
+        follows the progress steps printed, for the stages that come after.
+        """
+        self.step = 0
+        if self.retry_failed:
+            self.step = 1
+            print(f"{step_label(self.step)} RETRY QUEUE")
+            yield from self.iter_retries()
+            return
+        
+        # 1-n. Registered discovery sources, highest priority first
+        for step, source in enumerate(self.sources, 1):
+            self.step = step
+            prefix = "" if step == 1 else "\n"
+            print(f"{prefix}{step_label(step)} {source.title.upper()}")
+            yield from self.iter_source(source)
+        
+        # Units that failed above, or in earlier runs, get another attempt once their backoff passes
+        if self.retry_queue is not None and self.retry_queue.pending():
+            self.step += 1
+            print(f"\n{step_label(self.step)} RETRIES")
+            yield from self.iter_retries()
+
+    def iter_retries(self) -> Iterator[StartupRecord]:
+        """The retry stage: queued units retried under the run deadline"""
+        found = 0
+        with self.budget_scope('retries') as scope:
+            for url_data in self.iter_retried_units(self.retry_wait):
+                found += 1
+                yield url_data
+        self.mark_partial('retries', 'Retries', scope, found)
+
+    def iter_startups(self) -> Iterator[StartupRecord]:
+        """Stream the run's records as they are found, deduplicated but not yet ranked or saved
+        
+        Opens the HTTP archive and retry queue for the stream and closes them
+        when it is exhausted or closed, so a service can verify or store the
+        first records while later sources are still running.
+        """
+        self.open_http_archive()
+        self.open_retry_queue()
         try:
-            finder = GoogleSearchStartupFinder()
-            results = finder.discover_all_startups()
-            
-            google_results = []
-            for url_data in results['urls']:
-                if url_data['url'] not in self.all_discovered_urls:
-                    self.all_discovered_urls.add(url_data['url'])
-                    url_data['method'] = 'Google Search'
-                    google_results.append(url_data)
-            
-            print(f"✅ Google search found {len(google_results)} new URLs")
-            return google_results
-            
-        except Exception as e:
-            print(f"⚠️ Google search discovery error: {str(e)}")
-            return []
+            yield from self.stream_sources()
+        finally:
+            self.close_discoverers()
+            self.close_retry_queue()
+            self.close_http_archive()
+
+    async def aiter_startups(self) -> AsyncIterator[StartupRecord]:
+        """``iter_startups`` as an async iterator, for use from an event loop"""
+        async for url_data in aiter_records(self.iter_startups()):
+            yield url_data
 
-    def add_curated_startup_urls(self) -> List[Dict]:
+    def add_curated_startup_urls(self) -> List[StartupRecord]:
         """Add manually curated startup URLs from known sources"""
         print("\n📋 Adding curated startup URLs...")
         print("-" * 50)
         
-        # Additional curated startups from various sources
-        curated_startups = [
-            # German Digital Health Leaders
-            'https://www.ada.com',
-            'https://www.doctolib.de',
-            'https://www.kaia-health.com',
-            'https://www.teleclinic.com',
-            'https://www.zavamed.com',
-            'https://www.medwing.com',
-            'https://www.felmo.de',
-            'https://www.viomedo.de',
-            'https://www.caresyntax.com',
-            'https://www.merantix.com',
-            'https://www.contextflow.com',
-            'https://www.heartkinetics.com',
-            'https://www.samedi.de',
-            'https://www.medigene.com',
-            'https://www.smartpatient.eu',
-            
-            # European Digital Health
-            'https://www.doctolib.fr',
-            'https://www.livi.co.uk',
-            'https://www.babylon.com',
-            'https://www.echo.co.uk',
-            'https://www.accurx.com',
-            'https://www.zava.com',
-            'https://www.medgate.ch',
-            'https://www.kry.se',
-            'https://www.medadom.com',
-            'https://www.qare.fr',
-            'https://www.1177.se',
-            'https://www.netdoktor.dk',
-            'https://www.opensafely.org',
-            
-            # AI & Analytics
-            'https://www.owkin.com',
-            'https://www.benevolent.ai',
-            'https://www.exscientia.ai',
-            'https://www.healx.io',
-            'https://www.deepmind.com/about/health',
-            'https://www.insilico.com',
-            
-            # MedTech & Devices
-            'https://www.siemens-healthineers.com',
-            'https://www.philips.com/healthcare',
-            'https://www.getinge.com',
-            'https://www.elekta.com',
-            'https://www.fresenius.com',
-            'https://www.braun.com',
-            
-            # Pharma & Biotech
-            'https://www.bayer.com',
-            'https://www.boehringer-ingelheim.com',
-            'https://www.merckgroup.com',
-            'https://www.qiagen.com',
-            'https://www.roche.com',
-            'https://www.novartis.com',
-            'https://www.sanofi.com',
-            'https://www.gsk.com',
-            'https://www.astrazeneca.com',
-            
-            # Emerging Startups
-            'https://www.mindmaze.com',
-            'https://www.sophia-genetics.com',
-            'https://www.iqvia.com',
-            'https://www.veracyte.com',
-            'https://www.tempus.com',
-            'https://www.flatiron.com',
-            'https://www.paige.ai',
-            'https://www.path.ai',
-            'https://www.viz.ai',
-            'https://www.arterys.com'
-        ]
-        
         results = []
-        for url in curated_startups:
-            if url not in self.all_discovered_urls:
-                self.all_discovered_urls.add(url)
-                results.append({
-                    'url': url,
-                    'source': 'Curated List',
-                    'confidence': 8,
-                    'category': 'Curated Health Tech',
-                    'country': 'Europe/International',
-                    'method': 'Manual Curation'
-                })
+        for result in self.seed_corpus.records('curated', method='Manual Curation'):
+            if result.url not in self.all_discovered_urls:
+                self.all_discovered_urls.add(result.url)
+                results.append(result)
         
         print(f"✅ Added {len(results)} curated startup URLs")
         return results
 
-    def consolidate_and_rank_results(self, all_results: List[Dict]) -> List[Dict]:
+    def consolidate_and_rank_results(self, all_results: List[StartupRecord]) -> List[StartupRecord]:
         """Consolidate results and rank by confidence and relevance"""
         print("\n🔄 Consolidating and ranking results...")
         print("-" * 50)
@@ -258,16 +515,17 @@ class UltimateStartupDiscovery:
             'Manual Curation': 4,
             'Google Search': 3,
             'Enhanced Discovery': 2,
+            'Link Graph': 2,
             'Generated': 1
         }
         
         sorted_results = sorted(all_results, key=lambda x: (
-            x['confidence'], 
-            method_priority.get(x.get('method', 'Unknown'), 0)
+            x.confidence, 
+            method_priority.get(x.method or 'Unknown', 0)
         ), reverse=True)
         
         for result in sorted_results:
-            url = result['url']
+            url = result.url
             if url not in seen_urls:
                 seen_urls.add(url)
                 unique_results.append(result)
@@ -275,88 +533,133 @@ class UltimateStartupDiscovery:
         print(f"✅ Consolidated to {len(unique_results)} unique URLs")
         return unique_results
 
-    def analyze_discovery_results(self, results: List[Dict]) -> Dict:
+    def canonicalize_redirects(self, results: List[StartupRecord]) -> List[StartupRecord]:
+        """Replace each URL with the end of its redirect chain and drop records that end up equal"""
+        from redirect_resolver import DEFAULT_REDIRECT_MAP_PATH, RedirectMap, RedirectResolver
+        
+        print("\n↪️ Resolving redirect chains...")
+        print("-" * 50)
+        
+        replaying = bool(self.replay_path)
+        # A replay starts from the map entries the recorded run used instead of the local map
+        with RedirectMap(None if replaying else DEFAULT_REDIRECT_MAP_PATH) as redirect_map:
+            if replaying:
+                redirect_map.store(self.http_archive.states.get('redirect_map', {}))
+            resolver = RedirectResolver(self.create_session(), redirect_map)
+            with self.budget_scope('redirects') as scope:
+                results = resolver.canonicalize(results)
+            self.mark_partial('redirects', 'Redirect resolution', scope)
+            if self.http_archive is not None and not replaying:
+                self.http_archive.write_state('redirect_map', resolver.cache_hits)
+        return results
+
+    def collapse_near_duplicates(self, results: List[StartupRecord]) -> List[StartupRecord]:
+        """Collapse records whose homepages are near-identical, keeping the best-ranked one"""
+        from near_duplicates import NearDuplicateDetector
+        
+        print("\n🪞 Detecting near-duplicate sites...")
+        print("-" * 50)
+        
+        # Pages read here are parsed for metadata too, so enrichment does not fetch them again
+        on_page = self.get_metadata_enricher().add_page if self.enrich_metadata else None
+        detector = NearDuplicateDetector(self.create_session(), on_page=on_page)
+        with self.budget_scope('near_duplicates') as scope:
+            kept, self.near_duplicate_groups = detector.collapse(results)
+        self.mark_partial('near_duplicates', 'Near-duplicate detection', scope)
+        for original, duplicates in self.near_duplicate_groups.items():
+            print(f"  • {original} ≈ {', '.join(duplicates)}")
+        return kept
+
+    def get_metadata_enricher(self):
+        """The run's metadata enricher, shared by the near-duplicate and enrichment stages"""
+        from page_metadata import MetadataEnricher
+        
+        if self.metadata_enricher is None:
+            self.metadata_enricher = MetadataEnricher(self.create_session())
+        return self.metadata_enricher
+
+    def enrich_page_metadata(self, results: List[StartupRecord]) -> List[StartupRecord]:
+        """Fill in missing countries and company names from each homepage's head"""
+        print("\n🏷️ Extracting page metadata...")
+        print("-" * 50)
+        
+        with self.budget_scope('metadata') as scope:
+            self.enrichment_stats = self.get_metadata_enricher().enrich(results)
+        self.mark_partial('metadata', 'Metadata enrichment', scope)
+        print(f"✅ Read {self.enrichment_stats['pages_read']} pages: "
+              f"{self.enrichment_stats['countries_filled']} countries and "
+              f"{self.enrichment_stats['company_names_filled']} company names filled in")
+        return results
+
+    def analyze_discovery_results(self, results: List[StartupRecord]) -> Dict:
         """Analyze the discovery results and provide statistics"""
         print("\n📊 Analyzing discovery results...")
         print("-" * 50)
         
-        # Count by method
-        method_counts = {}
-        confidence_distribution = {}
-        category_counts = {}
-        country_counts = {}
-        
-        for result in results:
-            method = result.get('method', 'Unknown')
-            confidence = result.get('confidence', 0)
-            category = result.get('category', 'Unknown')
-            country = result.get('country', 'Unknown')
-            
-            method_counts[method] = method_counts.get(method, 0) + 1
-            confidence_distribution[confidence] = confidence_distribution.get(confidence, 0) + 1
-            category_counts[category] = category_counts.get(category, 0) + 1
-            country_counts[country] = country_counts.get(country, 0) + 1
-        
-        # Calculate quality metrics
-        high_confidence = len([r for r in results if r.get('confidence', 0) >= 8])
-        medium_confidence = len([r for r in results if 5 <= r.get('confidence', 0) < 8])
-        low_confidence = len([r for r in results if r.get('confidence', 0) < 5])
-        
-        analysis = {
-            'total_urls': len(results),
-            'method_counts': method_counts,
-            'confidence_distribution': confidence_distribution,
-            'category_counts': category_counts,
-            'country_counts': country_counts,
-            'quality_metrics': {
-                'high_confidence': high_confidence,
-                'medium_confidence': medium_confidence,
-                'low_confidence': low_confidence,
-                'quality_score': (high_confidence * 3 + medium_confidence * 2 + low_confidence) / len(results) if results else 0
-            }
-        }
+        # Group-by counts and quality metrics in one columnar pass
+        analysis = ResultTable.from_records(results).summary()
+        if self.near_duplicates:
+            analysis['near_duplicates'] = self.near_duplicate_groups
+        if self.enrich_metadata:
+            analysis['metadata_enrichment'] = self.enrichment_stats
+        if self.retry_stats:
+            analysis['retry_queue'] = self.retry_stats
+        if self.partial_stages:
+            analysis['partial'] = self.partial_stages
         
         return analysis
 
-    def save_comprehensive_results(self, results: List[Dict], analysis: Dict) -> tuple:
+    def save_comprehensive_results(self, results: List[StartupRecord], analysis: Dict) -> tuple:
         """Save comprehensive results with analysis"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        run_started = self.run_started or datetime.now()
+        timestamp = run_started.strftime("%Y%m%d_%H%M%S")
         
         # CSV file
-        csv_filename = f"ultimate_startup_discovery_{timestamp}.csv"
+        csv_filename = os.path.join(self.output_dir, f"ultimate_startup_discovery_{timestamp}.csv")
         with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['url', 'source', 'confidence', 'category', 'country', 'method']
+            fieldnames = ['url', 'source', 'confidence', 'category', 'country', 'method', 'company_name']
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             writer.writeheader()
             
             for result in results:
                 writer.writerow({
-                    'url': result['url'],
-                    'source': result.get('source', ''),
-                    'confidence': result.get('confidence', 0),
-                    'category': result.get('category', ''),
-                    'country': result.get('country', ''),
-                    'method': result.get('method', '')
+                    'url': result.url,
+                    'source': result.source or '',
+                    'confidence': result.confidence,
+                    'category': result.category or '',
+                    'country': result.country or '',
+                    'method': result.method or '',
+                    'company_name': result.company_name or ''
                 })
         
         # JSON file with analysis
-        json_filename = f"ultimate_startup_discovery_{timestamp}.json"
+        json_filename = os.path.join(self.output_dir, f"ultimate_startup_discovery_{timestamp}.json")
         comprehensive_data = {
             'discovery_timestamp': timestamp,
             'total_urls_discovered': len(results),
             'analysis': analysis,
-            'urls': results
+            'urls': records_to_dicts(results)
         }
+        if self.metadata_enricher is not None:
+            comprehensive_data['page_metadata'] = {
+                result.url: self.metadata_enricher.pages[result.url].to_dict()
+                for result in results if result.url in self.metadata_enricher.pages
+            }
         
         with open(json_filename, 'w', encoding='utf-8') as jsonfile:
             json.dump(comprehensive_data, jsonfile, indent=2, ensure_ascii=False)
         
+        # Optional compressed / columnar exports with the CSV's columns
+        if self.export_formats:
+            export_base = os.path.join(self.output_dir, f"ultimate_startup_discovery_{timestamp}")
+            self.export_files = export_records(lambda: results, export_base, self.export_formats)
+        
         # Summary report
-        report_filename = f"discovery_report_{timestamp}.txt"
+        report_filename = os.path.join(self.output_dir, f"discovery_report_{timestamp}.txt")
         with open(report_filename, 'w', encoding='utf-8') as report:
             report.write("🚀 ULTIMATE STARTUP DISCOVERY REPORT\n")
             report.write("=" * 60 + "\n\n")
-            report.write(f"Discovery Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            report.write(f"Discovery Date: {run_started.strftime('%Y-%m-%d %H:%M:%S')}\n")
             report.write(f"Total URLs Discovered: {len(results)}\n\n")
             
             report.write("📊 DISCOVERY METHODS:\n")
@@ -377,10 +680,45 @@ class UltimateStartupDiscovery:
             for country, count in analysis['country_counts'].items():
                 report.write(f"  • {country}: {count} URLs\n")
             
+            if analysis.get('near_duplicates'):
+                report.write(f"\n🪞 NEAR-DUPLICATES COLLAPSED:\n")
+                for original, duplicates in analysis['near_duplicates'].items():
+                    report.write(f"  • {original} ≈ {', '.join(duplicates)}\n")
+            
+            if analysis.get('metadata_enrichment'):
+                enrichment = analysis['metadata_enrichment']
+                report.write(f"\n🏷️ METADATA ENRICHMENT:\n")
+                report.write(f"  • Pages read: {enrichment['pages_read']}\n")
+                report.write(f"  • Countries filled in: {enrichment['countries_filled']}\n")
+                report.write(f"  • Company names filled in: {enrichment['company_names_filled']}\n")
+                report.write(f"  • Impressum links found: {enrichment['impressum_links']}\n")
+            
+            if analysis.get('retry_queue'):
+                retries = analysis['retry_queue']
+                report.write(f"\n🔁 RETRY QUEUE:\n")
+                report.write(f"  • Units retried: {retries['retried']} ({retries['recovered']} recovered)\n")
+                report.write(f"  • Carried over to the next run: {retries['pending']}\n")
+                report.write(f"  • Given up: {retries['gave_up']}\n")
+            
+            if analysis.get('partial'):
+                report.write(f"\n⏹️ PARTIAL RESULTS (stages stopped early):\n")
+                for stage, partial in analysis['partial'].items():
+                    kept = f", {partial['urls']} URLs kept" if 'urls' in partial else ""
+                    report.write(f"  • {stage}: {partial['reason']} after {partial['requests']} requests{kept}\n")
+            
             report.write(f"\n🔝 TOP 20 HIGHEST CONFIDENCE URLs:\n")
-            top_urls = sorted(results, key=lambda x: x.get('confidence', 0), reverse=True)[:20]
+            top_urls = sorted(results, key=lambda x: x.confidence, reverse=True)[:20]
             for i, url_data in enumerate(top_urls, 1):
-                report.write(f"  {i:2d}. {url_data['url']} (confidence: {url_data.get('confidence', 0)})\n")
+                report.write(f"  {i:2d}. {url_data.url} (confidence: {url_data.confidence})\n")
+        
+        # Upsert into the SQLite result store for indexed queries across runs
+        if self.store_path:
+            try:
+                with ResultStore(self.store_path) as store:
+                    store.upsert_records(results)
+                    print(f"🗄️ Result store {self.store_path} now holds {store.count()} URLs")
+            except Exception as e:
+                print(f"⚠️ Result store error: {str(e)}")
         
         return csv_filename, json_filename, report_filename
 
@@ -394,38 +732,44 @@ class UltimateStartupDiscovery:
         print("")
         
         start_time = time.time()
-        all_results = []
-        
-        # 1. User hardcoded URLs (highest priority)
-        print("1️⃣ USER VERIFIED URLs")
-        user_results = self.get_user_hardcoded_urls()
-        all_results.extend(user_results)
-        
-        # 2. Enhanced discovery
-        print("\n2️⃣ ENHANCED DISCOVERY")
-        enhanced_results = self.run_enhanced_discovery()
-        all_results.extend(enhanced_results)
-        
-        # 3. Google search discovery
-        print("\n3️⃣ GOOGLE SEARCH DISCOVERY")
-        google_results = self.run_google_search_discovery()
-        all_results.extend(google_results)
-        
-        # 4. Curated startup URLs
-        print("\n4️⃣ CURATED STARTUP URLs")
-        curated_results = self.add_curated_startup_urls()
-        all_results.extend(curated_results)
-        
-        # 5. Consolidate and rank
-        print("\n5️⃣ CONSOLIDATION & RANKING")
-        final_results = self.consolidate_and_rank_results(all_results)
-        
-        # 6. Analyze results
-        print("\n6️⃣ ANALYSIS")
+        self.open_http_archive()
+        self.open_retry_queue()
+        
+        try:
+            all_results = list(self.stream_sources())
+            step = self.step
+            
+            # Consolidate and rank
+            step += 1
+            print(f"\n{step_label(step)} CONSOLIDATION & RANKING")
+            final_results = self.consolidate_and_rank_results(all_results)
+            
+            if self.resolve_redirects:
+                step += 1
+                print(f"\n{step_label(step)} REDIRECT RESOLUTION")
+                final_results = self.canonicalize_redirects(final_results)
+            
+            # Collapse near-duplicate sites before anything is verified or exported
+            if self.near_duplicates:
+                step += 1
+                print(f"\n{step_label(step)} NEAR-DUPLICATE DETECTION")
+                final_results = self.collapse_near_duplicates(final_results)
+            
+            if self.enrich_metadata:
+                step += 1
+                print(f"\n{step_label(step)} METADATA ENRICHMENT")
+                final_results = self.enrich_page_metadata(final_results)
+        finally:
+            self.close_discoverers()
+            self.close_retry_queue()
+            self.close_http_archive()
+        
+        # Analyze results
+        print(f"\n{step_label(step + 1)} ANALYSIS")
         analysis = self.analyze_discovery_results(final_results)
         
-        # 7. Save results
-        print("\n7️⃣ SAVING RESULTS")
+        # Save results
+        print(f"\n{step_label(step + 2)} SAVING RESULTS")
         csv_file, json_file, report_file = self.save_comprehensive_results(final_results, analysis)
         
         end_time = time.time()
@@ -437,14 +781,24 @@ class UltimateStartupDiscovery:
         print(f"⏱️  Total time: {end_time - start_time:.1f} seconds")
         print(f"📊 Total URLs discovered: {len(final_results)}")
         print(f"🎯 Quality score: {analysis['quality_metrics']['quality_score']:.2f}/3.0")
+        if self.retry_stats.get('pending') and self.retry_clock is None:
+            print(f"🔁 {self.retry_stats['pending']} failed units queued in {self.retry_path}; "
+                  f"run with --retry-failed to work through them")
+        if self.partial_stages:
+            print(f"⏹️ Partial results: {', '.join(self.partial_stages)} stopped early (see the report)")
+        if self.host_health is not None and self.host_health.fail_fast:
+            print(f"⚡ {self.host_health.fail_fast} requests failed fast on "
+                  f"{len(self.host_health.open_hosts())} hosts with open circuits")
         print(f"📁 Files created:")
         print(f"  • CSV: {csv_file}")
         print(f"  • JSON: {json_file}")
         print(f"  • Report: {report_file}")
+        for export_file in self.export_files:
+            print(f"  • Export: {export_file}")
         
         print(f"\n🔝 Top 10 Discovered URLs:")
         for i, url_data in enumerate(final_results[:10], 1):
-            print(f"  {i:2d}. {url_data['url']} ({url_data.get('method', 'Unknown')}, confidence: {url_data.get('confidence', 0)})")
+            print(f"  {i:2d}. {url_data.url} ({url_data.method or 'Unknown'}, confidence: {url_data.confidence})")
         
         print(f"\n📊 Discovery Summary:")
         for method, count in analysis['method_counts'].items():
@@ -457,12 +811,129 @@ class UltimateStartupDiscovery:
             'files': {
                 'csv': csv_file,
                 'json': json_file,
-                'report': report_file
+                'report': report_file,
+                'exports': self.export_files
             }
         }
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    source_names = ', '.join(list(SOURCE_REGISTRY) + list(SOURCE_GROUPS))
+    parser = argparse.ArgumentParser(
+        description="Discover digital health startup URLs across Germany and Europe"
+    )
+    parser.add_argument('--sources', default='all',
+                        help=f"Comma-separated sources to run ({source_names})")
+    parser.add_argument('--max-queries', type=int,
+                        help="Maximum search queries per query-driven source (Google, GitHub)")
+    parser.add_argument('--max-requests', type=int,
+                        help="Maximum HTTP requests for the whole run")
+    parser.add_argument('--search-backends',
+                        help="Comma-separated search backends: google, duckduckgo, searxng=URL "
+                             f"(default: {','.join(DEFAULT_SEARCH_BACKENDS)})")
+    parser.add_argument('--resolve-redirects', action='store_true',
+                        help="Follow redirects once per URL (cached in redirect_map.db) and dedup on the final URL")
+    parser.add_argument('--near-duplicates', action='store_true',
+                        help="Fetch each result's homepage and collapse near-duplicate sites")
+    parser.add_argument('--enrich-metadata', action='store_true',
+                        help="Read each homepage's head to fill in missing countries and company names")
+    parser.add_argument('--export',
+                        help="Also export results as comma-separated formats: jsonl.gz, jsonl.zst, parquet, arrow")
+    parser.add_argument('--seeds', default=DEFAULT_SEED_DIR,
+                        help="Directory with verified.txt, curated.txt and conference.txt seed lists")
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH,
+                        help="SQLite result store to upsert into ('' to disable)")
+    parser.add_argument('--retry-queue', default=DEFAULT_RETRY_PATH,
+                        help="SQLite queue of failed directory pages, queries and sources, "
+                             "carried over between runs ('' to disable)")
+    parser.add_argument('--retry-failed', action='store_true',
+                        help="Only retry the units in the retry queue, then rank and save their results")
+    parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                        help="Time limit for the whole run; sources stop at their next query or page "
+                             "and keep what they found, marked partial in the report")
+    parser.add_argument('--source-timeout', metavar='SECONDS',
+                        help="Time limit per source, for every source (300) or by name (google=120,github=60)")
+    parser.add_argument('--source-max-requests', metavar='N',
+                        help="HTTP requests per source, for every source (100) or by name (google=30,snowball=200)")
+    parser.add_argument('--output-dir', default='.',
+                        help="Directory for the CSV, JSON and report files")
+    archive_group = parser.add_mutually_exclusive_group()
+    archive_group.add_argument('--record', metavar='ARCHIVE',
+                               help="Record every HTTP exchange to a compressed archive (.jsonl.gz)")
+    archive_group.add_argument('--replay', metavar='ARCHIVE',
+                               help="Replay a recorded archive offline, without delays")
+    parser.add_argument('--daemon', action='store_true',
+                        help="Keep running: refresh each source on its schedule and re-verify stale URLs in the store")
+    parser.add_argument('--verify-batch', type=int, default=50,
+                        help="URLs re-verified per daemon cycle")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Show which sources would run and exit without network access")
+    parser.add_argument('--list-sources', action='store_true',
+                        help="List the registered discovery sources and exit")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
     """Main function"""
+    args = parse_args(argv)
+    
+    if args.list_sources:
+        print("📋 Registered discovery sources:")
+        for source in SOURCE_REGISTRY.values():
+            print(f"  • {source.name:12s} {source.description}")
+        for group, members in SOURCE_GROUPS.items():
+            print(f"  • {group:12s} group: {', '.join(members or SOURCE_REGISTRY)}")
+        raise SystemExit(0)
+    
+    try:
+        discovery = UltimateStartupDiscovery(
+            store_path=args.store or None,
+            sources=args.sources.split(','),
+            max_queries=args.max_queries,
+            max_requests=args.max_requests,
+            record_path=args.record,
+            replay_path=args.replay,
+            output_dir=args.output_dir,
+            search_backends=args.search_backends.split(',') if args.search_backends else None,
+            near_duplicates=args.near_duplicates,
+            resolve_redirects=args.resolve_redirects,
+            export_formats=parse_export_formats(args.export),
+            seed_dir=args.seeds,
+            enrich_metadata=args.enrich_metadata,
+            retry_path=args.retry_queue or None,
+            retry_failed=args.retry_failed,
+            deadline=args.deadline,
+            source_timeouts=parse_source_limits(args.source_timeout),
+            source_max_requests=parse_source_limits(args.source_max_requests, int)
+        )
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        raise SystemExit(2)
+    
+    if args.retry_failed and (args.record or args.replay or not args.retry_queue):
+        print("❌ --retry-failed needs the persistent retry queue and cannot record or replay HTTP archives")
+        raise SystemExit(2)
+    
+    if args.dry_run:
+        discovery.print_plan()
+        raise SystemExit(0)
+    
+    if args.daemon:
+        from discovery_daemon import DiscoveryDaemon
+        
+        if args.record or args.replay:
+            print("❌ Daemon mode cannot record or replay HTTP archives")
+            raise SystemExit(2)
+        if args.deadline:
+            print("❌ Daemon mode runs until stopped; use --source-timeout to bound each source run")
+            raise SystemExit(2)
+        try:
+            daemon = DiscoveryDaemon(discovery, verify_batch=args.verify_batch)
+        except ValueError as e:
+            print(f"❌ {str(e)}")
+            raise SystemExit(2)
+        daemon.run()
+        raise SystemExit(0)
+    
     print("🚀 ULTIMATE STARTUP DISCOVERY SYSTEM")
     print("=" * 60)
     print("This system combines multiple discovery methods to find")
@@ -473,15 +944,18 @@ def main():
     print("")
     
     try:
-        # Initialize and run discovery
-        discovery = UltimateStartupDiscovery()
+        # Run discovery
         results = discovery.run_ultimate_discovery()
         
         print(f"\n✨ SUCCESS! Discovered {results['total_urls']} startup URLs")
         print(f"📋 Next steps:")
         print(f"  1. Review the discovery report: {results['files']['report']}")
         print(f"  2. Use existing part2_url_evaluator.py to test URLs")
-        print(f"  3. Use existing part3_company_name_extractor.py to extract company names")
+        if discovery.enrich_metadata:
+            print(f"  3. Company names were filled in from page metadata; "
+                  f"use part3_company_name_extractor.py for the rest")
+        else:
+            print(f"  3. Use existing part3_company_name_extractor.py to extract company names")
         print(f"  4. Build final startup directory")
         
         return results